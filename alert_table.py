@@ -0,0 +1,186 @@
+import os
+import struct
+import sys
+from datetime import date
+
+from kb_utils import ANY, UNKNOWN, norm_key
+from mapped_file import MappedFile, MappedStrings, StringPool, write_file
+
+# Every district x crop x month x soil answer, precomputed.
+#
+# `python alert_table.py build [path]` evaluates each rule of the compiled
+# PestEngine for every combination and writes one little-endian file
+# (layout helpers in mapped_file.py):
+#
+#   header       magic, version and section sizes
+#   bounds       float64[rules][6]  temp/humidity/rainfall lo, hi
+#   offsets      uint32[strings + 1] into the string pool
+#   names        uint32 string ids: districts, crops, soils, risk labels
+#   rule_text    uint32[rules][5]   crop, pest, symptoms, preventive, corrective
+#   cells        uint32[cells + 1]  start of each cell's run in `entries`
+#   entries      uint32             rule << 4 | risk label
+#   pool         UTF-8 bytes, every distinct string once
+#
+# A cell is (district slot, crop, month, soil slot). The extra district
+# slot is "not in PEST_HISTORY" (default risk); the extra soil slots are
+# "not in the vocabulary" and "not given". AlertTable maps the file and
+# answers a scan with one offset lookup per crop; weather, which is
+# continuous, is checked against the stored bounds of the few hits.
+
+MAGIC = b"PESTTBL\0"
+VERSION = 1
+HEADER = struct.Struct("<8s9I")
+DEFAULT_TABLE = "alert_table.bin"
+RAW_MEMO_SIZE = 4096     # raw request spellings remembered per field
+
+
+def build_table(path=DEFAULT_TABLE, engine=None):
+    from pest_engine import get_engine
+
+    engine = engine or get_engine()
+    districts = sorted(engine.history.districts)
+    crops = list(engine.rules_by_crop)
+    soils = list(engine.soil_vocab.names)
+    rules = [r for rs in engine.rules_by_crop.values() for r in rs]
+    rule_id = {id(r): i for i, r in enumerate(rules)}
+
+    pool = StringPool()
+    sid = pool.sid
+
+    risks = []
+    soil_bits = [engine.soil_vocab.bit(s) for s in soils] + [UNKNOWN, ANY]
+    cells, entries = [0], []
+    for district in districts + [None]:
+        for crop in crops:
+            for month in range(1, 13):
+                month_bit = 1 << month
+                for soil_bit in soil_bits:
+                    for rule in engine.rules_by_crop[crop]:
+                        if not engine.evaluate_rule(rule, month_bit, soil_bit):
+                            continue
+                        risk = engine.risk_for(district, rule, month_bit)
+                        if risk not in risks:
+                            risks.append(risk)
+                        entries.append(rule_id[id(rule)] << 4 | risks.index(risk))
+                    cells.append(len(entries))
+
+    names = [sid(n) for n in districts + crops + soils + risks]
+    rule_text = [sid(t) for r in rules
+                 for t in (r.crop, r.pest, r.symptoms, r.preventive, r.corrective)]
+    offsets, blob = pool.pack()
+
+    header = HEADER.pack(MAGIC, VERSION, len(districts), len(crops), len(soils),
+                         len(risks), len(rules), len(pool), len(cells) - 1, len(entries))
+    return write_file(path, header, [
+        ("d", [v for r in rules for v in (r.temp_lo, r.temp_hi, r.hum_lo, r.hum_hi, r.rain_lo, r.rain_hi)]),
+        ("I", offsets), ("I", names), ("I", rule_text), ("I", cells), ("I", entries),
+    ], blob)
+
+
+class AlertTable:
+
+    def __init__(self, path=DEFAULT_TABLE):
+        f = MappedFile(path, HEADER)
+        (magic, version, n_districts, n_crops, n_soils, n_risks,
+         n_rules, n_strings, n_cells, n_entries) = f.fields
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path!r} is not a version {VERSION} alert table; rebuild it")
+
+        self.bounds = f.take("d", n_rules * 6)
+        offsets = f.take("I", n_strings + 1)
+        names = f.take("I", n_districts + n_crops + n_soils + n_risks)
+        self._rule_text = f.take("I", n_rules * 5)
+        self.cells = f.take("I", n_cells + 1)
+        self.entries = f.take("I", n_entries)
+        self.strings = MappedStrings(f.rest(), offsets)
+
+        names = [self.strings[i] for i in names]
+        self.district_index = {n: i for i, n in enumerate(names[:n_districts])}
+        self.crop_index = {n: i for i, n in enumerate(names[n_districts:n_districts + n_crops])}
+        soils = names[n_districts + n_crops:n_districts + n_crops + n_soils]
+        self.soil_index = {n: i for i, n in enumerate(soils)}
+        self.risks = names[n_districts + n_crops + n_soils:]
+
+        self.n_districts = n_districts
+        self.n_crops = n_crops
+        self.n_soils = n_soils
+        self._stride = n_soils + 2
+        # raw spelling -> slot, so repeat requests skip norm_key
+        self._raw = {"district": {}, "crop": {}, "soil": {}}
+        self._alerts = [None] * n_rules     # per rule: (crop, pest, symptoms, preventive, corrective)
+
+    def _slot(self, field, index, raw, missing):
+        memo = self._raw[field]
+        slot = memo.get(raw)
+        if slot is None:
+            slot = index.get(norm_key(raw), missing)
+            if len(memo) < RAW_MEMO_SIZE:
+                memo[raw] = slot
+        return slot
+
+    def _texts(self, rule):
+        texts = self._alerts[rule]
+        if texts is None:
+            ids = self._rule_text[rule * 5:rule * 5 + 5]
+            texts = self._alerts[rule] = tuple(self.strings[i] for i in ids)
+        return texts
+
+    def _weather_ok(self, rule, temp, humidity, rainfall):
+        b = self.bounds[rule * 6:rule * 6 + 6]
+        return ((temp is None or b[0] <= temp <= b[1])
+                and (humidity is None or b[2] <= humidity <= b[3])
+                and (rainfall is None or b[4] <= rainfall <= b[5]))
+
+    def scan(self, district, soil, crops, month=None, temp=None, humidity=None, rainfall=None):
+        """Same alerts as PestEngine.scan (no growth-stage filter)."""
+        d = self._slot("district", self.district_index, district, self.n_districts) \
+            if district else self.n_districts
+        s = self._slot("soil", self.soil_index, soil, self.n_soils) if soil else self.n_soils + 1
+        m = (month or date.today().month) - 1
+        weather = temp is not None or humidity is not None or rainfall is not None
+
+        alerts = []
+        for crop in crops:
+            c = self._slot("crop", self.crop_index, crop, -1)
+            if c < 0:
+                continue
+            cell = ((d * self.n_crops + c) * 12 + m) * self._stride + s
+            for e in self.entries[self.cells[cell]:self.cells[cell + 1]]:
+                rule = e >> 4
+                if weather and not self._weather_ok(rule, temp, humidity, rainfall):
+                    continue
+                crop_name, pest, symptoms, preventive, corrective = self._texts(rule)
+                alerts.append({
+                    "crop": crop_name,
+                    "pest": pest,
+                    "risk": self.risks[e & 15],
+                    "symptoms": symptoms,
+                    "preventive": preventive,
+                    "treatment": corrective,
+                })
+        return alerts
+
+
+_UNSET = object()
+_table = _UNSET
+
+
+def get_alert_table():
+    """The table at ALERT_TABLE_PATH, mapped on first use; None when not configured."""
+    global _table
+    if _table is _UNSET:
+        path = os.getenv("ALERT_TABLE_PATH")
+        _table = AlertTable(path) if path else None
+    return _table
+
+
+def set_alert_table(table):
+    global _table
+    _table = table
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "build":
+        sys.exit("usage: python alert_table.py build [path]")
+    out = build_table(sys.argv[2] if len(sys.argv) > 2 else DEFAULT_TABLE)
+    print(f"✅ wrote {out} ({os.path.getsize(out):,} bytes)")
@@ -0,0 +1,210 @@
+import asyncio
+import json
+import logging
+import os
+
+from ttl_cache import TTLCache
+
+# Read-through cache for GET /alerts/{uid}.
+# Alerts only change when a scan writes them, so scan_farmer writes
+# through and polls are served without a Firebase round trip.
+#
+# Jobs outside the API also write alerts/{uid}: bulk_scan,
+# profile_listener and rescore. They call invalidate_written() after
+# each multi-path update. With the shared Redis backend that drops the
+# uids for every API worker. The memory backend lives inside each API
+# worker where a job can't reach it, so its entries expire sooner
+# (ALERTS_CACHE_TTL defaults to 120 s instead of 600 s). That bounds how
+# long a worker serves alerts from before such a rescan.
+
+log = logging.getLogger(__name__)
+
+
+class MemoryBackend:
+    shared = False
+
+    def __init__(self, max_size=50_000, ttl=600.0):
+        self.lru = TTLCache(max_size=max_size, ttl=ttl)
+
+    async def get(self, key):
+        return self.lru.get(key)
+
+    async def set(self, key, value):
+        self.lru.set(key, value)
+
+    async def delete(self, key):
+        self.lru.delete(key)
+
+    async def delete_many(self, keys):
+        for key in keys:
+            self.lru.delete(key)
+
+    async def set_many(self, items):
+        for key, value in items:
+            self.lru.set(key, value)
+
+    def stats(self):
+        return self.lru.stats()
+
+
+class RedisBackend:
+    """
+    Shared cache for multi-worker deployments. Takes any client with the
+    redis.asyncio API (get / set(ex=) / delete). Redis errors are logged
+    and treated as misses so a cache outage never fails a request.
+    """
+    shared = True
+
+    def __init__(self, client, ttl=600, prefix="alerts:"):
+        self.client = client
+        self.ttl = int(ttl)
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    async def get(self, key):
+        try:
+            raw = await self.client.get(self.prefix + key)
+        except Exception as e:
+            self.errors += 1
+            log.warning("redis get failed: %s", e)
+            raw = None
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(raw)
+
+    async def set(self, key, value):
+        try:
+            await self.client.set(self.prefix + key, json.dumps(value, ensure_ascii=False), ex=self.ttl)
+        except Exception as e:
+            self.errors += 1
+            log.warning("redis set failed: %s", e)
+
+    async def delete(self, key):
+        try:
+            await self.client.delete(self.prefix + key)
+        except Exception as e:
+            self.errors += 1
+            log.warning("redis delete failed: %s", e)
+
+    async def set_many(self, items):
+        await asyncio.gather(*(self.set(key, value) for key, value in items))
+
+    async def delete_many(self, keys):
+        try:
+            await self.client.delete(*(self.prefix + k for k in keys))
+        except Exception as e:
+            self.errors += 1
+            log.warning("redis delete failed: %s", e)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "errors": self.errors,
+            # evictions happen server-side: see INFO stats evicted_keys
+        }
+
+
+class AlertsCache:
+    """
+    Scans write through with put() / invalidate(); polls that miss fill
+    the cache with fill(). A fill whose Firebase read started before a
+    write for the same uid would put the old alerts back for a whole TTL,
+    so each uid with a read in flight carries a write generation that
+    put() and invalidate() bump, and the fill is dropped if it moved.
+    Generations are per process: they cover writes made by this worker.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._reads = {}         # uid -> reads in flight
+        self._writes = {}        # uid -> write generation, while reads are in flight
+
+    async def get(self, uid):
+        return await self.backend.get(uid)
+
+    async def fill(self, uid, read):
+        """After a miss: alerts from `await read()`, cached unless uid was written meanwhile."""
+        self._reads[uid] = self._reads.get(uid, 0) + 1
+        generation = self._writes.get(uid, 0)
+        try:
+            alerts = await read()
+            if self._writes.get(uid, 0) == generation:
+                await self.backend.set(uid, alerts)
+        finally:
+            if self._reads[uid] == 1:
+                del self._reads[uid]
+                self._writes.pop(uid, None)
+            else:
+                self._reads[uid] -= 1
+        return alerts
+
+    def _wrote(self, uid):
+        if uid in self._reads:
+            self._writes[uid] = self._writes.get(uid, 0) + 1
+
+    async def put(self, uid, alerts):
+        self._wrote(uid)
+        await self.backend.set(uid, alerts)
+
+    async def invalidate(self, uid):
+        self._wrote(uid)
+        await self.backend.delete(uid)
+
+    async def put_many(self, alerts_by_uid):
+        for uid in alerts_by_uid:
+            self._wrote(uid)
+        await self.backend.set_many(alerts_by_uid.items())
+
+    async def invalidate_many(self, uids):
+        for uid in uids:
+            self._wrote(uid)
+        await self.backend.delete_many(uids)
+
+    def stats(self):
+        return {"backend": type(self.backend).__name__, **self.backend.stats()}
+
+
+def from_env():
+    backend = os.getenv("ALERTS_CACHE_BACKEND", "memory")
+    ttl = float(os.getenv("ALERTS_CACHE_TTL", "600" if backend == "redis" else "120"))
+
+    if backend == "redis":
+        import redis.asyncio as redis
+        pool = redis.BlockingConnectionPool.from_url(
+            os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+            max_connections=int(os.getenv("REDIS_MAX_CONNECTIONS", "64")),
+        )
+        client = redis.Redis(connection_pool=pool)
+        return AlertsCache(RedisBackend(client, ttl=ttl))
+
+    size = int(os.getenv("ALERTS_CACHE_SIZE", "50000"))
+    return AlertsCache(MemoryBackend(max_size=size, ttl=ttl))
+
+
+_cache = None
+
+
+def get_alerts_cache():
+    global _cache
+    if _cache is None:
+        _cache = from_env()
+    return _cache
+
+
+def set_alerts_cache(cache):
+    global _cache
+    _cache = cache
+
+
+async def invalidate_written(uids):
+    """After a job outside the API wrote alerts/{uid}: drop them from a shared cache."""
+    cache = get_alerts_cache()
+    if uids and cache.backend.shared:
+        await cache.invalidate_many(list(uids))
@@ -0,0 +1,76 @@
+# benchmarks/bench_alert_table.py
+# ---------------------------------------------------------
+# Precomputed alert table: build time and size, an exhaustive
+# equality check against PestEngine.scan, and per-scan latency of
+# the table lookup vs rule evaluation (with and without weather).
+#   python benchmarks/bench_alert_table.py [iterations]
+# ---------------------------------------------------------
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from alert_table import AlertTable, build_table  # noqa: E402
+from bench_engine import make_requests  # noqa: E402
+from pest_engine import get_engine  # noqa: E402
+
+
+def check_all(table, engine):
+    soils = list(engine.soil_vocab.names) + ["volcanic ash", None]
+    districts = sorted(engine.history.districts) + ["atlantis"]
+    checked = 0
+    for d in districts:
+        for crop in engine.rules_by_crop:
+            for m in range(1, 13):
+                for s in soils:
+                    assert table.scan(d, s, [crop], month=m) == engine.scan(d, s, [crop], month=m), \
+                        (d, crop, m, s)
+                    checked += 1
+    return checked
+
+
+def timed(fn, reqs, weather):
+    start = time.perf_counter()
+    for d, s, p, sec, m, t, h, r in reqs:
+        crops = [p, sec] if sec else [p]
+        if weather:
+            fn(d, s, crops, month=m, temp=t, humidity=h, rainfall=r)
+        else:
+            fn(d, s, crops, month=m)
+    return (time.perf_counter() - start) / len(reqs)
+
+
+def main(iterations=100_000):
+    engine = get_engine()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "alerts.bin")
+        start = time.perf_counter()
+        build_table(path, engine)
+        t_build = time.perf_counter() - start
+        size = os.path.getsize(path)
+
+        start = time.perf_counter()
+        table = AlertTable(path)
+        t_open = time.perf_counter() - start
+
+        checked = check_all(table, engine)
+        reqs = make_requests(iterations)
+        for d, s, p, sec, m, t, h, r in reqs[:20_000]:
+            crops = [p, sec] if sec else [p]
+            assert table.scan(d, s, crops, m, t, h, r) == engine.scan(d, s, crops, m, temp=t, humidity=h, rainfall=r)
+
+        print(f"build: {t_build:.2f} s   size: {size:,} bytes   open: {t_open * 1e3:.2f} ms")
+        print(f"identical to PestEngine.scan for all {checked:,} district/crop/month/soil cells")
+        for weather in (False, True):
+            label = "with weather" if weather else "no weather"
+            t_engine = timed(engine.scan, reqs, weather)
+            t_table = timed(table.scan, reqs, weather)
+            print(f"{label:<13} engine {t_engine * 1e6:5.2f} µs   table {t_table * 1e6:5.2f} µs   "
+                  f"({t_engine / t_table:.2f}x)")
+        table = None    # release the mapping before the directory goes
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,126 @@
+# benchmarks/bench_alerts_cache.py
+# ---------------------------------------------------------
+# GET /alerts/{uid} polling with and without the alerts cache.
+# Firebase is the local fake RTDB (own process, simulated RTT);
+# the Redis backend runs against benchmarks/fake_redis.py.
+# First checks that a poll whose read overlaps a scan does not put the
+# pre-scan alerts back into the cache.
+#
+#   python benchmarks/bench_alerts_cache.py [farmers] [polls_each] [latency_s]
+# ---------------------------------------------------------
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import redis.asyncio as redis  # noqa: E402
+
+import main  # noqa: E402
+from alerts_cache import AlertsCache, MemoryBackend, RedisBackend, set_alerts_cache  # noqa: E402
+from fake_redis import FakeRedis  # noqa: E402
+from fake_rtdb import LocalRTDB, free_port, serve_in_process  # noqa: E402
+from firebase_async import AsyncRTDB, get_rtdb, set_rtdb  # noqa: E402
+from models import ScanRequest  # noqa: E402
+
+REQ = ScanRequest(district="Mandya", soilType="Alluvial", primaryCrop="Paddy", secondaryCrop="Sugarcane")
+
+
+class NoCache:
+    async def get(self, uid):
+        return None
+
+    async def put(self, uid, alerts):
+        pass
+
+    async def invalidate(self, uid):
+        pass
+
+    async def put_many(self, alerts_by_uid):
+        pass
+
+    async def invalidate_many(self, uids):
+        pass
+
+    async def fill(self, uid, read):
+        return await read()
+
+    def stats(self):
+        return {}
+
+
+class SlowReadRTDB(LocalRTDB):
+    """Reads see the tree as it was when they started, and answer late."""
+
+    async def get(self, path, shallow=None, **query):
+        value = await super().get(path, shallow, **query)
+        await asyncio.sleep(0.2)
+        return value
+
+
+async def check_fill_race():
+    rtdb = SlowReadRTDB({"alerts": {"u1": {"alerts": [{"pest": "OLD"}]}}})
+    set_rtdb(rtdb)
+    set_alerts_cache(AlertsCache(MemoryBackend()))
+
+    poll_task = asyncio.create_task(main.get_alerts("u1"))
+    await asyncio.sleep(0.05)                 # the poll's read is in flight
+    await main.scan_farmer("u1", REQ)
+    await poll_task
+
+    stored = [a["pest"] for a in rtdb.db.read("alerts/u1")["alerts"]]
+    served = [a["pest"] for a in (await main.get_alerts("u1"))["alerts"]]
+    assert served == stored != ["OLD"], f"stale fill: RTDB has {stored}, cache serves {served}"
+    print(f"✅ overlapping poll did not refill stale alerts ({served})")
+
+
+async def poll(farmers, polls):
+    start = time.perf_counter()
+    for _ in range(polls):
+        await asyncio.gather(*(main.get_alerts(f"u{i}") for i in range(farmers)))
+    return time.perf_counter() - start
+
+
+async def run(farmers, polls):
+    redis_port = free_port()
+    redis_server = await FakeRedis().serve(port=redis_port)
+    redis_client = redis.Redis(connection_pool=redis.BlockingConnectionPool.from_url(
+        f"redis://127.0.0.1:{redis_port}/0", max_connections=64))
+
+    caches = {
+        "no cache": NoCache(),
+        "memory LRU+TTL": AlertsCache(MemoryBackend()),
+        "redis (stand-in)": AlertsCache(RedisBackend(redis_client)),
+    }
+    for name, cache in caches.items():
+        set_alerts_cache(cache)
+        # scans write through, so the first poll is already a hit
+        await asyncio.gather(*(main.scan_farmer(f"u{i}", REQ) for i in range(farmers)))
+        elapsed = await poll(farmers, polls)
+        n = farmers * polls
+        print(f"{name:18} {elapsed:7.3f} s  {n / elapsed:9,.0f} polls/s  {cache.stats()}")
+
+    await redis_client.aclose()
+    redis_server.close()
+    await get_rtdb().aclose()
+
+
+def main_(farmers=200, polls=10, latency=0.02):
+    asyncio.run(check_fill_race())
+    base_url, proc = serve_in_process(latency=latency)
+    set_rtdb(AsyncRTDB(base_url))
+    try:
+        print(f"farmers: {farmers}, polls each: {polls}, simulated RTT: {latency * 1000:.0f} ms")
+        asyncio.run(run(farmers, polls))
+    finally:
+        proc.terminate()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main_(
+        int(args[0]) if len(args) > 0 else 200,
+        int(args[1]) if len(args) > 1 else 10,
+        float(args[2]) if len(args) > 2 else 0.02,
+    )
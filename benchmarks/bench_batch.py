@@ -0,0 +1,62 @@
+# benchmarks/bench_batch.py
+# ---------------------------------------------------------
+# Vectorized batch scoring vs the per-farmer PestEngine path.
+#   python benchmarks/bench_batch.py [farmers]
+# ---------------------------------------------------------
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from bench_engine import make_requests  # noqa: E402
+from pest_batch import get_batch  # noqa: E402
+from pest_engine import get_engine  # noqa: E402
+
+
+def make_farmers(n):
+    return [
+        {
+            "district": d, "soilType": s, "crops": [p] + ([sec] if sec else []),
+            "month": m, "temp": t, "humidity": h, "rainfall": r,
+        }
+        for d, s, p, sec, m, t, h, r in make_requests(n)
+    ]
+
+
+def main(n=100_000):
+    farmers = make_farmers(n)
+    scorer, engine = get_batch(), get_engine()
+
+    start = time.perf_counter()
+    packed = scorer.pack(farmers)
+    t_pack = time.perf_counter() - start
+
+    start = time.perf_counter()
+    hits = scorer.score(packed)
+    t_score = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = scorer.scan_many(farmers)
+    t_batch = time.perf_counter() - start
+
+    start = time.perf_counter()
+    single = [
+        engine.scan(f["district"], f["soilType"], f["crops"], month=f["month"],
+                    temp=f["temp"], humidity=f["humidity"], rainfall=f["rainfall"])
+        for f in farmers
+    ]
+    t_single = time.perf_counter() - start
+
+    assert batch == single, "batch and per-farmer alerts differ"
+
+    print(f"farmers:            {n}  (rules: {hits.shape[1]}, hits: {int(hits.sum())})")
+    print(f"pack columns:       {t_pack:.3f} s")
+    print(f"score matrix only:  {t_score:.3f} s")
+    print(f"batch scan_many:    {t_batch:.3f} s")
+    print(f"per-farmer scan:    {t_single:.3f} s")
+    print(f"speed-up:           {t_single / t_batch:.2f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,53 @@
+# benchmarks/bench_engine.py
+# ---------------------------------------------------------
+# Per-scan latency of the compiled PestEngine.
+#   python benchmarks/bench_engine.py [iterations]
+# ---------------------------------------------------------
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from pest_engine import get_engine, run_scan  # noqa: E402
+
+SOILS = ["red soil", "black soil", "alluvial", "laterite", "clayey", "loamy", "sandy_loam"]
+
+
+def make_requests(n, seed=42):
+    rng = random.Random(seed)
+    districts = ["mandya", "mysuru", "hassan", "kodagu", "dharwad", "raichur"]
+    crops = list(get_engine().rules_by_crop)
+    return [
+        (
+            rng.choice(districts),
+            rng.choice(SOILS),
+            rng.choice(crops),
+            rng.choice(crops + [None]),
+            rng.randint(1, 12),
+            rng.uniform(15, 38),
+            rng.uniform(30, 98),
+            rng.uniform(200, 3500),
+        )
+        for _ in range(n)
+    ]
+
+
+def main(iterations=100_000):
+    reqs = make_requests(iterations)
+
+    start = time.perf_counter()
+    for d, s, p, sec, m, t, h, r in reqs:
+        run_scan(d, s, p, sec, "en", month=m, temp=t, humidity=h, rainfall=r)
+    elapsed = time.perf_counter() - start
+
+    per_scan_us = elapsed / iterations * 1e6
+    print(f"scans:        {iterations}")
+    print(f"total:        {elapsed:.3f} s")
+    print(f"per scan:     {per_scan_us:.2f} µs")
+    print(f"scans/s:      {iterations / elapsed:,.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,116 @@
+# benchmarks/bench_farmer_read.py
+# ---------------------------------------------------------
+# Farmer-context reads against the fake RTDB for user nodes with a
+# growing activity history: the old full Users/{uid} fetch, the first
+# projected read (walks the crop logs, writes cropSummary) and later
+# reads served from cropSummary. Reports bytes received and latency
+# at a simulated round-trip time.
+#   python benchmarks/bench_farmer_read.py [latency_s] [reads]
+# ---------------------------------------------------------
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from fake_rtdb import serve_in_process  # noqa: E402
+from firebase_async import AsyncRTDB  # noqa: E402
+from firebase_reader import extract_farmer_context, get_farmer_context_async  # noqa: E402
+
+ACTIVITIES = ["irrigation", "weeding", "fertilizer", "spraying", "scouting", "harvest"]
+
+
+def make_user(activities, seed=0):
+    """A farmer with 3 crop logs, each carrying its activity history, plus daily notes."""
+    rng = random.Random(seed)
+
+    def history(n):
+        return {
+            f"-A{i:07d}": {
+                "type": rng.choice(ACTIVITIES),
+                "date": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                "quantity": round(rng.uniform(0, 50), 1),
+                "notes": "Observed leaf curling on a few plants near the bund; sprayed neem oil.",
+            }
+            for i in range(n)
+        }
+
+    per_crop = max(activities // 3, 1)
+    return {
+        "name": "Farmer", "phone": "+919800000000", "district": "mandya", "soilType": "red soil",
+        "farmActivityLogs": {
+            "primary_crop": {
+                "-C1": {"cropName": "Paddy", "sowingDate": "2024-06-10", "activities": history(per_crop)},
+                "-C2": {"cropName": "Paddy", "sowingDate": "2023-06-12", "activities": history(per_crop)},
+            },
+            "secondary_crop": {
+                "-C3": {"cropName": "Ragi", "sowingDate": "2024-07-01", "activities": history(per_crop)},
+            },
+            "daily_notes": history(activities),
+        },
+    }
+
+
+class CountingRTDB(AsyncRTDB):
+    def __init__(self, *a, **kw):
+        super().__init__(*a, **kw)
+        self.requests = 0
+        self.bytes = 0
+
+    async def get(self, path, shallow=None, **query):
+        value = await super().get(path, shallow=shallow, **query)
+        self.requests += 1
+        self.bytes += len(json.dumps(value, ensure_ascii=False))
+        return value
+
+
+async def full_read(uid, rtdb):
+    return extract_farmer_context(await rtdb.get(f"Users/{uid}"))
+
+
+async def timed(fn, rtdb, uids):
+    rtdb.requests = rtdb.bytes = 0
+    start = time.perf_counter()
+    results = [await fn(uid, rtdb) for uid in uids]
+    elapsed = (time.perf_counter() - start) / len(uids)
+    return results, elapsed, rtdb.bytes / len(uids), rtdb.requests / len(uids)
+
+
+async def main(latency=0.02, reads=20):
+    sizes = [10, 300, 3_000, 15_000]
+    users = {}
+    for n in sizes:
+        user = make_user(n, seed=n)
+        users[f"u{n}"] = user
+        # fresh copies without a cropSummary; the logs themselves are shared
+        users.update({f"u{n}_{i}": dict(user) for i in range(reads)})
+    url, proc = serve_in_process({"Users": users}, latency=latency)
+    rtdb = CountingRTDB(url)
+
+    try:
+        await rtdb.get("Users/u10/district")      # warm the connection
+        print(f"simulated RTT: {latency * 1e3:.0f} ms, {reads} reads per size\n")
+        print(f"{'activities':>10}  {'full bytes':>11} {'ms':>6}  "
+              f"{'first bytes':>11} {'reqs':>4} {'ms':>6}  {'summary bytes':>13} {'reqs':>4} {'ms':>6}")
+        for n in sizes:
+            uids = [f"u{n}_{i}" for i in range(reads)]
+            full, t_full, b_full, _ = await timed(full_read, rtdb, uids)
+            first, t_first, b_first, r_first = await timed(get_farmer_context_async, rtdb, uids)
+            warm, t_warm, b_warm, r_warm = await timed(get_farmer_context_async, rtdb, uids)
+            crops = [sorted(c["crops"]) for c in full]
+            assert crops == [sorted(c["crops"]) for c in first] == [sorted(c["crops"]) for c in warm]
+            print(f"{n:>10}  {b_full:>11,.0f} {t_full * 1e3:>6.1f}  "
+                  f"{b_first:>11,.0f} {r_first:>4.0f} {t_first * 1e3:>6.1f}  "
+                  f"{b_warm:>13,.0f} {r_warm:>4.0f} {t_warm * 1e3:>6.1f}")
+    finally:
+        await rtdb.aclose()
+        proc.terminate()
+
+
+if __name__ == "__main__":
+    latency = float(sys.argv[1]) if len(sys.argv) > 1 else 0.02
+    reads = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    asyncio.run(main(latency, reads))
@@ -0,0 +1,79 @@
+# benchmarks/bench_firebase_io.py
+# ---------------------------------------------------------
+# Firebase I/O throughput against the local fake RTDB with a
+# simulated network round trip:
+#   - blocking calls on a 40-thread pool (FastAPI's default for
+#     sync handlers, i.e. the old db.reference().get()/set() path)
+#   - AsyncRTDB with many calls in flight on one event loop
+#
+#   python benchmarks/bench_firebase_io.py [calls] [latency_s] [in_flight]
+# ---------------------------------------------------------
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from fake_rtdb import serve_in_process  # noqa: E402
+from firebase_async import AsyncRTDB  # noqa: E402
+
+ALERT = {"alerts": [{"crop": "paddy", "pest": "Blast Disease", "risk": "High"}]}
+
+
+def run_threadpool(base_url, calls, workers=40):
+    client = requests.Session()
+    client.mount("http://", requests.adapters.HTTPAdapter(pool_maxsize=workers))
+
+    def one(i):
+        client.put(f"{base_url}/alerts/u{i}.json", json=ALERT)
+        client.get(f"{base_url}/alerts/u{i}.json")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(workers) as pool:
+        list(pool.map(one, range(calls)))
+    elapsed = time.perf_counter() - start
+    client.close()
+    return elapsed
+
+
+async def run_async(base_url, calls, in_flight):
+    rtdb = AsyncRTDB(base_url, max_connections=in_flight)
+    sem = asyncio.Semaphore(in_flight)
+
+    async def one(i):
+        async with sem:
+            await rtdb.set(f"alerts/u{i}", ALERT)
+            await rtdb.get(f"alerts/u{i}")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(calls)))
+    elapsed = time.perf_counter() - start
+    await rtdb.aclose()
+    return elapsed
+
+
+def main(calls=2000, latency=0.02, in_flight=400):
+    base_url, server = serve_in_process(latency=latency)
+
+    t_pool = run_threadpool(base_url, calls)
+    t_async = asyncio.run(run_async(base_url, calls, in_flight))
+    server.terminate()
+
+    ops = calls * 2
+    print(f"set+get pairs:         {calls}  (simulated RTT {latency * 1000:.0f} ms)")
+    print(f"threadpool (40):       {t_pool:.2f} s   {ops / t_pool:,.0f} ops/s")
+    print(f"async ({in_flight} in flight):  {t_async:.2f} s   {ops / t_async:,.0f} ops/s")
+    print(f"speed-up:              {t_pool / t_async:.1f}x")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(
+        int(args[0]) if len(args) > 0 else 2000,
+        float(args[1]) if len(args) > 1 else 0.02,
+        int(args[2]) if len(args) > 2 else 400,
+    )
@@ -0,0 +1,63 @@
+# benchmarks/bench_history.py
+# ---------------------------------------------------------
+# "What is active in this district/crop this month?"
+# Nested PEST_HISTORY walk vs the precomputed HistoryIndex.
+#   python benchmarks/bench_history.py [iterations]
+# ---------------------------------------------------------
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from district_pest_history import PEST_HISTORY  # noqa: E402
+from history_index import get_history_index  # noqa: E402
+from kb_utils import MONTHS  # noqa: E402
+
+
+def walk(district, crop, month):
+    name = MONTHS[month - 1]
+    out = []
+    for pest, h in PEST_HISTORY.get(district, {}).get(crop, {}).items():
+        if name in h["season"] or name in h["peak_months"]:
+            out.append(pest)
+    return out
+
+
+def main(iterations=200_000):
+    rng = random.Random(7)
+    keys = [(d, c) for d, crops in PEST_HISTORY.items() for c in crops]
+    index = get_history_index()
+    queries = [rng.choice(keys) + (rng.randint(1, 12),) for _ in range(iterations)]
+
+    for d, c, m in queries[:2000]:
+        assert walk(d, c, m) == [e.pest for e in index.active(d, c, m)]
+
+    start = time.perf_counter()
+    for d, c, m in queries:
+        walk(d, c, m)
+    t_walk = time.perf_counter() - start
+
+    active = index.active
+    start = time.perf_counter()
+    for d, c, m in queries:
+        active(d, c, m)
+    t_index = time.perf_counter() - start
+
+    sample = queries[:10_000]
+    tracemalloc.start()
+    for d, c, m in sample:
+        active(d, c, m)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"lookups:        {iterations}")
+    print(f"nested walk:    {t_walk / iterations * 1e9:.0f} ns/lookup")
+    print(f"history index:  {t_index / iterations * 1e9:.0f} ns/lookup")
+    print(f"index peak alloc over 10k lookups: {peak} bytes")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
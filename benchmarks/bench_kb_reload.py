@@ -0,0 +1,112 @@
+# benchmarks/bench_kb_reload.py
+# ---------------------------------------------------------
+# Hot KB reload under load. Requests run through main.scan_farmer
+# (RTDB and alerts cache faked in memory) while KBReloader swaps between
+# the real KB and a 10x synthetic one every few hundred milliseconds.
+# Reports request latency with and without reloads, the longest
+# event-loop gap, swap cost, and checks that every scan answer came
+# wholly from one KB version. A malformed RTDB KB is also pushed to
+# check it is rejected.
+#   python benchmarks/bench_kb_reload.py [seconds]
+# ---------------------------------------------------------
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import main  # noqa: E402
+from alerts_cache import AlertsCache, MemoryBackend, set_alerts_cache  # noqa: E402
+from bench_scan_cache import MemoryRTDB, make_requests  # noqa: E402
+from firebase_async import set_rtdb  # noqa: E402
+from kb_reload import KBReloader  # noqa: E402
+from kb_snapshot import build_snapshot  # noqa: E402
+from pest_db_extended import PEST_DB  # noqa: E402
+from pest_engine import PestEngine, get_engine  # noqa: E402
+from synthetic_kb import synthetic_kb  # noqa: E402
+
+
+class KBNode:
+    def __init__(self, node):
+        self.node = node
+
+    async def get(self, path):
+        return self.node
+
+
+def pct(xs, p):
+    return sorted(xs)[min(len(xs) - 1, int(len(xs) * p))]
+
+
+async def drive(reqs, seconds, answers, rtdb):
+    lat, gaps = [], []
+    stop = time.perf_counter() + seconds
+    last = time.perf_counter()
+    i = 0
+    while time.perf_counter() < stop:
+        uid, req = reqs[i % len(reqs)]
+        start = time.perf_counter()
+        await main.scan_farmer(uid, req)
+        now = time.perf_counter()
+        lat.append(now - start)
+        gaps.append(start - last)
+        last = now
+        got = rtdb.data[f"alerts/{uid}"]["alerts"]
+        assert any(got == a[i % len(reqs)] for a in answers), "answer mixes KB versions"
+        i += 1
+        await asyncio.sleep(0)
+    return lat, gaps
+
+
+async def flip(reloader, paths, period):
+    k = 0
+    while True:
+        await asyncio.sleep(period)
+        k += 1
+        path = paths[k % 2]
+        reloader.snapshot_path = path
+        await reloader.check_file()
+
+
+async def bench(seconds=3.0):
+    rtdb = MemoryRTDB()
+    set_rtdb(rtdb)
+    set_alerts_cache(AlertsCache(MemoryBackend()))
+    reqs = [r for r in make_requests(2000) if r[1].language == "en"]
+
+    # the new KB: every real rule with revised symptoms, plus 10x synthetic crops
+    revised = {crop: {pest: {**e, "symptoms": e.get("symptoms", "") + " (rev. 2)"} for pest, e in pests.items()}
+               for crop, pests in PEST_DB.items()}
+    base, big = get_engine(), PestEngine({**synthetic_kb(crops=10)[0], **revised})
+    answers = []
+    for engine in (base, big):
+        answers.append([engine.scan(r.district, r.soilType, [c for c in (r.primaryCrop, r.secondaryCrop) if c])
+                        for _, r in reqs])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [build_snapshot(os.path.join(tmp, "a.bin"), base),
+                 build_snapshot(os.path.join(tmp, "b.bin"), big)]
+        reloader = KBReloader(snapshot_path=paths[0])
+        await reloader.check_file()
+
+        lat0, gaps0 = await drive(reqs, seconds, answers, rtdb)
+        task = asyncio.create_task(flip(reloader, paths, 0.2))
+        lat1, gaps1 = await drive(reqs, seconds, answers, rtdb)
+        task.cancel()
+
+    for label, lat, gaps in (("steady", lat0, gaps0), ("reloading", lat1, gaps1)):
+        print(f"{label:<10} {len(lat):7,} req  p50 {statistics.median(lat) * 1e6:6.1f} µs  "
+              f"p99 {pct(lat, 0.99) * 1e6:7.1f} µs  max loop gap {max(gaps) * 1e3:6.2f} ms")
+    print(f"reloads: {reloader.stats}")
+
+    reloader.rtdb, reloader.rtdb_path = KBNode({"PEST_DB": {"rice": {"bad": {"temp_range": [30, 20]}}}}), "kb"
+    before = get_engine()
+    assert not await reloader.check_rtdb() and get_engine() is before
+    print(f"malformed KB rejected; still serving {reloader.version}")
+
+
+if __name__ == "__main__":
+    asyncio.run(bench(float(sys.argv[1]) if len(sys.argv) > 1 else 3.0))
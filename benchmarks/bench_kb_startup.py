@@ -0,0 +1,93 @@
+# benchmarks/bench_kb_startup.py
+# ---------------------------------------------------------
+# Scan-worker start-up: time to a ready PestEngine and the process's
+# resident memory afterwards (RssAnon is private to the worker, RssFile
+# is page cache shared by every worker mapping the same file), for
+#   compile   import PEST_DB / PEST_HISTORY and compile them
+#   pickle    the old pickled-engine snapshot
+#   mmap      kb_snapshot.py's mapped snapshot
+# on the real KB and on a synthetic one `scale` times larger, with
+# scans checked identical across all three.
+#   python benchmarks/bench_kb_startup.py [scale] [runs]
+# ---------------------------------------------------------
+import os
+import pickle
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from kb_snapshot import build_snapshot, load_snapshot  # noqa: E402
+from pest_engine import PestEngine, get_engine  # noqa: E402
+from synthetic_kb import synthetic_kb  # noqa: E402
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+{load}
+took = time.perf_counter() - start
+status = dict(line.split(":", 1) for line in open("/proc/self/status"))
+print(took, *(int(status[k].split()[0]) for k in ("VmRSS", "RssAnon", "RssFile")))
+"""
+
+LOADERS = {
+    "compile": "from pest_engine import get_engine; get_engine()",
+    "pickle": "import pickle; pickle.load(open({path!r}, 'rb'))",
+    "mmap": "from kb_snapshot import load_snapshot; load_snapshot({path!r})",
+}
+
+
+def probe(load, runs):
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", PROBE.format(load=load)],
+                             cwd=ROOT, check=True, capture_output=True, text=True).stdout
+        samples.append([float(v) for v in out.split()])
+    took, rss, anon, file_ = (statistics.median(col) for col in zip(*samples))
+    return took, rss / 1024, anon / 1024, file_ / 1024
+
+
+def check_same(engines):
+    base = engines[0]
+    for crop in base.rules_by_crop:
+        for month in range(1, 13):
+            for soil in list(base.soil_vocab.names) + [None]:
+                for district in sorted(base.history.districts)[:5] + ["atlantis"]:
+                    want = base.scan(district, soil, [crop], month=month, temp=26, humidity=80)
+                    for other in engines[1:]:
+                        assert other.scan(district, soil, [crop], month=month, temp=26, humidity=80) == want
+
+
+def compare(label, engine, runs, tmp, with_compile):
+    snap = build_snapshot(os.path.join(tmp, f"{label}.bin"), engine)
+    pick = os.path.join(tmp, f"{label}.pickle")
+    with open(pick, "wb") as f:
+        pickle.dump(engine, f, pickle.HIGHEST_PROTOCOL)
+    with open(pick, "rb") as f:
+        check_same([engine, pickle.load(f), load_snapshot(snap)])
+
+    rules = sum(len(rs) for rs in engine.rules_by_crop.values())
+    print(f"\n{label}: {rules:,} rules   mmap file {os.path.getsize(snap):,} B   "
+          f"pickle {os.path.getsize(pick):,} B   (scans identical)")
+    print(f"  {'':8} {'ready':>9} {'VmRSS':>9} {'RssAnon':>9} {'RssFile':>9}")
+    baseline = probe("pass", runs)
+    for name, load in LOADERS.items():
+        if name == "compile" and not with_compile:
+            continue
+        path = snap if name == "mmap" else pick
+        took, rss, anon, file_ = probe(load.format(path=path), runs)
+        print(f"  {name:8} {took * 1e3:6.1f} ms {rss:6.1f} MB {anon:6.1f} MB {file_:6.1f} MB   "
+              f"(+{rss - baseline[1]:.1f} MB over a bare interpreter)")
+
+
+def main(scale=100, runs=5):
+    with tempfile.TemporaryDirectory() as tmp:
+        compare("real KB", get_engine(), runs, tmp, with_compile=True)
+        compare(f"{scale}x KB", PestEngine(synthetic_kb(crops=scale)[0]), runs, tmp, with_compile=False)
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
@@ -0,0 +1,91 @@
+# benchmarks/bench_listener.py
+# ---------------------------------------------------------
+# ProfileListener against the fake RTDB's event stream: bursts of
+# profile edits (plus edits to irrelevant fields) go in over REST,
+# the listener debounces them and rescans each dirty farmer once.
+#   python benchmarks/bench_listener.py [farmers] [edited] [edits_per_farmer]
+# ---------------------------------------------------------
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from bench_engine import SOILS  # noqa: E402
+from bench_rescore import make_users  # noqa: E402
+from fake_rtdb import serve_in_process  # noqa: E402
+from firebase_async import AsyncRTDB  # noqa: E402
+from profile_listener import ProfileListener  # noqa: E402
+
+
+async def edit(writer, uid, rng, n):
+    # a burst: mostly scan-relevant fields, some noise the listener must ignore
+    for _ in range(n):
+        roll = rng.random()
+        if roll < 0.4:
+            await writer.update(f"Users/{uid}", {"soilType": rng.choice(SOILS)})
+        elif roll < 0.8:
+            await writer.set(f"Users/{uid}/farmActivityLogs/primary_crop/c{rng.randint(1, 3)}",
+                             {"cropName": rng.choice(["paddy", "maize", "ragi", "sugarcane"])})
+        else:
+            await writer.update(f"Users/{uid}", {"lastSeen": time.time()})
+
+
+async def main(farmers=20_000, edited=2_000, per_farmer=5, debounce=0.3):
+    users = make_users(farmers)
+    url, proc = serve_in_process({"Users": users})
+    rng = random.Random(11)
+    reader, writer = AsyncRTDB(url), AsyncRTDB(url)
+    listener = ProfileListener(reader, debounce=debounce, max_delay=5 * debounce)
+
+    try:
+        start = time.perf_counter()
+        task = asyncio.create_task(listener.run())
+        while listener.stats["events"] == 0:
+            # wait until the stream is attached (the snapshot is skipped)
+            await writer.update("Users/uid0000000", {"lastSeen": 0})
+            await asyncio.sleep(0.05)
+        t_attach = time.perf_counter() - start
+        listener.stats = dict.fromkeys(listener.stats, 0)
+
+        targets = rng.sample(sorted(users), edited)
+        sem = asyncio.Semaphore(100)
+
+        async def one(uid):
+            async with sem:
+                await edit(writer, uid, rng, per_farmer)
+
+        start = time.perf_counter()
+        await asyncio.gather(*map(one, targets))
+        t_edits = time.perf_counter() - start
+
+        # let the stream catch up and every debounce window close
+        stats = listener.stats
+        while stats["events"] < edited * per_farmer or stats["rescanned"] < stats["queued"]:
+            await asyncio.sleep(debounce / 4)
+            if time.perf_counter() - start > 60:
+                break
+        t_done = time.perf_counter() - start
+        task.cancel()
+    finally:
+        await reader.aclose()
+        await writer.aclose()
+        proc.terminate()
+
+    s = listener.stats
+    print(f"farmers: {farmers}  edited: {edited} x {per_farmer} edits  debounce: {debounce}s")
+    print(f"stream attach (incl. {farmers}-user snapshot): {t_attach:.2f} s")
+    print(f"edits sent:      {edited * per_farmer} in {t_edits:.2f} s")
+    print(f"events:          {s['events']}  ({s['events'] / t_done:,.0f}/s)")
+    print(f"ignored:         {s['ignored']}")
+    print(f"queued/coalesced:{s['queued']:>6} / {s['coalesced']}")
+    print(f"rescanned:       {s['rescanned']}  written: {s['written']}  errors: {s['errors']}")
+    print(f"cropSummary writes: {s['summaries']}")
+    print(f"all alerts written {t_done:.2f} s after the first edit")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:4]]
+    asyncio.run(main(*args))
@@ -0,0 +1,62 @@
+# benchmarks/bench_memory.py
+# ---------------------------------------------------------
+# Memory of the season/stage/soil fields and of whole entries:
+# PEST_DB dicts of string lists vs compiled Rule bitmask records.
+#   python benchmarks/bench_memory.py
+# ---------------------------------------------------------
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from pest_db_extended import PEST_DB  # noqa: E402
+from pest_engine import Rule, get_engine  # noqa: E402
+
+TEXT_FIELDS = ("symptoms", "preventive", "corrective")
+
+
+def deep_size(obj, seen):
+    """sys.getsizeof over the object graph, counting each object once."""
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size(k, seen) + deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_size(v, seen) for v in obj)
+    elif hasattr(obj, "__slots__"):
+        size += sum(deep_size(getattr(obj, s), seen) for s in obj.__slots__)
+    return size
+
+
+def main():
+    entries = [e for pests in PEST_DB.values() for e in pests.values()]
+    engine = get_engine()
+    rules = [r for rules in engine.rules_by_crop.values() for r in rules]
+
+    # advisory texts are shared by both representations
+    shared = set()
+    for e in entries:
+        for f in TEXT_FIELDS:
+            shared.add(id(e[f]))
+
+    seen = set(shared)
+    dict_sets = sum(deep_size(e.get(k), seen) for e in entries for k in ("season", "stage", "soil"))
+    seen = set(shared)
+    mask_sets = sum(deep_size(getattr(r, k), seen) for r in rules for k in ("months", "stages", "soils"))
+
+    seen = set(shared)
+    dict_total = deep_size(PEST_DB, seen)
+    seen = set(shared)
+    rule_total = deep_size(engine.rules_by_crop, seen)
+
+    print(f"entries:                      {len(entries)}  ({len(Rule.__slots__)} slots per Rule)")
+    print(f"season/stage/soil lists:      {dict_sets:>8} bytes")
+    print(f"season/stage/soil bitmasks:   {mask_sets:>8} bytes  ({dict_sets / mask_sets:.1f}x smaller)")
+    print(f"PEST_DB (excl. texts):        {dict_total:>8} bytes")
+    print(f"compiled rules (excl. texts): {rule_total:>8} bytes  ({dict_total / rule_total:.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    main()
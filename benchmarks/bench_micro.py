@@ -0,0 +1,173 @@
+# benchmarks/bench_micro.py
+# ---------------------------------------------------------
+# Microbenchmarks of the KB hot paths, reported the way
+# pytest-benchmark does (min / max / mean / stddev / median / IQR /
+# ops per call, calibrated rounds), at several KB sizes:
+#
+#   scan        run_scan; PestEngine.scan with weather; BatchScorer
+#   history     HistoryIndex by district+crop+month and by
+#               district+month; the nested PEST_HISTORY walk
+#   rules       evaluate_rule over one crop's rules and over every
+#               rule of every crop
+#
+# --scale 1,10,100 multiplies districts, crops and pest entries (see
+# synthetic_kb.py); --pests N also multiplies pests per crop, which is
+# what lengthens each crop's scan. --json writes the stats.
+#   python benchmarks/bench_micro.py [--scale 1,10,100] [--pests 1] [--filter history] [--json out.json]
+# ---------------------------------------------------------
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from history_index import HistoryIndex  # noqa: E402
+from kb_utils import ANY, MONTHS  # noqa: E402
+from pest_batch import BatchScorer  # noqa: E402
+from pest_engine import PestEngine, run_scan, set_engine  # noqa: E402
+from synthetic_kb import synthetic_kb  # noqa: E402
+
+QUERIES = 1000          # distinct inputs cycled through by each benchmark
+
+
+class Benchmark:
+    """Calibrated rounds of `fn(q) for q in queries`; stats are per call."""
+
+    def __init__(self, min_round=0.002, max_time=0.5, max_rounds=200, min_rounds=5):
+        self.min_round = min_round
+        self.max_time = max_time
+        self.max_rounds = max_rounds
+        self.min_rounds = min_rounds
+        self.results = []
+
+    def _round(self, fn, queries, loops):
+        start = time.perf_counter()
+        for _ in range(loops):
+            for q in queries:
+                fn(q)
+        return (time.perf_counter() - start) / (loops * len(queries))
+
+    def __call__(self, group, name, params, fn, queries):
+        loops = 1
+        while self._round(fn, queries, loops) * loops * len(queries) < self.min_round:
+            loops *= 2
+        samples = []
+        deadline = time.perf_counter() + self.max_time
+        while len(samples) < self.min_rounds or (time.perf_counter() < deadline
+                                                 and len(samples) < self.max_rounds):
+            samples.append(self._round(fn, queries, loops))
+        q1, _, q3 = statistics.quantiles(samples, n=4)
+        mean = statistics.fmean(samples)
+        stats = {
+            "min": min(samples), "max": max(samples), "mean": mean,
+            "stddev": statistics.stdev(samples), "median": statistics.median(samples),
+            "iqr": q3 - q1, "ops": 1 / mean, "rounds": len(samples), "iterations": loops * len(queries),
+        }
+        self.results.append({"group": group, "name": name, "params": params, "stats": stats})
+        return stats
+
+
+def setup(scale, pests, seed=11):
+    db, history = synthetic_kb(districts=scale, crops=scale, pests=pests)
+    start = time.perf_counter()
+    engine = PestEngine(db, HistoryIndex(history))
+    compile_s = time.perf_counter() - start
+    set_engine(engine)
+
+    rng = random.Random(seed)
+    districts = sorted(engine.history.districts)
+    crops = list(engine.rules_by_crop)
+    soils = list(engine.soil_vocab.names) + [None]
+    pairs = [(d, c) for d, cs in history.items() for c in cs]
+    scans = [(rng.choice(districts), rng.choice(soils), rng.choice(crops),
+              rng.choice(crops) if rng.random() < 0.5 else None, rng.randint(1, 12),
+              rng.uniform(15, 38), rng.uniform(40, 100), rng.uniform(200, 3000))
+             for _ in range(QUERIES)]
+    return {
+        "engine": engine, "history": history, "compile_s": compile_s,
+        "scans": scans,
+        "cells": [rng.choice(pairs) + (rng.randint(1, 12),) for _ in range(QUERIES)],
+        "district_months": [(rng.choice(districts), rng.randint(1, 12)) for _ in range(QUERIES)],
+        "farmers": [{"district": d, "soilType": s, "crops": [p, q] if q else [p], "month": m,
+                     "temp": t, "humidity": h, "rainfall": r} for d, s, p, q, m, t, h, r in scans],
+    }
+
+
+def cases(ctx):
+    engine, history = ctx["engine"], ctx["history"]
+    index = engine.history
+    evaluate = PestEngine.evaluate_rule
+    all_rules = [r for rs in engine.rules_by_crop.values() for r in rs]
+
+    def walk(q):
+        district, crop, month = q
+        name = MONTHS[month - 1]
+        return [p for p, h in history.get(district, {}).get(crop, {}).items()
+                if name in h["season"] or name in h["peak_months"]]
+
+    def match_crop(q):
+        _, _, crop, _, month, t, h, r = q
+        bit = 1 << month
+        return sum(evaluate(rule, bit, ANY, ANY, t, h, r) for rule in engine.rules_by_crop[crop])
+
+    def match_all(q):
+        bit = 1 << q[4]
+        return sum(evaluate(rule, bit, ANY, ANY, q[5], q[6], q[7]) for rule in all_rules)
+
+    scorer = BatchScorer(engine)
+    farmers = ctx["farmers"]
+    return [
+        ("scan", "run_scan", lambda q: run_scan(q[0], q[1], q[2], q[3], "en", month=q[4]), ctx["scans"]),
+        ("scan", "engine.scan+weather",
+         lambda q: engine.scan(q[0], q[1], [q[2]], q[4], None, q[5], q[6], q[7]), ctx["scans"]),
+        ("scan", "batch per farmer", lambda chunk: scorer.scan_many(chunk),
+         [farmers[i:i + 100] for i in range(0, len(farmers), 100)]),
+        ("history", "index.active(d,c,m)", lambda q: index.active(*q), ctx["cells"]),
+        ("history", "index.active_in_district", lambda q: index.active_in_district(*q), ctx["district_months"]),
+        ("history", "PEST_HISTORY walk", walk, ctx["cells"]),
+        ("rules", "match one crop", match_crop, ctx["scans"]),
+        ("rules", "match all rules", match_all, ctx["scans"][:50]),
+    ]
+
+
+def main():
+    ap = argparse.ArgumentParser(description="KB lookup and rule evaluation microbenchmarks")
+    ap.add_argument("--scale", default="1,10,100", type=lambda s: [int(x) for x in s.split(",")])
+    ap.add_argument("--pests", type=int, default=1, help="pests-per-crop multiplier")
+    ap.add_argument("--filter", default="", help="only groups/names containing this")
+    ap.add_argument("--json", help="write pytest-benchmark-like JSON here")
+    args = ap.parse_args()
+
+    bench = Benchmark()
+    for scale in args.scale:
+        ctx = setup(scale, args.pests)
+        engine = ctx["engine"]
+        rules = sum(len(rs) for rs in engine.rules_by_crop.values())
+        print(f"\nscale {scale}x, pests/crop x{args.pests}: {len(engine.history.districts)} districts, "
+              f"{len(engine.rules_by_crop)} crops, {rules} rules, {len(engine.history.entries)} history "
+              f"entries (compiled in {ctx['compile_s'] * 1e3:.0f} ms)")
+        print(f"  {'group':<8} {'name':<26} {'min':>9} {'median':>9} {'mean':>9} {'stddev':>9} "
+              f"{'IQR':>9} {'ops/s':>12} {'rounds':>6}")
+        for group, name, fn, queries in cases(ctx):
+            if args.filter not in group and args.filter not in name:
+                continue
+            per = 100 if name == "batch per farmer" else 1
+            s = bench(group, name, {"scale": scale, "pests": args.pests}, fn, queries)
+            print(f"  {group:<8} {name:<26} " + " ".join(
+                f"{s[k] / per * 1e6:7.2f}µs" for k in ("min", "median", "mean", "stddev", "iqr"))
+                + f" {s['ops'] * per:12,.0f} {s['rounds']:6}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"machine_info": {"python": platform.python_version(), "cpus": os.cpu_count()},
+                       "benchmarks": bench.results}, f, indent=2)
+        print(f"✅ wrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# benchmarks/bench_names.py
+# ---------------------------------------------------------
+# District / crop name resolution (name_index.py): cost of a memoized
+# hit, of a first-time exact, alias and fuzzy resolution, and how many
+# app-style spellings resolve now vs with plain norm_key.
+#   python benchmarks/bench_names.py [iterations]
+# ---------------------------------------------------------
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from kb_utils import norm_key  # noqa: E402
+from name_index import NameIndex  # noqa: E402
+from pest_engine import get_engine  # noqa: E402
+
+SPELLINGS = {
+    "district": ["Bengaluru Rural", "Bangalore rural", "Mysore", "Belgaum", "Chikmagalur", "Gulbarga",
+                 "Shimoga", "Coorg", "Mangalore", "Tumkur", "Davangere", "Bengaluru urbn", "Chitradurg",
+                 "Raichuru", "Hubli-Dharwad", "mysuru"],
+    "crop": ["Ragi/finger millet", "Jowar", "sorghum", "Rice", "Paddy (rice)", "tomatoes", "Chillies",
+             "arecanut", "Ground Nut", "Sugar cane", "Maize / corn", "Red gram", "tur", "bananna",
+             "pomegranite", "potatos", "Cotton"],
+}
+
+
+def per_call(fn, values, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations // len(values)):
+        for v in values:
+            fn(v)
+    return (time.perf_counter() - start) / (iterations // len(values) * len(values))
+
+
+def cold(index, values, rounds=200):
+    """First-time resolution: a fresh memo for every call."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for v in values:
+            index.memo.clear()
+            index.resolve(v)
+    return (time.perf_counter() - start) / (rounds * len(values))
+
+
+def main(iterations=1_000_000):
+    names = get_engine().names
+    for field, index in (("district", names.districts), ("crop", names.crops)):
+        values = SPELLINGS[field]
+        before = sum(norm_key(v) in index.keys for v in values)
+        after = sum(index.resolve(v) is not None for v in values)
+        exact = [v for v in values if norm_key(v) in index.keys]
+        fuzzy = [v for v in values if NameIndex._direct(index, norm_key(v)) is None]
+
+        print(f"{field}: {len(index.keys)} keys, {len(index.spellings)} spellings")
+        print(f"  resolved {after}/{len(values)} app spellings (norm_key alone: {before})")
+        print(f"  memo hit          {per_call(index.resolve, values, iterations) * 1e9:7.0f} ns")
+        print(f"  norm_key          {per_call(norm_key, values, iterations) * 1e9:7.0f} ns")
+        print(f"  first, exact      {cold(index, exact) * 1e6:7.2f} µs")
+        print(f"  first, any        {cold(index, values) * 1e6:7.2f} µs")
+        print(f"  first, fuzzy      {cold(index, fuzzy) * 1e6:7.2f} µs  ({len(fuzzy)} inputs)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,48 @@
+# benchmarks/bench_parallel.py
+# ---------------------------------------------------------
+# Bulk-scan throughput of ParallelScanner at 1, 2, 4 and 8 workers,
+# against the in-process BatchScorer. Speed-up is bounded by the
+# number of cores on the host (printed first).
+#   python benchmarks/bench_parallel.py [farmers]
+# ---------------------------------------------------------
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from bench_batch import make_farmers  # noqa: E402
+from kb_snapshot import build_snapshot  # noqa: E402
+from parallel_scan import ParallelScanner  # noqa: E402
+from pest_batch import get_batch  # noqa: E402
+
+
+def main(n=200_000, worker_counts=(1, 2, 4, 8)):
+    farmers = make_farmers(n)
+    print(f"cores: {os.cpu_count()}  farmers: {n}")
+
+    start = time.perf_counter()
+    expected = get_batch().scan_many(farmers)
+    t_base = time.perf_counter() - start
+    print(f"in-process batch:   {t_base:.3f} s  ({n / t_base:,.0f} farmers/s)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot = build_snapshot(os.path.join(tmp, "kb.bin"))
+        for workers in worker_counts:
+            start = time.perf_counter()
+            with ParallelScanner(workers, snapshot_path=snapshot) as scanner:
+                scanner.scan_many(farmers[:1])          # pool start-up + snapshot load
+                t_start = time.perf_counter() - start
+
+                start = time.perf_counter()
+                results = scanner.scan_many(farmers)
+                t_scan = time.perf_counter() - start
+
+            assert results == expected, f"{workers} workers: results differ"
+            print(f"{workers} worker(s):        {t_scan:.3f} s  ({n / t_scan:,.0f} farmers/s, "
+                  f"{t_base / t_scan:.2f}x)  start-up {t_start:.2f} s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,126 @@
+# benchmarks/bench_rescore.py
+# ---------------------------------------------------------
+# One district's weather update: incremental rescoring vs a full
+# rescan of every farmer, with writes going to an in-memory RTDB.
+# First checks that farmers whose alerts write failed are written on
+# the next update, even when that update changes nothing for them.
+#   python benchmarks/bench_rescore.py [farmers]
+# ---------------------------------------------------------
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from bench_engine import SOILS  # noqa: E402
+from bench_weather import START, write_csv  # noqa: E402
+from history_index import get_history_index  # noqa: E402
+from pest_engine import get_engine  # noqa: E402
+from rescore import DependencyIndex, IncrementalRescorer  # noqa: E402
+from weather_store import WeatherStore  # noqa: E402
+
+
+def make_users(n, seed=3):
+    """Users/ nodes shaped like the app writes them."""
+    rng = random.Random(seed)
+    districts = sorted(get_history_index().districts)
+    crops = list(get_engine().rules_by_crop)
+    users = {}
+    for i in range(n):
+        logs = {"primary_crop": {"c1": {"cropName": rng.choice(crops).title()}}}
+        if rng.random() < 0.5:
+            logs["secondary_crop"] = {"c2": {"cropName": rng.choice(crops).title()}}
+        users[f"uid{i:07d}"] = {
+            "name": f"Farmer {i}",
+            "phone": f"+9198{i:08d}",
+            "district": rng.choice(districts),
+            "soilType": rng.choice(SOILS),
+            "farmActivityLogs": logs,
+        }
+    return users
+
+
+class MemoryRTDB:
+    def __init__(self):
+        self.writes = 0
+        self.data = {}
+        self.fail = False
+
+    async def update(self, path, updates):
+        if self.fail:
+            raise ConnectionError("simulated RTDB outage")
+        self.writes += len(updates)
+        self.data.update(updates)
+
+
+async def check_failed_write_retried():
+    weather = WeatherStore()
+    weather.extend(("mandya", START + timedelta(d), 26, 50, 3) for d in range(400))
+    users = {"u1": {"district": "Mandya", "soilType": "Alluvial",
+                    "farmActivityLogs": {"primary_crop": {"c1": {"cropName": "Paddy"}}}}}
+    rtdb = MemoryRTDB()
+    rescorer = IncrementalRescorer(DependencyIndex.from_users(users, weather=weather),
+                                   weather=weather, rtdb=rtdb)
+
+    day = START + timedelta(400)
+    rtdb.fail = True
+    try:
+        await rescorer.on_weather_update("mandya", day, 26, 95, 3, month=8)    # humid: alerts change
+    except ConnectionError:
+        pass
+    rtdb.fail = False
+    r = await rescorer.on_weather_update("mandya", day + timedelta(1), 26, 96, 3, month=8)
+    written = rtdb.data.get("alerts/u1", {}).get("alerts")
+    assert written, f"failed write never retried: {r}"
+    print(f"✅ failed write retried on the next update ({[a['pest'] for a in written]})")
+
+
+async def main(n=100_000, days=400):
+    import tempfile
+
+    await check_failed_write_retried()
+
+    weather = WeatherStore()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "weather.csv")
+        write_csv(path, sorted(get_history_index().districts), days)
+        weather.load_csv(path)
+
+    users = make_users(n)
+    start = time.perf_counter()
+    index = DependencyIndex.from_users(users, weather=weather)
+    t_index = time.perf_counter() - start
+
+    rtdb = MemoryRTDB()
+    rescorer = IncrementalRescorer(index, weather=weather, rtdb=rtdb)
+    engine = get_engine()
+    rng = random.Random(5)
+    districts = sorted(index.by_district)
+    day = START + timedelta(days)
+
+    reports = []
+    for district in districts[:10]:
+        reports.append(await rescorer.on_weather_update(
+            district, day, rng.uniform(16, 36), rng.uniform(35, 95), rng.expovariate(1 / 40)))
+
+    # the same updates applied by rescanning every farmer
+    start = time.perf_counter()
+    for ctx in index.farmers.values():
+        engine.scan(ctx["district"], ctx["soilType"], ctx["crops"], month=date.today().month,
+                    **weather.conditions(engine.names.district(ctx["district"])))
+    t_full = time.perf_counter() - start
+
+    print(f"farmers: {len(index)}  districts: {len(districts)}  index build: {t_index:.2f} s")
+    print(f"full rescan (measured): {t_full * 1e3:.1f} ms")
+    for r in reports:
+        print(f"  {r['district']:<18} rescored {r['rescored']:>6}  written {r['written']:>6}  "
+              f"skipped {r['skipped']:>6}  {r['elapsed'] * 1e3:6.1f} ms  "
+              f"({t_full / r['elapsed']:.0f}x faster than full)")
+    print(f"total writes: {rtdb.writes}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000))
@@ -0,0 +1,111 @@
+# benchmarks/bench_scan_batch.py
+# ---------------------------------------------------------
+# A village of farmers scanned the way the dashboard used to do it, one
+# POST /scan/farmer/{uid} each, against one POST /scan/batch, through
+# the full ASGI app. Firebase is a LocalRTDB with a simulated round trip,
+# the model client is FakeGenAI and both runs start from cold scan and
+# translation caches. The alerts/ trees written by the two runs are
+# checked identical, and a few malformed items check that they fail
+# alone; a non-object item is rejected by the schema with a 422.
+#   python benchmarks/bench_scan_batch.py [farmers] [concurrency]
+# ---------------------------------------------------------
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import httpx  # noqa: E402
+
+import main  # noqa: E402
+from alerts_cache import AlertsCache, MemoryBackend, set_alerts_cache  # noqa: E402
+from bench_scan_cache import make_requests  # noqa: E402
+from fake_genai import FakeGenAI  # noqa: E402
+from fake_rtdb import LocalRTDB  # noqa: E402
+from firebase_async import set_rtdb  # noqa: E402
+from pest_engine import get_engine  # noqa: E402
+from scan_cache import new_scan_cache, set_scan_cache  # noqa: E402
+from translation_cache import TranslationCache, set_translation_cache  # noqa: E402
+from translation_provider import GenAIProvider, set_provider  # noqa: E402
+
+RTDB_LATENCY = 0.005
+MODEL_LATENCY = 0.3
+
+
+def fresh(tmp, name):
+    """New fakes and empty caches; returns the RTDB and the model client."""
+    rtdb = LocalRTDB(latency=RTDB_LATENCY)
+    model = FakeGenAI(latency=MODEL_LATENCY)
+    set_rtdb(rtdb)
+    set_provider(GenAIProvider(client=model))
+    set_translation_cache(TranslationCache(os.path.join(tmp, f"{name}.sqlite3")))
+    set_alerts_cache(AlertsCache(MemoryBackend()))
+    set_scan_cache(new_scan_cache())
+    return rtdb, model
+
+
+async def one_by_one(client, farmers, concurrency):
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(uid, req):
+        async with sem:
+            r = await client.post(f"/scan/farmer/{uid}", json=req.model_dump())
+            return r.status_code == 200
+
+    return sum(await asyncio.gather(*(one(uid, req) for uid, req in farmers)))
+
+
+async def batched(client, items):
+    r = await client.post("/scan/batch", json={"items": items})
+    r.raise_for_status()
+    return r.json()
+
+
+async def run(n=500, concurrency=16):
+    farmers = make_requests(n)
+    get_engine()
+    main.init_firebase = lambda: None
+    transport = httpx.ASGITransport(app=main.app)
+    with tempfile.TemporaryDirectory() as tmp:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            rtdb, model = fresh(tmp, "single")
+            start = time.perf_counter()
+            ok = await one_by_one(client, farmers, concurrency)
+            single_s = time.perf_counter() - start
+            single = (rtdb.db.read("alerts"), rtdb.db.requests, model.calls)
+
+            rtdb, model = fresh(tmp, "batch")
+            start = time.perf_counter()
+            out = await batched(client, [{"uid": uid, "request": req.model_dump()} for uid, req in farmers])
+            batch_s = time.perf_counter() - start
+            batch = (rtdb.db.read("alerts"), rtdb.db.requests, model.calls)
+
+            assert ok == n and out["scanned"] == n, (ok, out["failed"])
+            assert single[0] == batch[0], "batch wrote different alerts"
+
+            bad = [{"uid": "a.b", "request": farmers[0][1].model_dump()},
+                   {"uid": "nodistrict", "request": {"soilType": "red", "primaryCrop": "rice"}},
+                   {"request": farmers[0][1].model_dump()},
+                   {"uid": "u-str", "request": "not an object"},
+                   {"uid": farmers[0][0], "request": farmers[0][1].model_dump()},
+                   {"uid": farmers[0][0], "request": farmers[1][1].model_dump()}]
+            mixed = await batched(client, bad)
+            r = await client.post("/scan/batch", json={"items": ["not an item"]})
+            assert r.status_code == 422, r.status_code
+            schema = (await client.get("/openapi.json")).json()["components"]["schemas"]["BatchScanRequest"]
+            assert set(schema["properties"]["items"]["examples"][0][0]) == {"uid", "request"}
+
+    print(f"{n} farmers, {out['unique']} distinct requests, RTDB round trip "
+          f"{RTDB_LATENCY * 1e3:.0f} ms, model call {MODEL_LATENCY * 1e3:.0f} ms")
+    print(f"  {'':22} {'wall':>9} {'RTDB calls':>11} {'model calls':>12}")
+    print(f"  {f'single x{n} (c={concurrency})':22} {single_s * 1e3:7.0f} ms {single[1]:11} {single[2]:12}")
+    print(f"  {'one /scan/batch':22} {batch_s * 1e3:7.0f} ms {batch[1]:11} {batch[2]:12}")
+    print("  alerts/ trees identical")
+    print(f"  malformed items: scanned {mixed['scanned']}, failed {mixed['failed']}: "
+          + "; ".join(f"{r['uid']}: {r.get('detail', 'ok').splitlines()[0]}" for r in mixed["results"]))
+
+
+if __name__ == "__main__":
+    asyncio.run(run(*(int(a) for a in sys.argv[1:3])))
@@ -0,0 +1,92 @@
+# benchmarks/bench_scan_cache.py
+# ---------------------------------------------------------
+# POST /scan/farmer/{uid} handler with and without the scan memo, for
+# a realistic request mix: many farmers share district, soil and crops,
+# some ask for Kannada. Firebase and the model client are local fakes;
+# the translation cache starts warm, as it is in production.
+#   python benchmarks/bench_scan_cache.py [requests]
+# ---------------------------------------------------------
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import main  # noqa: E402
+from alerts_cache import AlertsCache, MemoryBackend, set_alerts_cache  # noqa: E402
+from bench_engine import SOILS  # noqa: E402
+from fake_genai import FakeGenAI  # noqa: E402
+from firebase_async import set_rtdb  # noqa: E402
+from history_index import get_history_index  # noqa: E402
+from models import ScanRequest  # noqa: E402
+from pest_engine import get_engine  # noqa: E402
+from scan_cache import set_scan_cache  # noqa: E402
+from translation_cache import TranslationCache, set_translation_cache  # noqa: E402
+from translation_provider import GenAIProvider, set_provider  # noqa: E402
+from ttl_cache import TTLCache  # noqa: E402
+
+
+class MemoryRTDB:
+    def __init__(self):
+        self.data = {}
+
+    async def update(self, path, values):
+        for key, value in values.items():
+            self.data[f"{path}/{key}"] = value
+
+
+def make_requests(n, seed=9):
+    rng = random.Random(seed)
+    districts = sorted(get_history_index().districts)
+    crops = list(get_engine().rules_by_crop)
+    weights = [1 / (i + 1) for i in range(len(crops))]      # a few crops dominate
+    reqs = []
+    for i in range(n):
+        primary, secondary = rng.choices(crops, weights, k=2)
+        reqs.append((f"uid{i}", ScanRequest(
+            district=rng.choice(districts),
+            soilType=rng.choice(SOILS),
+            primaryCrop=primary,
+            secondaryCrop=secondary if rng.random() < 0.5 else None,
+            language="kn" if rng.random() < 0.3 else "en",
+        )))
+    return reqs
+
+
+async def run(reqs):
+    start = time.perf_counter()
+    for uid, req in reqs:
+        await main.scan_farmer(uid, req)
+    return time.perf_counter() - start
+
+
+async def bench(n=20_000):
+    set_provider(GenAIProvider(client=FakeGenAI(latency=0.0)))
+    set_translation_cache(TranslationCache(os.path.join(tempfile.mkdtemp(), "t.sqlite3")))
+    set_rtdb(MemoryRTDB())
+    set_alerts_cache(AlertsCache(MemoryBackend()))
+    reqs = make_requests(n)
+
+    set_scan_cache(TTLCache(max_size=0))
+    await run(reqs)                          # warm the translation and alerts caches
+    t_off = await run(reqs)
+
+    memo = TTLCache(max_size=20_000, ttl=3600)
+    set_scan_cache(memo)
+    t_first = await run(reqs)
+    first = memo.stats()
+    t_steady = await run(reqs)
+
+    print(f"requests: {n}  distinct scan keys: {len(memo)}")
+    print(f"no memo:            {t_off / n * 1e6:7.1f} µs/request")
+    print(f"memo, first pass:   {t_first / n * 1e6:7.1f} µs/request  "
+          f"({t_off / t_first:.2f}x, hit rate {first['hit_rate']:.0%})")
+    print(f"memo, steady state: {t_steady / n * 1e6:7.1f} µs/request  ({t_off / t_steady:.2f}x)")
+    print(f"memo stats: {memo.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(bench(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000))
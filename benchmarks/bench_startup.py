@@ -0,0 +1,48 @@
+# benchmarks/bench_startup.py
+# ---------------------------------------------------------
+# Cold `import main` time in a fresh interpreter, compared with
+# the eager SDK imports + client construction that translator.py
+# and gemini_helper.py used to do at import time.
+#
+#   python benchmarks/bench_startup.py [runs]
+# ---------------------------------------------------------
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+CASES = {
+    "import main (lazy providers)": "import main",
+    "import translator": "import translator",
+    "import gemini_helper": "import gemini_helper",
+    "import main + eager SDK clients (before)": (
+        "import main\n"
+        "from google import genai; genai.Client()\n"
+        "import google.generativeai as g; g.configure(api_key='fake'); g.GenerativeModel('gemini-1.5-flash')"
+    ),
+}
+
+
+def cold_import(code, runs):
+    env = dict(os.environ, GOOGLE_API_KEY="fake")
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, check=True)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main(runs=5):
+    baseline = cold_import("pass", runs)
+    print(f"interpreter start-up: {baseline * 1000:7.0f} ms (subtracted below)")
+    for label, code in CASES.items():
+        t = cold_import(code, runs) - baseline
+        print(f"{label:42} {t * 1000:7.0f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
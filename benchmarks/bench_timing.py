@@ -0,0 +1,75 @@
+# benchmarks/bench_timing.py
+# ---------------------------------------------------------
+# Cost of the stage spans (timing.py): POST /scan/farmer/{uid} handler
+# time with SCAN_METRICS=0, with metrics on, and through the ASGI app
+# with and without the Server-Timing middleware. Each setting runs in
+# a fresh interpreter, since the switches are read at import.
+#   python benchmarks/bench_timing.py [requests]
+# ---------------------------------------------------------
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, ".."))
+
+SETTINGS = {
+    "metrics off": {"SCAN_METRICS": "0"},
+    "metrics on": {"SCAN_METRICS": "1"},
+    "metrics + Server-Timing": {"SCAN_METRICS": "1", "SERVER_TIMING": "1"},
+}
+
+
+async def measure(n):
+    import httpx
+
+    import main
+    from alerts_cache import AlertsCache, MemoryBackend, set_alerts_cache
+    from bench_scan_cache import MemoryRTDB, make_requests
+    from firebase_async import set_rtdb
+
+    set_rtdb(MemoryRTDB())
+    set_alerts_cache(AlertsCache(MemoryBackend()))
+    reqs = [r for r in make_requests(n) if r[1].language == "en"]
+    for uid, req in reqs:                 # warm the engine and the scan memo
+        await main.scan_farmer(uid, req)
+
+    rounds = []
+    for _ in range(3):
+        start = time.perf_counter()
+        for uid, req in reqs:
+            await main.scan_farmer(uid, req)
+        rounds.append((time.perf_counter() - start) / len(reqs))
+    direct = min(rounds)
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        http = reqs[:2000]
+        start = time.perf_counter()
+        for uid, req in http:
+            r = await client.post(f"/scan/farmer/{uid}", json=req.model_dump())
+        over_http = (time.perf_counter() - start) / len(http)
+        header = r.headers.get("server-timing")
+    print(direct, over_http, header or "-", sep="\t")
+
+
+def main(n=20_000):
+    for label, env in SETTINGS.items():
+        out = subprocess.run(
+            [sys.executable, __file__, "--child", str(n)], cwd=HERE, check=True,
+            capture_output=True, text=True, env={**os.environ, **env},
+        ).stdout.strip().splitlines()[-1]
+        direct, over_http, header = out.split("\t")
+        print(f"{label:<24} handler {float(direct) * 1e6:6.2f} µs   "
+              f"ASGI request {float(over_http) * 1e6:7.1f} µs")
+        if header != "-":
+            print(f"{'':24} Server-Timing: {header}")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--child"]:
+        asyncio.run(measure(int(sys.argv[2])))
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -0,0 +1,129 @@
+# benchmarks/bench_translation.py
+# ---------------------------------------------------------
+# Kannada translation of one scan response (2 crops, several
+# pests) against a fake model client with simulated latency:
+#   serial per-field calls  vs  dedup + batch / bounded fan-out
+# then checks that a hanging model costs one timeout, that the overall
+# deadline holds however many chunks there are, and that a failing
+# cache write still returns (English or translated) instead of raising.
+#
+#   python benchmarks/bench_translation.py [latency_s]
+# ---------------------------------------------------------
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import translator  # noqa: E402
+from fake_genai import FakeGenAI  # noqa: E402
+from pest_engine import run_scan  # noqa: E402
+from translation_cache import TranslationCache, set_translation_cache  # noqa: E402
+from translation_provider import GenAIProvider, set_provider  # noqa: E402
+
+ALERTS = run_scan("belagavi", "black soil", "sugarcane", "cotton", "kn", month=8)
+
+
+def fresh_cache():
+    path = os.path.join(tempfile.mkdtemp(), "t.sqlite3")
+    cache = TranslationCache(path)
+    set_translation_cache(cache)
+    return cache
+
+
+def serial(fake):
+    set_provider(GenAIProvider(client=fake))
+    fresh_cache()
+    out = []
+    for a in ALERTS:
+        a = dict(a)
+        for f in translator.ALERT_TEXT_FIELDS:
+            a[f] = translator.translate_to_kannada(a[f])
+        out.append(a)
+    return out
+
+
+def translate(alerts):
+    return asyncio.run(translator.translate_alert_lists_checked([alerts], "kn"))[0][0]
+
+
+def pipeline(fake, timeout=None):
+    set_provider(GenAIProvider(client=fake))
+    fresh_cache()
+    return translate(ALERTS) if timeout is None else \
+        asyncio.run(_with_timeout(timeout))
+
+
+async def _with_timeout(timeout):
+    table = await translator.translate_texts(
+        [a[f] for a in ALERTS for f in translator.ALERT_TEXT_FIELDS], "kn", timeout=timeout)
+    return [{**a, **{f: table[a[f]] for f in translator.ALERT_TEXT_FIELDS}} for a in ALERTS]
+
+
+def timed(label, fn, fake):
+    start = time.perf_counter()
+    out = fn(fake)
+    elapsed = time.perf_counter() - start
+    kn = sum(a[f].startswith("KN:") for a in out for f in translator.ALERT_TEXT_FIELDS)
+    total = len(out) * len(translator.ALERT_TEXT_FIELDS)
+    print(f"{label:34} {elapsed:6.2f} s  calls={fake.calls:3}  translated {kn}/{total}")
+
+
+def main(latency=0.3):
+    fields = [a[f] for a in ALERTS for f in translator.ALERT_TEXT_FIELDS]
+    print(f"alerts: {len(ALERTS)}, fields: {len(fields)}, distinct: {len(set(fields))}, "
+          f"model latency: {latency * 1000:.0f} ms")
+
+    timed("serial, one call per field", serial, FakeGenAI(latency))
+    timed("pipeline, batched", pipeline, FakeGenAI(latency))
+    timed("pipeline, bad batch -> fan-out", pipeline, FakeGenAI(latency, batch_supported=False))
+    timed("pipeline, 30% hang, 1 s timeout",
+          lambda f: pipeline(f, timeout=1.0), FakeGenAI(latency, hang_rate=0.3))
+
+    # second scan of the same texts is served from the cache
+    fake = FakeGenAI(latency)
+    set_provider(GenAIProvider(client=fake))
+    fresh_cache()
+    start = time.perf_counter()
+    translate(ALERTS)
+    translate(ALERTS)
+    print(f"{'cold + warm scan':34} {time.perf_counter() - start:6.2f} s  calls={fake.calls:3}  (2nd scan: no calls)")
+
+    check_failures()
+
+
+def _wall(fake, texts, **kw):
+    set_provider(GenAIProvider(client=fake))
+    fresh_cache()
+    start = time.perf_counter()
+    table = asyncio.run(translator.translate_texts(texts, "kn", **kw))
+    return time.perf_counter() - start, table
+
+
+def check_failures():
+    texts = [f"advice {i}" for i in range(6)]
+
+    elapsed, table = _wall(FakeGenAI(0.05, hang_rate=1.0), texts, timeout=0.2)
+    assert all(table[t] == t for t in texts) and elapsed < 0.3, elapsed
+    print(f"{'hang, 6 texts, 0.2 s timeout':34} {elapsed:6.2f} s  English fallback")
+
+    many = [f"advice {i}" for i in range(40)]
+    elapsed, table = _wall(FakeGenAI(0.05, hang_rate=1.0), many, timeout=0.2,
+                           batch_size=2, concurrency=1, deadline=0.5)
+    assert all(table[t] == t for t in many) and elapsed < 0.6, elapsed
+    print(f"{'hang, 20 chunks, 0.5 s deadline':34} {elapsed:6.2f} s  English fallback")
+
+    class BrokenCache(TranslationCache):
+        def put_many(self, pairs, lang):
+            raise OSError("disk full")
+
+    set_provider(GenAIProvider(client=FakeGenAI(0.01)))
+    set_translation_cache(BrokenCache(os.path.join(tempfile.mkdtemp(), "t.sqlite3")))
+    table = asyncio.run(translator.translate_texts(texts, "kn"))
+    assert all(table[t] == "KN:" + t for t in texts), table
+    print(f"{'cache write fails':34} translated, no exception")
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 0.3)
@@ -0,0 +1,88 @@
+# benchmarks/bench_weather.py
+# ---------------------------------------------------------
+# Weather feature store: CSV load, daily appends, per-scan lookup,
+# and run_scan with/without the weather join.
+#   python benchmarks/bench_weather.py [days]
+# ---------------------------------------------------------
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from bench_engine import make_requests  # noqa: E402
+from history_index import get_history_index  # noqa: E402
+from pest_engine import run_scan  # noqa: E402
+from weather_store import WeatherStore, set_weather_store  # noqa: E402
+
+START = date(2024, 1, 1)
+
+
+def write_csv(path, districts, days, seed=7):
+    rng = random.Random(seed)
+    with open(path, "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["district", "date", "temp", "humidity", "rainfall"])
+        for d in districts:
+            for i in range(days):
+                rain = rng.expovariate(1 / 8) if rng.random() < 0.3 else 0.0
+                w.writerow([d, (START + timedelta(i)).isoformat(),
+                            round(rng.uniform(16, 36), 1), round(rng.uniform(35, 95), 1), round(rain, 1)])
+
+
+def main(days=730, lookups=100_000, scans=50_000):
+    districts = sorted(get_history_index().districts)
+    store = WeatherStore()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "weather.csv")
+        write_csv(path, districts, days)
+        start = time.perf_counter()
+        rows = store.load_csv(path)
+        t_load = time.perf_counter() - start
+
+    rng = random.Random(1)
+    start = time.perf_counter()
+    for i in range(days, days + 30):
+        for d in districts:
+            store.append(d, START + timedelta(i), 25.0, 70.0, rng.uniform(0, 10))
+    t_append = (time.perf_counter() - start) / (30 * len(districts))
+
+    queries = [rng.choice(districts) for _ in range(lookups)]
+    conditions = store.conditions
+    start = time.perf_counter()
+    for d in queries:
+        conditions(d)
+    t_latest = (time.perf_counter() - start) / lookups
+
+    day = START + timedelta(days // 2)
+    start = time.perf_counter()
+    for d in queries[:10_000]:
+        conditions(d, day)
+    t_dated = (time.perf_counter() - start) / 10_000
+
+    reqs = make_requests(scans)
+    timings = {}
+    for label, s in (("no weather", WeatherStore()), ("with weather", store)):
+        set_weather_store(s)
+        hits = 0
+        start = time.perf_counter()
+        for d, soil, p, sec, m, *_ in reqs:
+            hits += len(run_scan(d, soil, p, sec, "en", month=m))
+        timings[label] = (time.perf_counter() - start) / scans, hits
+
+    print(f"districts: {len(districts)}  rows: {rows}")
+    print(f"csv load:              {t_load:.3f} s ({rows / t_load:,.0f} rows/s)")
+    print(f"daily append:          {t_append * 1e6:.2f} µs/row")
+    print(f"latest lookup:         {t_latest * 1e9:.0f} ns")
+    print(f"as-of-date lookup:     {t_dated * 1e6:.2f} µs")
+    for label, (t, hits) in timings.items():
+        print(f"run_scan {label:<13} {t * 1e6:.2f} µs/scan  ({hits} alerts)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 730)
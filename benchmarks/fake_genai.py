@@ -0,0 +1,80 @@
+# benchmarks/fake_genai.py
+# ---------------------------------------------------------
+# In-process stand-in for google.genai.Client: same
+# models.generate_content / aio.models.generate_content shape,
+# simulated latency, optional failures and hangs.
+# Replies "KN:<text>" so translated output is recognisable; with
+# batch_supported=False a batch prompt gets prose instead of a JSON array.
+# ---------------------------------------------------------
+import asyncio
+import json
+import random
+import re
+import time
+
+
+class _Reply:
+    def __init__(self, text):
+        self.text = text
+
+
+def _answer(prompt, batch_supported=True):
+    m = re.search(r"(\[.*\])", prompt, re.S)
+    if m and "JSON array" in prompt:
+        if not batch_supported:
+            return "Here are the translations you asked for."
+        return json.dumps(["KN:" + s for s in json.loads(m.group(1))], ensure_ascii=False)
+    text = prompt.split("Text:", 1)[-1].strip()
+    return "KN:" + text
+
+
+class FakeGenAI:
+
+    def __init__(self, latency=0.3, fail_rate=0.0, hang_rate=0.0,
+                 batch_supported=True, seed=1):
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.hang_rate = hang_rate
+        self.batch_supported = batch_supported
+        self.rng = random.Random(seed)
+        self.calls = 0
+        self.models = _SyncModels(self)
+        self.aio = _Aio(self)
+
+    def _outcome(self, prompt):
+        self.calls += 1
+        r = self.rng.random()
+        if r < self.fail_rate:
+            return "error"
+        if r < self.fail_rate + self.hang_rate:
+            return "hang"
+        return "ok"
+
+
+class _SyncModels:
+    def __init__(self, owner):
+        self.owner = owner
+
+    def generate_content(self, model, contents):
+        outcome = self.owner._outcome(contents)
+        time.sleep(self.owner.latency * (30 if outcome == "hang" else 1))
+        if outcome == "error":
+            raise RuntimeError("fake model error")
+        return _Reply(_answer(contents, self.owner.batch_supported))
+
+
+class _AsyncModels:
+    def __init__(self, owner):
+        self.owner = owner
+
+    async def generate_content(self, model, contents):
+        outcome = self.owner._outcome(contents)
+        await asyncio.sleep(self.owner.latency * (30 if outcome == "hang" else 1))
+        if outcome == "error":
+            raise RuntimeError("fake model error")
+        return _Reply(_answer(contents, self.owner.batch_supported))
+
+
+class _Aio:
+    def __init__(self, owner):
+        self.models = _AsyncModels(owner)
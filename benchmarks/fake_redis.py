@@ -0,0 +1,104 @@
+# benchmarks/fake_redis.py
+# ---------------------------------------------------------
+# Tiny Redis stand-in speaking RESP2/RESP3 over TCP: HELLO,
+# PING, GET, SET [EX|PX], DEL, EXISTS, SELECT, FLUSHDB,
+# DBSIZE, CLIENT.
+# Enough for alerts_cache.RedisBackend via redis.asyncio.
+#
+#   python benchmarks/fake_redis.py --port 6380
+#   ALERTS_CACHE_BACKEND=redis REDIS_URL=redis://127.0.0.1:6380/0 uvicorn main:app
+# ---------------------------------------------------------
+import asyncio
+import time
+
+
+class FakeRedis:
+
+    def __init__(self):
+        self.data = {}          # key -> (value, expires_at | None)
+
+    def _live(self, key):
+        item = self.data.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at < time.monotonic():
+            del self.data[key]
+            return None
+        return value
+
+    def execute(self, cmd, args, conn):
+        if cmd == b"HELLO":
+            if args:
+                conn["proto"] = int(args[0])
+            if conn["proto"] == 3:
+                return b"%2\r\n+server\r\n+fake_redis\r\n+proto\r\n:3\r\n"
+            return b"*4\r\n$6\r\nserver\r\n$10\r\nfake_redis\r\n$5\r\nproto\r\n:2\r\n"
+        if cmd == b"PING":
+            return b"+PONG\r\n"
+        if cmd == b"GET":
+            value = self._live(args[0])
+            if value is None:
+                return b"_\r\n" if conn["proto"] == 3 else b"$-1\r\n"
+            return b"$%d\r\n%s\r\n" % (len(value), value)
+        if cmd == b"SET":
+            expires_at = None
+            opts = [a.upper() for a in args[2:]]
+            if b"EX" in opts:
+                expires_at = time.monotonic() + int(args[2 + opts.index(b"EX") + 1])
+            if b"PX" in opts:
+                expires_at = time.monotonic() + int(args[2 + opts.index(b"PX") + 1]) / 1000
+            self.data[args[0]] = (args[1], expires_at)
+            return b"+OK\r\n"
+        if cmd == b"DEL":
+            n = sum(self.data.pop(k, None) is not None for k in args)
+            return b":%d\r\n" % n
+        if cmd == b"EXISTS":
+            return b":%d\r\n" % sum(self._live(k) is not None for k in args)
+        if cmd == b"DBSIZE":
+            return b":%d\r\n" % len(self.data)
+        if cmd in (b"FLUSHDB", b"FLUSHALL"):
+            self.data.clear()
+            return b"+OK\r\n"
+        if cmd in (b"SELECT", b"CLIENT"):
+            return b"+OK\r\n"
+        return b"-ERR unknown command '%s'\r\n" % cmd
+
+    async def handle(self, reader, writer):
+        conn = {"proto": 2}
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.startswith(b"*"):
+                    writer.write(b"-ERR inline commands not supported\r\n")
+                    continue
+                parts = []
+                for _ in range(int(line[1:])):
+                    size = int((await reader.readline())[1:])
+                    parts.append((await reader.readexactly(size + 2))[:-2])
+                writer.write(self.execute(parts[0].upper(), parts[1:], conn))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=6380):
+        return await asyncio.start_server(self.handle, host, port)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--port", type=int, default=6380)
+    args = ap.parse_args()
+
+    async def main():
+        server = await FakeRedis().serve(port=args.port)
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(main())
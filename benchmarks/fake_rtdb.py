@@ -0,0 +1,270 @@
+# benchmarks/fake_rtdb.py
+# ---------------------------------------------------------
+# Local stand-in for the Firebase Realtime Database REST API.
+# Enough of GET/PUT/PATCH/DELETE, shallow and orderBy="$key"
+# paging (startAt/endAt/limitTo*, in RTDB key order: 32-bit integer
+# keys first), and the text/event-stream change feed, to exercise
+# firebase_async without a real project. LocalRTDB is the same tree
+# behind an in-process client, for load tests that fake the network.
+#
+#   python benchmarks/fake_rtdb.py --port 9000 --latency 0.02
+#   FIREBASE_DATABASE_EMULATOR_HOST=127.0.0.1:9000 uvicorn main:app
+# ---------------------------------------------------------
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import sys
+import time
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from firebase_async import key_order  # noqa: E402
+
+
+class FakeRTDB:
+
+    def __init__(self, data=None, latency=0.0):
+        self.root = data if data is not None else {}
+        self.latency = latency
+        self.requests = 0
+        self.bytes_out = 0
+        self.subscribers = []     # (path parts, asyncio.Queue of encoded events)
+        self.events_out = 0
+
+    # ------------------------- tree ops -------------------------
+
+    @staticmethod
+    def _parts(path):
+        return [p for p in path.strip("/").split("/") if p]
+
+    def read(self, path):
+        node = self.root
+        for p in self._parts(path):
+            if not isinstance(node, dict) or p not in node:
+                return None
+            node = node[p]
+        return node
+
+    def write(self, path, value):
+        parts = self._parts(path)
+        if not parts:
+            self.root = value if isinstance(value, dict) else {}
+            return
+        node = self.root
+        trail = []
+        for p in parts[:-1]:
+            trail.append((node, p))
+            if not isinstance(node.get(p), dict):
+                node[p] = {}
+            node = node[p]
+        if value is None:
+            node.pop(parts[-1], None)
+            # RTDB drops parents that become empty
+            while trail and not node:
+                parent, key = trail.pop()
+                parent.pop(key, None)
+                node = parent
+        else:
+            node[parts[-1]] = value
+
+    def query(self, node, params):
+        if not isinstance(node, dict):
+            return node
+        if params.get("shallow") == "true":
+            return {k: (True if isinstance(v, dict) else v) for k, v in node.items()}
+
+        if json.loads(params.get("orderBy", "null")) == "$key":
+            keys = sorted(node, key=key_order)
+            if "startAt" in params:
+                start = key_order(json.loads(params["startAt"]))
+                keys = [k for k in keys if key_order(k) >= start]
+            if "endAt" in params:
+                end = key_order(json.loads(params["endAt"]))
+                keys = [k for k in keys if key_order(k) <= end]
+            if "limitToFirst" in params:
+                keys = keys[:int(params["limitToFirst"])]
+            if "limitToLast" in params:
+                keys = keys[-int(params["limitToLast"]):]
+            return {k: node[k] for k in keys}
+        return node
+
+    # ------------------------- streaming -------------------------
+
+    @staticmethod
+    def _sse(event, path, data):
+        body = json.dumps({"path": path, "data": data}, ensure_ascii=False)
+        return f"event: {event}\ndata: {body}\n\n".encode()
+
+    def notify(self, method, path, payload):
+        parts = self._parts(path)
+        for sub, queue in self.subscribers:
+            if parts[:len(sub)] == sub:
+                rel = "/" + "/".join(parts[len(sub):])
+                event = "patch" if method == "PATCH" else "put"
+                queue.put_nowait(self._sse(event, rel, payload))
+            elif sub[:len(parts)] != parts:
+                continue
+            elif method == "PATCH":
+                # multi-path update above the listened node: only keys landing inside it
+                for key, value in payload.items():
+                    full = parts + self._parts(key)
+                    if full[:len(sub)] == sub:
+                        rel = "/" + "/".join(full[len(sub):])
+                        queue.put_nowait(self._sse("put", rel, value))
+            else:
+                # a write above the listened node replaces it
+                queue.put_nowait(self._sse("put", "/", self.read("/".join(sub))))
+
+    def stream(self, path):
+        sub = self._parts(path)
+        queue = asyncio.Queue()
+
+        async def events():
+            self.subscribers.append((sub, queue))
+            try:
+                yield self._sse("put", "/", self.read(path))
+                while True:
+                    try:
+                        msg = await asyncio.wait_for(queue.get(), 30)
+                    except asyncio.TimeoutError:
+                        msg = b"event: keep-alive\ndata: null\n\n"
+                    self.events_out += 1
+                    yield msg
+            finally:
+                self.subscribers.remove((sub, queue))
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    # ------------------------- HTTP -------------------------
+
+    async def handle(self, request: Request):
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        path = request.path_params["path"]
+        if not path.endswith(".json"):
+            return Response(json.dumps({"error": "path must end in .json"}), status_code=400)
+        path = path[: -len(".json")]
+        params = dict(request.query_params)
+
+        if request.method == "GET" and "text/event-stream" in request.headers.get("accept", ""):
+            return self.stream(path)
+        if request.method == "GET":
+            body = self.query(self.read(path), params)
+        else:
+            payload = json.loads(await request.body() or b"null")
+            if request.method == "PUT":
+                self.write(path, payload)
+                body = payload
+            elif request.method == "PATCH":
+                for k, v in payload.items():
+                    self.write(f"{path}/{k}", v)
+                body = payload
+            else:  # DELETE
+                self.write(path, None)
+                body = None
+            if self.subscribers:
+                self.notify(request.method, path, None if request.method == "DELETE" else payload)
+
+        if params.get("print") == "silent":
+            return Response(status_code=204)
+        out = json.dumps(body, ensure_ascii=False).encode()
+        self.bytes_out += len(out)
+        return Response(out, media_type="application/json")
+
+    def app(self):
+        return Starlette(routes=[
+            Route("/{path:path}", self.handle, methods=["GET", "PUT", "PATCH", "DELETE"]),
+        ])
+
+
+class LocalRTDB:
+    """
+    AsyncRTDB-shaped client over an in-process FakeRTDB tree: no sockets,
+    an optional simulated round trip per call, and values copied through
+    JSON as they would be on the wire.
+    """
+
+    def __init__(self, data=None, latency=0.0):
+        self.db = FakeRTDB(data)
+        self.latency = latency
+
+    async def _wire(self, value):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.db.requests += 1
+        return json.loads(json.dumps(value, ensure_ascii=False))
+
+    async def get(self, path, shallow=None, **query):
+        params = {"shallow": "true"} if shallow else {}
+        params.update({k: json.dumps(v) for k, v in query.items()})
+        return await self._wire(self.db.query(self.db.read(path), params))
+
+    async def set(self, path, value):
+        value = await self._wire(value)
+        self.db.write(path, value)
+        return value
+
+    async def update(self, path, values):
+        values = await self._wire(values)
+        for k, v in values.items():
+            self.db.write(f"{path}/{k}", v)
+        return values
+
+    async def delete(self, path):
+        await self._wire(None)
+        self.db.write(path, None)
+
+    async def aclose(self):
+        pass
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _run(port, data, latency):
+    import uvicorn
+    uvicorn.run(FakeRTDB(data, latency).app(), host="127.0.0.1", port=port, log_level="warning")
+
+
+def serve_in_process(data=None, latency=0.0, port=None):
+    """
+    Run a FakeRTDB on a real local socket in its own process, so client and
+    server do not fight over one GIL. Returns (base_url, process).
+    """
+    port = port or free_port()
+    proc = multiprocessing.Process(target=_run, args=(port, data, latency), daemon=True)
+    proc.start()
+    deadline = time.monotonic() + 10
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            break
+        except OSError:
+            if time.monotonic() > deadline:
+                proc.terminate()
+                raise RuntimeError("fake RTDB did not start")
+            time.sleep(0.05)
+    return f"http://127.0.0.1:{port}", proc
+
+
+if __name__ == "__main__":
+    import argparse
+    import uvicorn
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--port", type=int, default=9000)
+    ap.add_argument("--latency", type=float, default=0.0)
+    args = ap.parse_args()
+    uvicorn.run(FakeRTDB(latency=args.latency).app(), host="127.0.0.1", port=args.port)
@@ -0,0 +1,257 @@
+# benchmarks/loadtest.py
+# ---------------------------------------------------------
+# Load test of the real FastAPI app (main.app): POST /scan/farmer/{uid}
+# and GET /alerts/{uid} at one or more concurrency levels, reporting
+# requests/s and p50/p95/p99/max latency per endpoint.
+#
+# Everything behind the app is faked in process: Firebase is a
+# LocalRTDB (fake_rtdb.py) with a simulated round trip, the model client
+# is FakeGenAI, the alerts cache uses the memory backend and the
+# translation cache a throwaway SQLite file. Requests go through the
+# full ASGI stack (routing, validation, middleware), either directly
+# (--transport asgi) or over a local socket to uvicorn running in this
+# process (--transport http). Client and server share one interpreter,
+# so compare numbers from the same transport and host only.
+#
+# Results are written as JSON (default benchmarks/results/loadtest-
+# <commit>.json); --compare OLD.json prints the change against an
+# earlier run, e.g. from the previous commit.
+#
+#   python benchmarks/loadtest.py --requests 5000 --concurrency 1,16,64
+#   python benchmarks/loadtest.py --compare benchmarks/results/loadtest-abc1234.json
+# ---------------------------------------------------------
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.join(HERE, "..")
+sys.path.insert(0, ROOT)
+
+import main  # noqa: E402
+from alerts_cache import AlertsCache, MemoryBackend, set_alerts_cache  # noqa: E402
+from bench_scan_cache import make_requests  # noqa: E402
+from fake_genai import FakeGenAI  # noqa: E402
+from fake_rtdb import LocalRTDB, free_port  # noqa: E402
+from firebase_async import set_rtdb  # noqa: E402
+from pest_engine import get_engine  # noqa: E402
+from scan_cache import new_scan_cache, set_scan_cache  # noqa: E402
+from translation_cache import TranslationCache, set_translation_cache  # noqa: E402
+from translation_provider import GenAIProvider, set_provider  # noqa: E402
+
+ENDPOINTS = ("scan", "alerts")
+
+
+def git_commit():
+    try:
+        rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                             capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                               capture_output=True, text=True).stdout.strip()
+        return rev + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def install_fakes(args, tmp):
+    set_rtdb(LocalRTDB(latency=args.rtdb_latency))
+    set_provider(GenAIProvider(client=FakeGenAI(latency=args.model_latency)))
+    set_translation_cache(TranslationCache(os.path.join(tmp, "translations.sqlite3")))
+    set_alerts_cache(AlertsCache(MemoryBackend()))
+    set_scan_cache(new_scan_cache())
+    main.init_firebase = lambda: None     # no credentials; get_rtdb() is already the fake
+
+
+def make_ops(args):
+    """(endpoint, uid, body) in a fixed random order: scans and alert reads for the same farmers."""
+    rng = random.Random(args.seed)
+    farmers = make_requests(args.farmers, seed=args.seed)
+    for _, req in farmers:
+        req.language = "kn" if rng.random() < args.kn_share else "en"
+    ops = []
+    for _ in range(args.requests):
+        uid, req = rng.choice(farmers)
+        if rng.random() < args.scan_share:
+            ops.append(("scan", uid, req.model_dump()))
+        else:
+            ops.append(("alerts", uid, None))
+    return ops
+
+
+def percentile(sorted_xs, p):
+    if not sorted_xs:
+        return None
+    return sorted_xs[min(len(sorted_xs) - 1, int(len(sorted_xs) * p))]
+
+
+def summarize(latencies, errors, elapsed):
+    out = {}
+    for ep in ENDPOINTS:
+        xs = sorted(latencies[ep])
+        out[ep] = {
+            "requests": len(xs),
+            "errors": errors[ep],
+            "rps": round(len(xs) / elapsed, 1) if elapsed else 0.0,
+            **{k: (round(percentile(xs, p) * 1e3, 3) if xs else None)
+               for k, p in (("p50_ms", 0.50), ("p95_ms", 0.95), ("p99_ms", 0.99), ("max_ms", 1.0))},
+        }
+    return out
+
+
+async def drive(send, ops, concurrency):
+    latencies = {ep: [] for ep in ENDPOINTS}
+    errors = {ep: 0 for ep in ENDPOINTS}
+    it = iter(ops)
+
+    async def worker():
+        for ep, uid, body in it:
+            start = time.perf_counter()
+            try:
+                ok = await send(ep, uid, body)
+            except Exception:
+                ok = False
+            latencies[ep].append(time.perf_counter() - start)
+            if not ok:
+                errors[ep] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {"concurrency": concurrency, "elapsed_s": round(elapsed, 3),
+            "total_rps": round(len(ops) / elapsed, 1), "endpoints": summarize(latencies, errors, elapsed)}
+
+
+def asgi_sender(client):
+    async def send(ep, uid, body):
+        if ep == "scan":
+            r = await client.post(f"/scan/farmer/{uid}", json=body)
+        else:
+            r = await client.get(f"/alerts/{uid}")
+        return r.status_code == 200
+    return send
+
+
+def http_sender(session, base_url):
+    async def send(ep, uid, body):
+        if ep == "scan":
+            req = session.post(f"{base_url}/scan/farmer/{uid}", json=body)
+        else:
+            req = session.get(f"{base_url}/alerts/{uid}")
+        async with req as r:
+            await r.read()
+            return r.status == 200
+    return send
+
+
+async def run_levels(send, args, ops):
+    await drive(send, ops[:args.warmup], min(args.concurrency))     # warm engine, caches, connections
+    return [await drive(send, ops, c) for c in args.concurrency]
+
+
+async def run(args):
+    ops = make_ops(args)
+    with tempfile.TemporaryDirectory() as tmp:
+        install_fakes(args, tmp)
+        if args.transport == "asgi":
+            import httpx
+
+            get_engine()
+            transport = httpx.ASGITransport(app=main.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+                return await run_levels(asgi_sender(client), args, ops)
+
+        import aiohttp
+        import uvicorn
+
+        port = free_port()
+        server = uvicorn.Server(uvicorn.Config(main.app, host="127.0.0.1", port=port,
+                                               log_level="warning", access_log=False))
+        serving = asyncio.create_task(server.serve())
+        while not server.started:
+            await asyncio.sleep(0.01)
+        try:
+            connector = aiohttp.TCPConnector(limit=max(args.concurrency))
+            async with aiohttp.ClientSession(connector=connector) as session:
+                return await run_levels(http_sender(session, f"http://127.0.0.1:{port}"), args, ops)
+        finally:
+            server.should_exit = True
+            await serving
+
+
+def compare(old, new):
+    print(f"\nvs {old['commit']} ({old['timestamp']}):")
+    before = {r["concurrency"]: r for r in old["results"]}
+    for r in new["results"]:
+        o = before.get(r["concurrency"])
+        if o is None:
+            continue
+        for ep in ENDPOINTS:
+            a, b = o["endpoints"][ep], r["endpoints"][ep]
+            if not a["requests"] or not b["requests"]:
+                continue
+            print(f"  c={r['concurrency']:<4} {ep:<7} rps {a['rps']:8.0f} -> {b['rps']:8.0f} "
+                  f"({(b['rps'] / a['rps'] - 1) * 100:+6.1f}%)   "
+                  f"p50 {a['p50_ms']:7.2f} -> {b['p50_ms']:7.2f} ms   "
+                  f"p99 {a['p99_ms']:7.2f} -> {b['p99_ms']:7.2f} ms")
+
+
+def report(results):
+    for r in results:
+        print(f"concurrency {r['concurrency']:>4}: {r['total_rps']:8.0f} req/s over {r['elapsed_s']} s")
+        for ep in ENDPOINTS:
+            e = r["endpoints"][ep]
+            if not e["requests"]:
+                continue
+            print(f"  {ep:<7} {e['requests']:6} req  {e['rps']:8.0f}/s  p50 {e['p50_ms']:7.2f}  "
+                  f"p95 {e['p95_ms']:7.2f}  p99 {e['p99_ms']:7.2f}  max {e['max_ms']:7.2f} ms"
+                  + (f"  errors {e['errors']}" if e["errors"] else ""))
+
+
+def main_cli():
+    ap = argparse.ArgumentParser(description="Load-test POST /scan/farmer/{uid} and GET /alerts/{uid}")
+    ap.add_argument("--requests", type=int, default=5000, help="requests per concurrency level")
+    ap.add_argument("--concurrency", default="1,16,64",
+                    type=lambda s: [int(c) for c in s.split(",")], help="comma-separated levels")
+    ap.add_argument("--farmers", type=int, default=2000)
+    ap.add_argument("--scan-share", type=float, default=0.5, help="fraction of requests that are scans")
+    ap.add_argument("--kn-share", type=float, default=0.3, help="fraction of farmers asking for Kannada")
+    ap.add_argument("--rtdb-latency", type=float, default=0.005, help="simulated Firebase round trip, s")
+    ap.add_argument("--model-latency", type=float, default=0.3, help="simulated model call, s")
+    ap.add_argument("--transport", choices=["asgi", "http"], default="asgi")
+    ap.add_argument("--warmup", type=int, default=500)
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--out", help="JSON results path (default benchmarks/results/loadtest-<commit>.json)")
+    ap.add_argument("--compare", help="earlier JSON results to compare against")
+    args = ap.parse_args()
+
+    results = asyncio.run(run(args))
+    commit = git_commit()
+    doc = {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "host": {"python": platform.python_version(), "cpus": os.cpu_count(), "platform": platform.platform()},
+        "config": {k: v for k, v in vars(args).items() if k not in ("out", "compare")},
+        "results": results,
+    }
+    report(results)
+
+    out = args.out or os.path.join(HERE, "results", f"loadtest-{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(doc, f, indent=2)
+    print(f"✅ results written to {out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), doc)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,54 @@
+# benchmarks/synthetic_kb.py
+# ---------------------------------------------------------
+# PEST_DB / PEST_HISTORY grown past Karnataka for scaling runs.
+#
+#   synthetic_kb(districts=10, crops=10, pests=1)
+#
+# repeats every district, crop and pest the given number of times under
+# new names ("mysuru", "mysuru 1", ...). Copy 0 keeps the real names, so
+# real requests still hit. Advisory texts of copies get a suffix, so
+# they are distinct strings as in a real larger KB.
+#
+# PEST_DB grows to crops x pests times its rules: `pests` is the number
+# of pests per crop, the knob that makes each crop's scan longer.
+# PEST_HISTORY grows to districts x pests times its entries. District
+# copy j keeps the original district's history, with each crop moved to
+# crop copy j % crops, so synthetic crops have history too without the
+# history growing as districts x crops.
+# ---------------------------------------------------------
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from district_pest_history import PEST_HISTORY  # noqa: E402
+from pest_db_extended import PEST_DB  # noqa: E402
+
+TEXT_FIELDS = ("symptoms", "preventive", "corrective")
+
+
+def copy_name(name, k):
+    return name if k == 0 else f"{name} {k}"
+
+
+def synthetic_kb(districts=1, crops=1, pests=1):
+    """(pest_db, history) with districts, crops and pests-per-crop multiplied."""
+    db = {}
+    for c in range(crops):
+        for crop, entries in PEST_DB.items():
+            out = db[copy_name(crop, c)] = {}
+            for p in range(pests):
+                for pest, e in entries.items():
+                    k = c * pests + p
+                    out[copy_name(pest, p)] = e if k == 0 else {
+                        **e, **{f: f"{e.get(f, '')} ({k})" for f in TEXT_FIELDS}}
+
+    history = {}
+    for d in range(districts):
+        for district, crop_entries in PEST_HISTORY.items():
+            out = history[copy_name(district, d)] = {}
+            for crop, entries in crop_entries.items():
+                out[copy_name(crop, d % crops)] = {
+                    copy_name(pest, p): h for p in range(pests) for pest, h in entries.items()
+                }
+    return db, history
@@ -0,0 +1,142 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from alerts_cache import invalidate_written
+from crop_summary import build_summary
+from firebase_async import get_rtdb, key_order
+from firebase_reader import extract_farmer_context
+from pest_batch import batch_scan
+from pest_engine import get_engine
+from parallel_scan import ParallelScanner
+from weather_store import get_weather_store
+
+# Nightly rescan of every farmer under Users/.
+#
+# Users are paged in key order (orderBy="$key" + startAt the last uid +
+# limitToFirst, dropping that uid again: startAt/endAt/equalTo are the
+# REST filters), so memory is bounded by the page size, not the user
+# count. Each page is scored in
+# one vectorized pass and written back with a single multi-path update.
+# The same update repairs any cropSummary that drifted from the logs.
+# After every committed page the last uid is checkpointed, so a crashed
+# run restarts with --resume from the next page. With --workers N the
+# scoring is sharded over N processes (see parallel_scan.py).
+#
+# Written uids are dropped from the API's alerts cache when it is the
+# shared Redis one; per-worker memory caches pick the new alerts up
+# when their copy expires (see alerts_cache.py).
+
+DEFAULT_CHECKPOINT = "bulk_scan.checkpoint.json"
+
+
+def load_checkpoint(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_checkpoint(path, state):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp, path)     # atomic: never a half-written checkpoint
+
+
+async def fetch_page(rtdb, after, page_size):
+    """(users after `after` in RTDB key order, whether more may follow)."""
+    query = {"orderBy": "$key", "limitToFirst": page_size}
+    if after is not None:
+        query.update(startAt=after, limitToFirst=page_size + 1)
+    users = await rtdb.get("Users", **query) or {}
+    more = len(users) == query["limitToFirst"]
+    users.pop(after, None)
+    return {uid: users[uid] for uid in sorted(users, key=key_order)}, more
+
+
+def score_page(users, scanner=None):
+    weather, names = get_weather_store(), get_engine().names
+    uids, contexts, skipped, summaries = [], [], {}, {}
+    for uid, user in users.items():
+        if isinstance(user, dict):
+            summary = build_summary(user.get("farmActivityLogs"))
+            if summary != user.get("cropSummary"):
+                summaries[f"Users/{uid}/cropSummary"] = summary
+        try:
+            ctx = extract_farmer_context(user)
+            ctx.update(weather.conditions(names.district(ctx["district"])))
+            contexts.append(ctx)
+            uids.append(uid)
+        except (ValueError, AttributeError) as e:
+            skipped[uid] = str(e)
+    results = scanner.scan_many(contexts) if scanner else batch_scan(contexts)
+    return uids, results, skipped, summaries
+
+
+async def run(page_size=500, checkpoint=DEFAULT_CHECKPOINT, resume=False, rtdb=None, scanner=None):
+    rtdb = rtdb or get_rtdb()
+
+    state = load_checkpoint(checkpoint) if resume else None
+    if state is None or state.get("done"):
+        state = {"last_uid": None, "scanned": 0, "skipped": 0, "pages": 0,
+                 "started_at": time.time(), "done": False}
+    else:
+        print(f"↩️ resuming after uid={state['last_uid']} ({state['scanned']} scanned)")
+
+    page, more = await fetch_page(rtdb, state["last_uid"], page_size)
+    while page:
+        last_uid = next(reversed(page))
+        uids, results, skipped, summaries = score_page(page, scanner)
+
+        # write this page while the next one is being fetched
+        updates = {f"alerts/{uid}": {"alerts": alerts} for uid, alerts in zip(uids, results)}
+        updates.update(summaries)
+        write = rtdb.update("", updates) if updates else asyncio.sleep(0)
+        _, (next_page, more) = await asyncio.gather(
+            write,
+            fetch_page(rtdb, last_uid, page_size) if more else asyncio.sleep(0, ({}, False)),
+        )
+        await invalidate_written(uids)
+
+        for uid, reason in skipped.items():
+            print(f"⚠️ skipped {uid}: {reason}")
+
+        state.update(
+            last_uid=last_uid,
+            scanned=state["scanned"] + len(uids),
+            skipped=state["skipped"] + len(skipped),
+            pages=state["pages"] + 1,
+        )
+        save_checkpoint(checkpoint, state)
+        page = next_page
+
+    state["done"] = True
+    state["elapsed"] = round(time.time() - state["started_at"], 2)
+    save_checkpoint(checkpoint, state)
+    return state
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Rescan every farmer under Users/")
+    ap.add_argument("--page-size", type=int, default=500)
+    ap.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT)
+    ap.add_argument("--resume", action="store_true", help="continue an interrupted run")
+    ap.add_argument("--workers", type=int, default=1, help="scoring processes (1 = in-process)")
+    args = ap.parse_args()
+
+    async def main():
+        scanner = ParallelScanner(args.workers) if args.workers > 1 else None
+        try:
+            return await run(args.page_size, args.checkpoint, args.resume, scanner=scanner)
+        finally:
+            if scanner:
+                scanner.close()
+            await get_rtdb().aclose()
+
+    result = asyncio.run(main())
+    print(f"✅ scanned {result['scanned']} farmers, skipped {result['skipped']}, "
+          f"{result['pages']} pages in {result['elapsed']} s")
@@ -0,0 +1,129 @@
+from firebase_async import get_rtdb
+
+# Users/{uid}/cropSummary: a derived copy of just the cropName of every
+# primary/secondary crop log,
+#
+#     {"v": 1, "primary_crop": {"<log key>": "Paddy", ...}, "secondary_crop": {...}}
+#
+# so a scan reads a few bytes instead of walking farmActivityLogs. It is
+# keyed like the logs themselves, which makes every maintenance step a
+# plain overwrite of the matching leaf: no counters, no read-modify-write.
+# "v" is only written by a full build; a summary without it was started
+# by leaf updates before any full build and is not trusted by readers.
+#
+# Kept up to date by:
+#   - record_crop_log(), for backend writes (log + summary in one update)
+#   - the profile listener, which applies summary_updates() to every
+#     farmActivityLogs change it sees on the Users/ stream
+#   - bulk_scan, which rewrites any summary that drifted from the logs
+# and built on first read by firebase_reader when a farmer has none yet.
+
+CROP_SECTIONS = ("primary_crop", "secondary_crop")
+SUMMARY_VERSION = 1
+
+
+def _names(entries):
+    if not isinstance(entries, dict):
+        return None
+    names = {k: v.get("cropName") for k, v in entries.items() if isinstance(v, dict)}
+    return {k: n for k, n in names.items() if n} or None
+
+
+def compact(names):
+    """A full cropSummary from {section: {key: cropName}} (None when there are no crops)."""
+    summary = {
+        s: {k: n for k, n in (names.get(s) or {}).items() if n}
+        for s in CROP_SECTIONS
+    }
+    summary = {s: v for s, v in summary.items() if v}
+    return {"v": SUMMARY_VERSION, **summary} if summary else None
+
+
+def is_complete(summary):
+    return isinstance(summary, dict) and summary.get("v") == SUMMARY_VERSION
+
+
+def build_summary(logs):
+    """cropSummary for a whole farmActivityLogs node (None when there are no crops)."""
+    if not isinstance(logs, dict):
+        return None
+    return compact({s: _names(logs.get(s)) for s in CROP_SECTIONS})
+
+
+def summary_updates(event, path, data):
+    """
+    Multi-path updates (relative to Users/) that bring cropSummary in line
+    with one put/patch event from the Users/ stream.
+    """
+    parts = [p for p in path.split("/") if p]
+    if event == "patch":
+        writes = [(parts + [p for p in k.split("/") if p], v) for k, v in data.items()]
+    else:
+        writes = [(parts, data)]
+
+    updates = {}
+    for parts, value in writes:
+        if not parts:
+            # the whole tree was replaced
+            for uid, user in (value.items() if isinstance(value, dict) else ()):
+                if isinstance(user, dict):
+                    updates[f"{uid}/cropSummary"] = build_summary(user.get("farmActivityLogs"))
+            continue
+
+        uid, rest = parts[0], parts[1:]
+        if not rest:
+            if isinstance(value, dict):      # a deleted user takes its summary along
+                updates[f"{uid}/cropSummary"] = build_summary(value.get("farmActivityLogs"))
+        elif rest[0] != "farmActivityLogs":
+            continue
+        elif len(rest) == 1:
+            updates[f"{uid}/cropSummary"] = build_summary(value)
+        elif rest[1] not in CROP_SECTIONS:
+            continue
+        elif len(rest) == 2:
+            updates[f"{uid}/cropSummary/{rest[1]}"] = _names(value)
+        elif len(rest) == 3:
+            updates[f"{uid}/cropSummary/{rest[1]}/{rest[2]}"] = (
+                value.get("cropName") if isinstance(value, dict) else None)
+        elif len(rest) == 4 and rest[3] == "cropName":
+            updates[f"{uid}/cropSummary/{rest[1]}/{rest[2]}"] = value or None
+    return updates
+
+
+def merge_updates(pending, updates):
+    """
+    Fold multi-path `updates` into `pending` so the result is still a valid
+    single update: RTDB rejects one that writes both a path and its parent.
+    """
+    for key, value in updates.items():
+        prefix = key + "/"
+        for k in [k for k in pending if k.startswith(prefix)]:
+            del pending[k]      # overwritten by this write
+
+        parts = key.split("/")
+        for i in range(len(parts) - 1, 0, -1):
+            parent = "/".join(parts[:i])
+            if parent in pending:
+                node = pending[parent] = dict(pending[parent] or {})
+                for p in parts[i:-1]:
+                    child = node.get(p)
+                    node[p] = child = dict(child) if isinstance(child, dict) else {}
+                    node = child
+                if value is None:
+                    node.pop(parts[-1], None)
+                else:
+                    node[parts[-1]] = value
+                break
+        else:
+            pending[key] = value
+    return pending
+
+
+async def record_crop_log(uid, section, key, entry, rtdb=None):
+    """Write one crop log entry together with its cropSummary leaf."""
+    if section not in CROP_SECTIONS:
+        raise ValueError(f"Unknown crop section {section!r}")
+    await (rtdb or get_rtdb()).update(f"Users/{uid}", {
+        f"farmActivityLogs/{section}/{key}": entry,
+        f"cropSummary/{section}/{key}": entry.get("cropName") if entry else None,
+    })
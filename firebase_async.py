@@ -0,0 +1,205 @@
+import asyncio
+import json
+import os
+import re
+from urllib.parse import urlparse
+
+import aiohttp
+
+# Realtime Database REST API over one pooled async HTTP client.
+# A single event loop can keep hundreds of reads/writes in flight
+# instead of parking a threadpool worker on every round trip.
+
+SCOPES = [
+    "https://www.googleapis.com/auth/firebase.database",
+    "https://www.googleapis.com/auth/userinfo.email",
+]
+
+# a streaming read gets a keep-alive event every ~30 s
+STREAM_READ_TIMEOUT = 90
+
+# query parameters the REST API expects JSON-encoded
+_JSON_PARAMS = ("orderBy", "startAt", "endAt", "equalTo")
+
+_INT_KEY = re.compile(r"0|-?[1-9][0-9]*")
+_INT32 = range(-2**31, 2**31)
+
+
+def key_order(key):
+    """
+    Sort key for RTDB's orderBy="$key": keys that parse as 32-bit integers
+    come first, numerically, then every other key as a string. Filtered
+    REST results come back as an unordered JSON object, so sort with this.
+    """
+    if _INT_KEY.fullmatch(key) and int(key) in _INT32:
+        return (0, int(key), "")
+    return (1, 0, key)
+
+
+class RTDBError(RuntimeError):
+    def __init__(self, status, message):
+        super().__init__(f"RTDB {status}: {message}")
+        self.status = status
+
+
+class AsyncRTDB:
+
+    def __init__(self, base_url, credentials=None, namespace=None,
+                 max_connections=200, timeout=10.0):
+        self.base_url = base_url.rstrip("/")
+        self.namespace = namespace          # emulator only: ?ns=<db name>
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._credentials = credentials
+        self._token_lock = asyncio.Lock()
+        self._session = None
+
+    def _client(self):
+        # created lazily: an aiohttp session must be bound to the running loop
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                json_serialize=lambda v: json.dumps(v, ensure_ascii=False),
+            )
+        return self._session
+
+    async def _headers(self):
+        if self._credentials is None:
+            return {}
+        if not self._credentials.valid:
+            async with self._token_lock:
+                if not self._credentials.valid:
+                    # google-auth refresh is blocking; keep it off the event loop
+                    from google.auth.transport.requests import Request
+                    await asyncio.to_thread(self._credentials.refresh, Request())
+        return {"Authorization": f"Bearer {self._credentials.token}"}
+
+    def _params(self, query):
+        params = {}
+        if self.namespace:
+            params["ns"] = self.namespace
+        for k, v in query.items():
+            if v is None:
+                continue
+            if k in _JSON_PARAMS:
+                v = json.dumps(v)
+            elif isinstance(v, bool):
+                v = "true" if v else "false"
+            params[k] = str(v)
+        return params
+
+    async def _request(self, method, path, body=None, **query):
+        url = f"{self.base_url}/{path.strip('/')}.json"
+        async with self._client().request(
+            method,
+            url,
+            params=self._params(query),
+            headers=await self._headers(),
+            json=body,
+        ) as res:
+            text = await res.text()
+        if res.status >= 400:
+            try:
+                message = json.loads(text).get("error", text)
+            except (ValueError, AttributeError):
+                message = text
+            raise RTDBError(res.status, message)
+        return json.loads(text) if text else None
+
+    async def get(self, path, shallow=None, **query):
+        return await self._request("GET", path, shallow=shallow, **query)
+
+    async def set(self, path, value):
+        return await self._request("PUT", path, value, print="silent")
+
+    async def update(self, path, values):
+        """Multi-path update: keys of `values` may be slash-separated paths."""
+        return await self._request("PATCH", path, values, print="silent")
+
+    async def delete(self, path):
+        return await self._request("DELETE", path)
+
+    async def stream(self, path, skip_initial=False, **query):
+        """
+        Change stream for `path` over server-sent events (the REST form of
+        the Admin SDK's Reference.listen). Yields (event, path, data) for
+        "put" and "patch" events, with path relative to `path`. The first
+        event is a put of the whole node; with skip_initial it is read off
+        the wire but never decoded. Raises RTDBError when the server
+        cancels the stream or revokes the token; callers reconnect.
+        """
+        url = f"{self.base_url}/{path.strip('/')}.json"
+        headers = {**await self._headers(), "Accept": "text/event-stream"}
+        timeout = aiohttp.ClientTimeout(total=None, sock_read=STREAM_READ_TIMEOUT)
+
+        async with self._client().get(url, params=self._params(query), headers=headers,
+                                      timeout=timeout) as res:
+            if res.status >= 400:
+                raise RTDBError(res.status, await res.text())
+
+            event, first = None, True
+            pending = []
+            async for chunk in res.content.iter_any():
+                # the initial snapshot can be one very long line; join pieces once
+                *lines, rest = chunk.split(b"\n")
+                if lines:
+                    lines[0] = b"".join(pending) + lines[0]
+                    pending = []
+                pending.append(rest)
+
+                for line in lines:
+                    if line.startswith(b"event:"):
+                        event = line[6:].strip().decode()
+                    elif line.startswith(b"data:") and event:
+                        if event in ("put", "patch"):
+                            if not (first and skip_initial):
+                                msg = json.loads(line[5:])
+                                yield event, msg["path"], msg["data"]
+                            first = False
+                        elif event in ("cancel", "auth_revoked"):
+                            raise RTDBError(401 if event == "auth_revoked" else 403,
+                                            line[5:].strip().decode() or event)
+                        event = None
+
+    async def aclose(self):
+        if self._session is not None:
+            await self._session.close()
+
+
+def from_env():
+    emulator = os.environ.get("FIREBASE_DATABASE_EMULATOR_HOST")
+    db_url = os.environ["FIREBASE_DB_URL"]
+
+    if emulator:
+        namespace = urlparse(db_url).hostname.split(".")[0]
+        return AsyncRTDB(f"http://{emulator}", namespace=namespace)
+
+    from google.oauth2 import service_account
+    cred = service_account.Credentials.from_service_account_info(
+        json.loads(os.environ["FIREBASE_CREDENTIALS"]), scopes=SCOPES
+    )
+    return AsyncRTDB(db_url, credentials=cred)
+
+
+_rtdb = None
+
+
+def get_rtdb():
+    global _rtdb
+    if _rtdb is None:
+        _rtdb = from_env()
+    return _rtdb
+
+
+def set_rtdb(client):
+    """Swap the shared client (tests, benchmarks, local fakes)."""
+    global _rtdb
+    _rtdb = client
+
+
+async def close_rtdb():
+    global _rtdb
+    if _rtdb is not None:
+        await _rtdb.aclose()
+        _rtdb = None
@@ -1,17 +1,32 @@
-from firebase_admin import db
+import asyncio
 import json
+import logging
 
-def get_farmer_context(uid: str):
+from firebase_admin import db
+from crop_summary import CROP_SECTIONS, compact, is_complete
+from firebase_async import get_rtdb
+from timing import timed
+
+log = logging.getLogger(__name__)
 
-    ref = db.reference(f"Users/{uid}")
-    user = ref.get()
+# A scan needs three things from Users/{uid}: district, soilType and the
+# cropName of each primary/secondary crop log. The node also holds the
+# farmer's whole activity history, which only grows, so it is never read
+# in full. The crop names come from the derived cropSummary node (see
+# crop_summary.py). For a farmer without one yet, the crop sections are
+# listed shallow (keys only), just the cropName leaf of each entry is
+# fetched, and the summary is written for next time. A section with more
+# than LEAF_FETCH_LIMIT entries is read in one request instead of one per
+# leaf.
+
+LEAF_FETCH_LIMIT = 50
+
+
+def extract_farmer_context(user):
 
     if not user:
         raise ValueError("User node not found")
 
-    # 🔥 DEBUG: PRINT FULL USER NODE
-    print("🔥 USER DATA:", json.dumps(user, indent=2))
-
     district = user.get("district")
     soil = user.get("soilType")
 
@@ -23,7 +38,7 @@ def get_farmer_context(uid: str):
     logs = user.get("farmActivityLogs", {})
     crops = []
 
-    for section in ["primary_crop", "secondary_crop"]:
+    for section in CROP_SECTIONS:
         for _, v in logs.get(section, {}).items():
             name = v.get("cropName")
             if name:
@@ -37,3 +52,94 @@ def get_farmer_context(uid: str):
         "soilType": soil,
         "crops": list(set(crops))
     }
+
+
+def _projected_user(district, soil, names):
+    """Rebuild the slice of the user node extract_farmer_context looks at."""
+    if district is None and soil is None and not any(names.get(s) for s in CROP_SECTIONS):
+        return None
+    logs = {
+        section: {key: {"cropName": name} for key, name in (names.get(section) or {}).items()}
+        for section in CROP_SECTIONS
+    }
+    return {"district": district, "soilType": soil, "farmActivityLogs": logs}
+
+
+def _crop_names_from_ref(base):
+    names = {}
+    for section in CROP_SECTIONS:
+        ref = base.child(f"farmActivityLogs/{section}")
+        keys = ref.get(shallow=True)
+        if not isinstance(keys, dict):
+            continue
+        if len(keys) > LEAF_FETCH_LIMIT:
+            entries = ref.get() or {}
+            names[section] = {k: v.get("cropName") for k, v in entries.items() if isinstance(v, dict)}
+        else:
+            names[section] = {k: ref.child(f"{k}/cropName").get() for k in keys}
+    return names
+
+
+@timed("firebase_read")
+def get_farmer_context(uid: str):
+
+    base = db.reference(f"Users/{uid}")
+    district = base.child("district").get()
+    soil = base.child("soilType").get()
+    names = base.child("cropSummary").get()
+
+    if not is_complete(names):
+        names = _crop_names_from_ref(base)
+        summary = compact(names)
+        if summary and district is not None:
+            base.child("cropSummary").set(summary)
+
+    user = _projected_user(district, soil, names)
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("USER DATA %s: %s", uid, json.dumps(user, indent=2))
+
+    return extract_farmer_context(user)
+
+
+async def _crop_names_from_logs(rtdb, base):
+    sections = await asyncio.gather(
+        *(rtdb.get(f"{base}/farmActivityLogs/{s}", shallow=True) for s in CROP_SECTIONS)
+    )
+
+    async def section_names(section, keys):
+        path = f"{base}/farmActivityLogs/{section}"
+        # shallow listings aren't dicts if the section is missing or malformed
+        if not isinstance(keys, dict):
+            return {}
+        if len(keys) > LEAF_FETCH_LIMIT:
+            entries = await rtdb.get(path) or {}
+            return {k: v.get("cropName") for k, v in entries.items() if isinstance(v, dict)}
+        values = await asyncio.gather(*(rtdb.get(f"{path}/{k}/cropName") for k in keys))
+        return dict(zip(keys, values))
+
+    return dict(zip(CROP_SECTIONS, await asyncio.gather(
+        *(section_names(s, keys) for s, keys in zip(CROP_SECTIONS, sections))
+    )))
+
+
+@timed("firebase_read")
+async def get_farmer_context_async(uid: str, rtdb=None):
+    rtdb = rtdb or get_rtdb()
+    base = f"Users/{uid}"
+
+    district, soil, names = await asyncio.gather(
+        rtdb.get(f"{base}/district"),
+        rtdb.get(f"{base}/soilType"),
+        rtdb.get(f"{base}/cropSummary"),
+    )
+    if not is_complete(names):
+        names = await _crop_names_from_logs(rtdb, base)
+        summary = compact(names)
+        if summary and district is not None:
+            await rtdb.set(f"{base}/cropSummary", summary)
+
+    user = _projected_user(district, soil, names)
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("USER DATA %s: %s", uid, json.dumps(user, indent=2))
+
+    return extract_farmer_context(user)
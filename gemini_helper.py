@@ -1,17 +1,13 @@
-import os
-import google.generativeai as genai
-
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-
-if not GEMINI_API_KEY:
-    raise RuntimeError("GEMINI_API_KEY not set")
-
-genai.configure(api_key=GEMINI_API_KEY)
-
-model = genai.GenerativeModel("gemini-1.5-flash")
+from translation_cache import get_translation_cache
+from translation_provider import get_provider
 
 
 def translate_to_kannada(text: str) -> str:
+    cache = get_translation_cache()
+    cached = cache.get(text, "kn")
+    if cached is not None:
+        return cached
+
     prompt = f"""
 Translate the following agricultural pest advisory into simple Kannada
 that a farmer can understand:
@@ -19,7 +15,9 @@ that a farmer can understand:
 {text}
 """
     try:
-        res = model.generate_content(prompt)
-        return res.text.strip()
+        translated = get_provider().generate(prompt).strip()
     except Exception:
-        return text  # fallback
+        return text  # fallback (not cached, so it is retried next time)
+
+    cache.put(text, "kn", translated)
+    return translated
@@ -0,0 +1,90 @@
+from kb_utils import RISK_LABEL, DEFAULT_RISK, month_mask, norm_key
+
+EMPTY = ()
+NO_MONTHS = (EMPTY,) * 13
+NO_CROPS = {}
+
+
+class HistoryEntry:
+    __slots__ = ("district", "crop", "pest", "risk", "season", "peak")
+
+    def __init__(self, district, crop, pest, h):
+        self.district = district
+        self.crop = crop
+        self.pest = pest
+        self.risk = RISK_LABEL.get(h.get("risk_level", "").upper(), DEFAULT_RISK)
+        self.season = month_mask(h.get("season"))
+        self.peak = month_mask(h.get("peak_months"))
+
+    def is_peak(self, month):
+        return bool(self.peak >> month & 1)
+
+    def __repr__(self):
+        return f"HistoryEntry({self.district!r}, {self.crop!r}, {self.pest!r}, {self.risk!r})"
+
+
+class HistoryIndex:
+    """
+    PEST_HISTORY flattened once into month-indexed tuples.
+
+    Keys are normalized (see kb_utils.norm_key) and month is 1..12.
+    Lookups are two dict probes and a tuple index; they return prebuilt
+    tuples and allocate nothing. A miss returns the shared EMPTY tuple.
+    """
+
+    def __init__(self, history=None):
+        if history is None:
+            from district_pest_history import PEST_HISTORY as history
+
+        self.entries = {}        # (district, crop, pest) -> HistoryEntry
+        by_crop = {}             # district -> crop -> [13 lists, by month]
+        by_district = {}         # district -> [13 lists, by month]
+
+        for district, crops in history.items():
+            district = norm_key(district)
+            for crop, pests in crops.items():
+                crop = norm_key(crop)
+                for pest, h in pests.items():
+                    entry = HistoryEntry(district, crop, pest, h)
+                    self.entries[(district, crop, pest)] = entry
+
+                    # a peak month outside the listed season still counts as active
+                    active = entry.season | entry.peak
+                    crop_months = by_crop.setdefault(district, {}).setdefault(crop, [[] for _ in range(13)])
+                    district_months = by_district.setdefault(district, [[] for _ in range(13)])
+                    for month in range(1, 13):
+                        if active >> month & 1:
+                            crop_months[month].append(entry)
+                            district_months[month].append(entry)
+
+        self.by_crop = {
+            d: {c: tuple(tuple(m) for m in months) for c, months in crops.items()}
+            for d, crops in by_crop.items()
+        }
+        self.by_district = {d: tuple(tuple(m) for m in months) for d, months in by_district.items()}
+        self.districts = frozenset(self.by_district)
+
+    def active(self, district, crop, month):
+        return self.by_crop.get(district, NO_CROPS).get(crop, NO_MONTHS)[month]
+
+    def active_in_district(self, district, month):
+        return self.by_district.get(district, NO_MONTHS)[month]
+
+    def entry(self, district, crop, pest):
+        return self.entries.get((district, crop, pest))
+
+
+_index = None
+
+
+def get_history_index():
+    """The index over PEST_HISTORY, built once on first use."""
+    global _index
+    if _index is None:
+        _index = HistoryIndex()
+    return _index
+
+
+def set_history_index(index):
+    global _index
+    _index = index
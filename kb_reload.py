@@ -0,0 +1,210 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+import aiohttp
+
+from alert_table import AlertTable, build_table, get_alert_table, set_alert_table
+from firebase_async import RTDBError, get_rtdb
+from history_index import HistoryIndex, set_history_index
+from kb_snapshot import load_snapshot
+from pest_engine import PestEngine, set_engine
+from scan_cache import new_scan_cache, set_scan_cache
+
+# Swaps in a new pest knowledge base while the service keeps serving.
+#
+# A new KB comes from either source:
+#   - a snapshot file (KB_SNAPSHOT_PATH, kb_snapshot.py format), polled
+#     for changes; publish it with `python kb_snapshot.py build <path>`,
+#     which replaces the file atomically;
+#   - an RTDB node (KB_RTDB_PATH) holding {"PEST_DB": ..., "PEST_HISTORY":
+#     ..., "version": ...}, followed through its change stream.
+#
+# The new engine, and the alert table when ALERT_TABLE_PATH is set, are
+# built in a thread. The event loop then swaps them in by reassigning
+# the shared references (engine, history index, alert table, and a fresh
+# scan memo), read-copy-update style. Nothing is locked or mutated in
+# place. A request that already holds the old engine or scan memo
+# finishes on it, and the old objects are freed once no request uses
+# them. A KB that fails to load or compile is reported and the running
+# version stays.
+
+POLL_INTERVAL = float(os.getenv("KB_RELOAD_INTERVAL", "5"))
+
+
+def file_stamp(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def content_version(data):
+    return hashlib.sha1(data).hexdigest()[:12]
+
+
+def file_version(path):
+    with open(path, "rb") as f:
+        return content_version(f.read())
+
+
+def compile_kb(node):
+    """An engine from an RTDB KB node; raises on a malformed KB."""
+    if not isinstance(node, dict) or not isinstance(node.get("PEST_DB"), dict):
+        raise ValueError("KB node has no PEST_DB")
+    return PestEngine(node["PEST_DB"], HistoryIndex(node.get("PEST_HISTORY") or {}))
+
+
+def build_derived(engine):
+    """The alert table for `engine`, if this process serves from one."""
+    if get_alert_table() is None:
+        return None
+    # a private, already-unlinked file: workers reloading at once don't collide
+    fd, path = tempfile.mkstemp(prefix="alert_table-", suffix=".bin",
+                                dir=os.path.dirname(os.path.abspath(os.environ["ALERT_TABLE_PATH"])))
+    os.close(fd)
+    try:
+        build_table(path, engine)
+        return AlertTable(path)
+    finally:
+        os.unlink(path)
+
+
+class KBReloader:
+
+    def __init__(self, snapshot_path=None, rtdb_path=None, rtdb=None, interval=POLL_INTERVAL):
+        self.snapshot_path = snapshot_path
+        self.rtdb_path = rtdb_path
+        self.rtdb = rtdb
+        self.interval = interval
+        self.version = None
+        self.source = None
+        self._stamp = None
+        self._lock = asyncio.Lock()
+        self.stats = {"reloads": 0, "unchanged": 0, "failures": 0, "last_swap_ms": 0.0}
+
+    def swap(self, engine, table, version, source):
+        """Publish a fully built KB. Runs on the event loop; never blocks."""
+        start = time.perf_counter()
+        set_history_index(engine.history)
+        set_alert_table(table)
+        set_engine(engine)
+        set_scan_cache(new_scan_cache())     # memoized answers belong to the old KB
+        self.version, self.source = version, source
+        self.stats["reloads"] += 1
+        self.stats["last_swap_ms"] = (time.perf_counter() - start) * 1e3
+        print(f"🔥 KB {version} from {source} is live")
+
+    async def _install(self, build, version, source):
+        async with self._lock:
+            if version == self.version:
+                self.stats["unchanged"] += 1
+                return False
+            try:
+                engine, table = await asyncio.to_thread(build)
+            except Exception as e:
+                self.stats["failures"] += 1
+                print(f"⚠️ KB {version} from {source} rejected, keeping {self.version}: {e!r}")
+                return False
+            self.swap(engine, table, version, source)
+            return True
+
+    async def check_file(self):
+        """Reload the snapshot file if it changed since the last check."""
+        path = self.snapshot_path
+        try:
+            stamp = file_stamp(path)
+        except FileNotFoundError:
+            return False
+        if stamp == self._stamp:
+            return False
+        self._stamp = stamp
+        version = await asyncio.to_thread(file_version, path)
+
+        def build():
+            engine = load_snapshot(path)
+            return engine, build_derived(engine)
+
+        return await self._install(build, version, path)
+
+    async def check_rtdb(self):
+        """Reload from the RTDB node if its content changed."""
+        node = await self.rtdb.get(self.rtdb_path)
+        if node is None:
+            return False
+        version = str(node.get("version") if isinstance(node, dict) and node.get("version")
+                      else content_version(json.dumps(node, sort_keys=True).encode()))
+
+        def build():
+            engine = compile_kb(node)
+            return engine, build_derived(engine)
+
+        return await self._install(build, version, f"rtdb:{self.rtdb_path}")
+
+    async def watch_file(self):
+        while True:
+            try:
+                await self.check_file()
+            except OSError as e:
+                print(f"⚠️ KB snapshot check failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def watch_rtdb(self):
+        backoff = 1
+        while True:
+            try:
+                # every event (the initial snapshot included) means "re-read the node"
+                async for _ in self.rtdb.stream(self.rtdb_path):
+                    await self.check_rtdb()
+                    backoff = 1
+            except (RTDBError, aiohttp.ClientError, OSError, asyncio.TimeoutError) as e:
+                print(f"⚠️ KB stream dropped ({e}); reconnecting in {backoff}s")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 60)
+
+    async def run(self):
+        watchers = []
+        if self.snapshot_path:
+            watchers.append(self.watch_file())
+        if self.rtdb_path:
+            self.rtdb = self.rtdb or get_rtdb()
+            watchers.append(self.watch_rtdb())
+        await asyncio.gather(*watchers)
+
+
+_reloader = None
+
+
+def get_reloader():
+    """The reloader configured by KB_SNAPSHOT_PATH / KB_RTDB_PATH; None when neither is set."""
+    global _reloader
+    if _reloader is None:
+        snapshot_path = os.getenv("KB_SNAPSHOT_PATH")
+        rtdb_path = os.getenv("KB_RTDB_PATH")
+        if not snapshot_path and not rtdb_path:
+            return None
+        _reloader = KBReloader(snapshot_path, rtdb_path)
+    return _reloader
+
+
+def publish(rtdb_path="kb"):
+    """Push the PEST_DB / PEST_HISTORY modules on disk to the RTDB KB node."""
+    from firebase_admin import db
+    from firebase_init import init_firebase
+    from district_pest_history import PEST_HISTORY
+    from pest_db_extended import PEST_DB
+
+    init_firebase()
+    version = content_version(json.dumps([PEST_DB, PEST_HISTORY], sort_keys=True).encode())
+    db.reference(rtdb_path).set({"PEST_DB": PEST_DB, "PEST_HISTORY": PEST_HISTORY, "version": version})
+    return version
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Publish the on-disk KB to the RTDB node the service watches")
+    ap.add_argument("command", choices=["publish"])
+    ap.add_argument("--path", default=os.getenv("KB_RTDB_PATH", "kb"))
+    args = ap.parse_args()
+    print(f"✅ published KB {publish(args.path)} to {args.path}")
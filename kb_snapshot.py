@@ -0,0 +1,128 @@
+import os
+import struct
+import sys
+
+from history_index import HistoryIndex
+from kb_utils import MONTHS, BitVocab
+from mapped_file import MappedFile, MappedStrings, StringPool, write_file
+from pest_engine import PestEngine, Rule, get_engine
+
+# The compiled PestEngine (rules, vocabularies and history) in one
+# little-endian file that processes mmap instead of importing and
+# compiling PEST_DB / PEST_HISTORY (layout helpers in mapped_file.py):
+#
+#   header      magic, version, section sizes
+#   bounds      float64[rules][6]   temp/humidity/rainfall lo, hi
+#   masks       int64[rules][3]     months, stages, soils
+#   offsets     uint32[strings + 1] into the string pool
+#   rule_text   uint32[rules][5]    crop, pest, symptoms, preventive, corrective
+#   history     uint32[entries][6]  district, crop, pest, risk, season, peak
+#   vocab       uint32              soil names, then stage names
+#   pool        UTF-8 bytes, every distinct string once
+#
+# Rule numbers and names are decoded at load. The advisory texts, which
+# are most of the bytes, stay in the mapping (shared by every process
+# through the page cache) and are decoded the first time an alert needs
+# them.
+#
+#   python kb_snapshot.py build [path]
+
+MAGIC = b"PESTKB\0\0"
+SNAPSHOT_VERSION = 2
+HEADER = struct.Struct("<8s6I")
+DEFAULT_SNAPSHOT = "kb_snapshot.bin"
+
+
+def build_snapshot(path=DEFAULT_SNAPSHOT, engine=None):
+    engine = engine or get_engine()
+    rules = [r for rs in engine.rules_by_crop.values() for r in rs]
+    history = list(engine.history.entries.values())
+    soils, stages = engine.soil_vocab.names, engine.stage_vocab.names
+
+    pool = StringPool()
+    sid = pool.sid
+    rule_text = [sid(t) for r in rules
+                 for t in (r.crop, r.pest, r.symptoms, r.preventive, r.corrective)]
+    hist = [v for h in history
+            for v in (sid(h.district), sid(h.crop), sid(h.pest), sid(h.risk), h.season, h.peak)]
+    vocab = [sid(n) for n in soils + stages]
+    offsets, blob = pool.pack()
+
+    header = HEADER.pack(MAGIC, SNAPSHOT_VERSION, len(pool), len(rules),
+                         len(history), len(soils), len(stages))
+    return write_file(path, header, [
+        ("d", [v for r in rules for v in (r.temp_lo, r.temp_hi, r.hum_lo, r.hum_hi, r.rain_lo, r.rain_hi)]),
+        ("q", [v for r in rules for v in (r.months, r.stages, r.soils)]),
+        ("I", offsets), ("I", rule_text), ("I", hist), ("I", vocab),
+    ], blob)
+
+
+class MappedRule(Rule):
+    """A Rule whose advisory texts stay in the mapping until read."""
+
+    __slots__ = ("_strings", "_text_ids")
+
+    @property
+    def symptoms(self):
+        return self._strings[self._text_ids[0]]
+
+    @property
+    def preventive(self):
+        return self._strings[self._text_ids[1]]
+
+    @property
+    def corrective(self):
+        return self._strings[self._text_ids[2]]
+
+
+def load_snapshot(path=DEFAULT_SNAPSHOT):
+    f = MappedFile(path, HEADER)
+    magic, version, n_strings, n_rules, n_history, n_soils, n_stages = f.fields
+    if magic != MAGIC or version != SNAPSHOT_VERSION:
+        raise ValueError(f"{path!r} is not a version {SNAPSHOT_VERSION} KB snapshot; rebuild it")
+
+    bounds = f.take("d", n_rules * 6)
+    masks = f.take("q", n_rules * 3)
+    offsets = f.take("I", n_strings + 1)
+    rule_text = f.take("I", n_rules * 5)
+    hist = f.take("I", n_history * 6)
+    vocab = f.take("I", n_soils + n_stages)
+    strings = MappedStrings(f.rest(), offsets)
+
+    soil_vocab = BitVocab(strings[i] for i in vocab[:n_soils])
+    stage_vocab = BitVocab(strings[i] for i in vocab[n_soils:])
+
+    rules_by_crop = {}
+    for i in range(n_rules):
+        rule = MappedRule.__new__(MappedRule)
+        crop, pest, *texts = rule_text[i * 5:i * 5 + 5]
+        rule.crop, rule.pest = strings[crop], strings[pest]
+        (rule.temp_lo, rule.temp_hi, rule.hum_lo, rule.hum_hi,
+         rule.rain_lo, rule.rain_hi) = bounds[i * 6:i * 6 + 6]
+        rule.months, rule.stages, rule.soils = masks[i * 3:i * 3 + 3]
+        rule._strings, rule._text_ids = strings, tuple(texts)
+        rules_by_crop.setdefault(rule.crop, []).append(rule)
+
+    def months(mask):
+        return [MONTHS[m - 1] for m in range(1, 13) if mask >> m & 1]
+
+    history = {}
+    for i in range(n_history):
+        district, crop, pest, risk, season, peak = hist[i * 6:i * 6 + 6]
+        history.setdefault(strings[district], {}).setdefault(strings[crop], {})[strings[pest]] = {
+            "season": months(season),
+            "peak_months": months(peak),
+            "risk_level": strings[risk].upper(),
+        }
+
+    return PestEngine.from_parts(
+        {crop: tuple(rules) for crop, rules in rules_by_crop.items()},
+        soil_vocab, stage_vocab, HistoryIndex(history),
+    )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "build":
+        sys.exit("usage: python kb_snapshot.py build [path]")
+    out = build_snapshot(sys.argv[2] if len(sys.argv) > 2 else DEFAULT_SNAPSHOT)
+    print(f"✅ wrote {out} ({os.path.getsize(out):,} bytes)")
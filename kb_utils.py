@@ -0,0 +1,58 @@
+# Shared helpers for the pest knowledge bases (PEST_DB / PEST_HISTORY)
+import sys
+
+MONTHS = [
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+]
+MONTH_NUMBER = {name.lower(): i + 1 for i, name in enumerate(MONTHS)}
+
+ALL_MONTHS = (1 << 13) - 2   # bits 1..12
+
+RISK_LABEL = {"LOW": "Low", "MEDIUM": "Medium", "HIGH": "High"}
+DEFAULT_RISK = "Medium"
+
+
+def month_mask(months):
+    mask = 0
+    for m in months or ():
+        mask |= 1 << MONTH_NUMBER[m.strip().lower()]
+    return mask
+
+
+def norm_key(value):
+    # "Red Soil" / "red_soil" / " red soil " -> "red soil"
+    return " ".join(str(value).replace("_", " ").lower().split())
+
+
+ANY = -1        # mask that matches every bit, i.e. "no restriction" / "not given"
+UNKNOWN = 1     # bit 0: a value that is not in the vocabulary
+
+
+class BitVocab:
+    """
+    Interned name <-> bit table for a categorical KB field (soil, stage).
+
+    Bit 0 is reserved for values outside the vocabulary, so matching a
+    farmer value against a rule is a single `rule_mask & bit`.
+    """
+
+    def __init__(self, values):
+        self.names = tuple(sorted({sys.intern(norm_key(v)) for v in values}))
+        self.bits = {name: 1 << (i + 1) for i, name in enumerate(self.names)}
+
+    def mask(self, values):
+        mask = 0
+        for v in values or ():
+            mask |= self.bits[norm_key(v)]
+        return mask or ANY
+
+    def bit(self, value):
+        if not value:
+            return ANY
+        return self.bits.get(norm_key(value), UNKNOWN)
+
+    def decode(self, mask):
+        if mask == ANY:
+            return ()
+        return tuple(n for n in self.names if mask & self.bits[n])
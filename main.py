@@ -1,33 +1,121 @@
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
 from firebase_init import init_firebase
-from firebase_admin import db
-from models import ScanRequest   # ✅ FIX
+from firebase_async import get_rtdb, close_rtdb
+from alerts_cache import get_alerts_cache
+from models import ScanRequest, BatchScanItem, BatchScanRequest   # ✅ FIX
+from pest_engine import get_engine, run_scan
+from scan_cache import get_scan_cache, scan_key
+from translator import translate_alert_lists_checked
+from kb_reload import get_reloader
+import timing
+from timing import span, timed
+import asyncio
+import os
 import traceback
 
 app = FastAPI()
+_reload_task = None
+
+SCAN_BATCH_MAX = int(os.getenv("SCAN_BATCH_MAX", "1000"))
+BAD_KEY_CHARS = set(".$#[]/")     # not allowed in an RTDB key
+
+if timing.SERVER_TIMING:
+    app.add_middleware(timing.ServerTimingMiddleware)
 
 @app.on_event("startup")
-def start():
+async def start():
+    global _reload_task
     init_firebase()
+    get_rtdb()
+    get_engine()   # compile the KB before the first request
+
+    reloader = get_reloader()
+    if reloader is not None:
+        _reload_task = asyncio.create_task(reloader.run())
+
+@app.on_event("shutdown")
+async def stop():
+    if _reload_task is not None:
+        _reload_task.cancel()
+    await close_rtdb()
+
+def _scan_key(req):
+    if not req.district or not req.soilType or not req.primaryCrop:
+        raise ValueError("Incomplete scan request")
+    return scan_key(req.district, req.soilType, req.primaryCrop, req.secondaryCrop, req.language)
+
+
+async def _evaluate(requests):
+    """
+    Alerts for {scan key: ScanRequest}, each distinct request once: memo
+    hits first, then run_scan, with every Kannada result translated in one
+    pass. Returns ({key: alerts}, {key: exception}).
+    """
+    with span("memo"):
+        scans = get_scan_cache()
+        alerts_by_key = {}
+        for key in requests:
+            alerts = scans.get(key)
+            if alerts is not None:
+                alerts_by_key[key] = alerts
+
+    errors = {}
+    untranslated = {}
+    for key, req in requests.items():
+        if key in alerts_by_key:
+            continue
+        try:
+            alerts = run_scan(req.district, req.soilType, req.primaryCrop, req.secondaryCrop, req.language)
+        except Exception as e:
+            errors[key] = e
+            continue
+        if req.language == "kn":
+            untranslated[key] = alerts
+        else:
+            alerts_by_key[key] = alerts
+            scans.set(key, alerts)
+
+    if untranslated:
+        try:
+            translated = await translate_alert_lists_checked(list(untranslated.values()), "kn")
+        except Exception as e:
+            # translation never fails a scan: serve the English alerts, unmemoized
+            print(f"⚠️ translation failed, serving English: {e}")
+            translated = [(alerts, False) for alerts in untranslated.values()]
+        for key, (alerts, complete) in zip(untranslated, translated):
+            alerts_by_key[key] = alerts
+            # an English fallback is retried on the next scan, not memoized
+            if complete:
+                scans.set(key, alerts)
+
+    return alerts_by_key, errors
+
+
+async def _write_alerts(alerts_by_uid):
+    """Every alerts/{uid} in one multi-path update, then the alerts cache."""
+    cache = get_alerts_cache()
+    try:
+        with span("rtdb_write"):
+            await get_rtdb().update("alerts", {uid: {"alerts": alerts} for uid, alerts in alerts_by_uid.items()})
+    except Exception:
+        # the nodes may or may not have been written; don't serve stale alerts
+        await cache.invalidate_many(list(alerts_by_uid))
+        raise
+    with span("alerts_cache"):
+        await cache.put_many(alerts_by_uid)
+
 
 @app.post("/scan/farmer/{uid}")
-def scan_farmer(uid: str, req: ScanRequest):
+@timed("scan_farmer")
+async def scan_farmer(uid: str, req: ScanRequest):
 
     try:
-        if not req.district or not req.soilType or not req.primaryCrop:
-            raise ValueError("Incomplete scan request")
-
-        # SIMPLE STATIC RESPONSE FOR TESTING
-        alerts = [{
-            "crop": req.primaryCrop,
-            "pest": "Root Grub",
-            "risk": "High",
-            "symptoms": "Yellowing leaves",
-            "preventive": "Good drainage",
-            "treatment": "Soil insecticide"
-        }]
-
-        db.reference(f"alerts/{uid}").set({"alerts": alerts})
+        key = _scan_key(req)
+        alerts, errors = await _evaluate({key: req})
+        if errors:
+            raise errors[key]
+        await _write_alerts({uid: alerts[key]})
 
         return {"status": "scan_completed"}
 
@@ -36,18 +124,109 @@ def scan_farmer(uid: str, req: ScanRequest):
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@app.post("/scan/batch")
+@timed("scan_batch")
+async def scan_batch(batch: BatchScanRequest):
+    """
+    Scan many farmers in one call. Identical requests are evaluated once,
+    Kannada alerts are translated together, and every alerts/{uid} is
+    written in one multi-path update. Each item gets its own status; a bad
+    item does not fail the others.
+    """
+    if len(batch.items) > SCAN_BATCH_MAX:
+        raise HTTPException(status_code=413, detail=f"At most {SCAN_BATCH_MAX} items per batch")
+
+    results = [{"uid": item.get("uid"), "status": "scan_completed"}
+               for item in batch.items]
+
+    def fail(i, e):
+        results[i] = {"uid": results[i]["uid"], "status": "error", "detail": str(e)}
+
+    pending = {}     # uid -> (item index, scan key)
+    requests = {}    # scan key -> ScanRequest, one per distinct request
+    for i, raw in enumerate(batch.items):
+        try:
+            item = BatchScanItem.model_validate(raw)
+            if not item.uid or BAD_KEY_CHARS & set(item.uid):
+                raise ValueError("Invalid uid")
+            if item.uid in pending:
+                raise ValueError("Duplicate uid in batch")
+            key = _scan_key(item.request)
+        except Exception as e:
+            fail(i, e)
+            continue
+        pending[item.uid] = (i, key)
+        requests.setdefault(key, item.request)
+
+    alerts_by_key, errors = await _evaluate(requests)
+    for e in errors.values():
+        traceback.print_exception(e)
+
+    written = {}
+    for uid, (i, key) in pending.items():
+        if key in errors:
+            fail(i, errors[key])
+        else:
+            written[uid] = alerts_by_key[key]
+
+    if written:
+        try:
+            await _write_alerts(written)
+        except Exception as e:
+            traceback.print_exc()
+            for uid in written:
+                fail(pending[uid][0], e)
+
+    failed = sum(r["status"] == "error" for r in results)
+    return {
+        "status": "scan_completed",
+        "scanned": len(results) - failed,
+        "failed": failed,
+        "unique": len(requests),
+        "results": results,
+    }
+
+
 @app.get("/alerts/{uid}")
-def get_alerts(uid: str):
-    data = db.reference(f"alerts/{uid}").get()
+@timed("get_alerts")
+async def get_alerts(uid: str):
+    cache = get_alerts_cache()
+
+    with span("alerts_cache"):
+        alerts = await cache.get(uid)
+    if alerts is not None:
+        return {"alerts": alerts}
+
+    async def read():
+        with span("rtdb_read"):
+            data = await get_rtdb().get(f"alerts/{uid}")
+        alerts = []
+        if data and isinstance(data, dict):
+            alerts = data.get("alerts", [])
+            if not isinstance(alerts, list):
+                alerts = []
+        return alerts
+
+    # not filled if a scan writes alerts/{uid} while this read is in flight
+    return {"alerts": await cache.fill(uid, read)}
+
+
+@app.get("/cache/stats")
+def cache_stats():
+    return {"alerts": get_alerts_cache().stats(), "scans": get_scan_cache().stats()}
+
 
-    if not data or not isinstance(data, dict):
-        return {"alerts": []}
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(timing.render(), media_type="text/plain; version=0.0.4")
 
-    alerts = data.get("alerts", [])
-    if not isinstance(alerts, list):
-        return {"alerts": []}
 
-    return {"alerts": alerts}
+@app.get("/kb/version")
+def kb_version():
+    reloader = get_reloader()
+    if reloader is None:
+        return {"version": None, "reload": False}
+    return {"version": reloader.version, "source": reloader.source, "reload": True, **reloader.stats}
 
 
 
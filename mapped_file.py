@@ -0,0 +1,95 @@
+import mmap
+import os
+import struct
+import sys
+
+# The little-endian file layout shared by alert_table.py and kb_snapshot.py:
+#
+#   header      a struct of magic, version and section sizes, padded to 8
+#   sections    fixed-width arrays, in an order each format defines
+#   pool        UTF-8 bytes, every distinct string once, addressed by a
+#               uint32[strings + 1] offsets section
+#
+# Files are written to a temporary name and renamed into place, so a
+# reader never maps a half-written file. Readers mmap the file and cast
+# each section in place; strings are decoded on first use.
+
+if sys.byteorder != "little":
+    raise ImportError("mapped files assume a little-endian host")
+
+
+class StringPool:
+    """Builder side: one id per distinct string, in first-use order."""
+
+    def __init__(self):
+        self.ids = {}
+        self.strings = []
+
+    def __len__(self):
+        return len(self.strings)
+
+    def sid(self, text):
+        i = self.ids.get(text)
+        if i is None:
+            i = self.ids[text] = len(self.strings)
+            self.strings.append(text)
+        return i
+
+    def pack(self):
+        """(offsets, blob) for the offsets section and the pool."""
+        blob = bytearray()
+        offsets = [0]
+        for s in self.strings:
+            blob += s.encode()
+            offsets.append(len(blob))
+        return offsets, blob
+
+
+def write_file(path, header, sections, pool):
+    """header bytes, then each (struct code, values) section, then the pool."""
+    out = bytearray(header)
+    out += b"\0" * (-len(out) % 8)
+    for code, values in sections:
+        out += struct.pack(f"<{len(values)}{code}", *values)
+    out += pool
+
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(out)
+    os.replace(tmp, path)
+    return path
+
+
+class MappedFile:
+    """Reader side: the header's fields, then take() each section in order."""
+
+    def __init__(self, path, header):
+        with open(path, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.mm)
+        self.fields = header.unpack_from(self.view)
+        self.pos = header.size + (-header.size % 8)
+
+    def take(self, code, count):
+        size = struct.calcsize(code)
+        section = self.view[self.pos:self.pos + count * size].cast(code)
+        self.pos += count * size
+        return section
+
+    def rest(self):
+        return self.view[self.pos:]
+
+
+class MappedStrings:
+    """The string pool; each string is decoded (and interned) once, on first use."""
+
+    def __init__(self, pool, offsets):
+        self.pool = pool
+        self.offsets = offsets
+        self.decoded = [None] * (len(offsets) - 1)
+
+    def __getitem__(self, i):
+        s = self.decoded[i]
+        if s is None:
+            s = self.decoded[i] = sys.intern(str(self.pool[self.offsets[i]:self.offsets[i + 1]], "utf-8"))
+        return s
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import Any, Optional
 
 class ScanRequest(BaseModel):
     district: str
@@ -20,3 +20,17 @@ class PestAlert(BaseModel):
 
 class PestResponse(BaseModel):
     alerts: list[PestAlert]
+
+
+class BatchScanItem(BaseModel):
+    uid: str
+    request: ScanRequest
+
+
+class BatchScanRequest(BaseModel):
+    # each item is a BatchScanItem, validated per item so one bad item fails alone
+    items: list[dict[str, Any]] = Field(json_schema_extra={"examples": [[
+        {"uid": "farmer123", "request": {"district": "Mandya", "soilType": "red soil",
+                                         "primaryCrop": "paddy", "secondaryCrop": "sugarcane",
+                                         "language": "kn"}},
+    ]]})
@@ -0,0 +1,222 @@
+import re
+
+from kb_utils import norm_key
+
+# Free-text district and crop names from the app -> KB keys.
+#
+# Resolution, first hit wins:
+#   1. the exact key after norm_key ("Bengaluru Rural")
+#   2. a known alias, or the key written without spaces ("arecanut")
+#   3. each part of a compound entry ("Ragi/finger millet", "Paddy (rice)")
+#   4. word aliases and plurals ("Bangalore rural", "tomatoes")
+#   5. trigram similarity against every key and alias, accepted only at
+#      MIN_SIMILARITY or above and MIN_MARGIN ahead of the next key
+#
+# Each distinct raw string is resolved once and memoized (misses too), so
+# a repeat request costs one dict probe. Fuzzy lookups are bounded by
+# MAX_FUZZY_LEN characters of input against a KB-sized candidate list.
+# Aliases whose target is not a key of the current KB are ignored.
+
+MEMO_SIZE = 4096
+MIN_SIMILARITY = 0.55
+MIN_MARGIN = 0.1
+MAX_FUZZY_LEN = 48
+
+DISTRICT_ALIASES = {
+    "bangalore": "bengaluru urban",
+    "bengaluru": "bengaluru urban",
+    "bangalore city": "bengaluru urban",
+    "bengaluru city": "bengaluru urban",
+    "coorg": "kodagu",
+    "madikeri": "kodagu",
+    "mangalore": "dakshina kannada",
+    "mangaluru": "dakshina kannada",
+    "south canara": "dakshina kannada",
+    "south kanara": "dakshina kannada",
+    "dakshin kannada": "dakshina kannada",
+    "karwar": "uttara kannada",
+    "north canara": "uttara kannada",
+    "north kanara": "uttara kannada",
+    "uttar kannada": "uttara kannada",
+    "hospet": "vijayanagara",
+    "hosapete": "vijayanagara",
+    "hubli": "dharwad",
+    "hubballi": "dharwad",
+    "hubli dharwad": "dharwad",
+}
+
+DISTRICT_WORDS = {
+    "bangalore": "bengaluru",
+    "bengalooru": "bengaluru",
+    "mysore": "mysuru",
+    "belgaum": "belagavi",
+    "bellary": "ballari",
+    "gulbarga": "kalaburagi",
+    "kalburgi": "kalaburagi",
+    "shimoga": "shivamogga",
+    "tumkur": "tumakuru",
+    "bijapur": "vijayapura",
+    "chikmagalur": "chikkamagaluru",
+    "chikkamagalur": "chikkamagaluru",
+    "davangere": "davanagere",
+    "chamrajnagar": "chamarajanagar",
+    "chamarajnagar": "chamarajanagar",
+    "chikballapur": "chikkaballapur",
+    "chickballapur": "chikkaballapur",
+    "ramanagar": "ramanagara",
+    "ramnagar": "ramanagara",
+    "bagalkote": "bagalkot",
+    "yadgiri": "yadgir",
+    "yadagiri": "yadgir",
+    "hassana": "hassan",
+}
+
+CROP_ALIASES = {
+    "rice": "paddy",
+    "paddy rice": "paddy",
+    "finger millet": "ragi",
+    "nachni": "ragi",
+    "corn": "maize",
+    "makka": "maize",
+    "makai": "maize",
+    "peanut": "groundnut",
+    "chili": "chilli",
+    "chilly": "chilli",
+    "mirchi": "chilli",
+    "red chilli": "chilli",
+    "green chilli": "chilli",
+    "supari": "areca nut",
+    "areca": "areca nut",
+    "betel nut": "areca nut",
+    "black pepper": "pepper",
+    "haldi": "turmeric",
+    "arishina": "turmeric",
+    "adrak": "ginger",
+    "anar": "pomegranate",
+    "kabbu": "sugarcane",
+    "tamatar": "tomato",
+    "aloo": "potato",
+    "eerulli": "onion",
+    "plantain": "banana",
+    "grape": "grapes",
+    "chickpea": "bengal gram",
+    "chana": "bengal gram",
+    "tur": "pigeon pea",
+    "toor": "pigeon pea",
+    "arhar": "pigeon pea",
+    "togari": "pigeon pea",
+    "soya": "soybean",
+    "soyabean": "soybean",
+    "jola": "jowar",
+    "great millet": "sorghum",
+    "elaichi": "cardamom",
+    "elakki": "cardamom",
+}
+
+_PARTS = re.compile(r"[/,;&()+|]| or | and ")
+
+
+def trigrams(text):
+    text = f"  {text} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class NameIndex:
+    """Resolves raw names to one KB field's keys (see module comment)."""
+
+    def __init__(self, keys, aliases=None, words=None):
+        self.keys = frozenset(keys)
+        self.aliases = {a: k for a, k in (aliases or {}).items() if k in self.keys}
+        self.words = dict(words or {})
+        for key in self.keys:
+            self.aliases.setdefault(key.replace(" ", ""), key)
+
+        # every spelling we know, for the fuzzy pass
+        self.spellings = sorted(self.keys | set(self.aliases))
+        self.target = {s: self.aliases.get(s, s) for s in self.spellings}
+        self.grams = [trigrams(s) for s in self.spellings]
+        self.postings = {}
+        for i, grams in enumerate(self.grams):
+            for g in grams:
+                self.postings.setdefault(g, []).append(i)
+
+        self.memo = {}
+
+    def resolve(self, raw):
+        """The KB key for `raw`, or None."""
+        try:
+            return self.memo[raw]
+        except KeyError:
+            pass
+        key = self._resolve(norm_key(raw))
+        if len(self.memo) < MEMO_SIZE:
+            self.memo[raw] = key
+        return key
+
+    def _direct(self, name):
+        if name in self.keys:
+            return name
+        key = self.aliases.get(name) or self.aliases.get(name.replace(" ", ""))
+        if key:
+            return key
+        reworded = " ".join(self.words.get(w, w) for w in name.split())
+        for form in (reworded, reworded + "s", reworded[:-1], reworded[:-2]):
+            if form in self.keys:
+                return form
+            if form in self.aliases:
+                return self.aliases[form]
+        return None
+
+    def _resolve(self, name):
+        if not name:
+            return None
+        key = self._direct(name)
+        if key:
+            return key
+        parts = [p.strip() for p in _PARTS.split(name)]
+        if len(parts) > 1:
+            for part in parts:
+                key = part and self._direct(part)
+                if key:
+                    return key
+        return self._fuzzy(name[:MAX_FUZZY_LEN])
+
+    def _fuzzy(self, name):
+        query = trigrams(name)
+        overlap = {}
+        for g in query:
+            for i in self.postings.get(g, ()):
+                overlap[i] = overlap.get(i, 0) + 1
+
+        best = {}     # key -> best Dice score over its spellings
+        for i, shared in overlap.items():
+            score = 2 * shared / (len(query) + len(self.grams[i]))
+            key = self.target[self.spellings[i]]
+            if score > best.get(key, 0):
+                best[key] = score
+        if not best:
+            return None
+
+        ranked = sorted(best.items(), key=lambda kv: -kv[1])
+        key, score = ranked[0]
+        runner_up = ranked[1][1] if len(ranked) > 1 else 0
+        if score >= MIN_SIMILARITY and score - runner_up >= MIN_MARGIN:
+            return key
+        return None
+
+
+class KBNames:
+    """District and crop resolvers over one engine's keys."""
+
+    def __init__(self, crops, history):
+        self.districts = NameIndex(history.districts, DISTRICT_ALIASES, DISTRICT_WORDS)
+        self.crops = NameIndex(set(crops) | {c for _, c, _ in history.entries}, CROP_ALIASES)
+
+    def district(self, raw):
+        """KB district key for `raw`; the plain normalized name if nothing matches."""
+        key = self.districts.resolve(raw)
+        return key if key is not None else norm_key(raw)
+
+    def crop(self, raw):
+        key = self.crops.resolve(raw)
+        return key if key is not None else norm_key(raw)
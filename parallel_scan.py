@@ -0,0 +1,87 @@
+import multiprocessing
+import os
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from kb_snapshot import build_snapshot, load_snapshot
+from pest_batch import BatchScorer
+from pest_engine import set_engine
+
+# Shards farmers across a process pool for bulk rescans.
+#
+# Rule evaluation is CPU-bound, so one process uses one core. Each worker
+# loads the compiled KB once from a shared snapshot (see kb_snapshot.py)
+# and keeps its own BatchScorer. Farmers go out in chunks and results come
+# back in input order; at most a few chunks per worker are in flight, so
+# memory stays bounded for any input length. scan_many() splits a list
+# shorter than workers x chunk_size evenly over the workers, so a single
+# bulk_scan page still keeps every worker busy.
+
+_scorer = None
+
+
+def _init_worker(snapshot_path):
+    global _scorer
+    engine = load_snapshot(snapshot_path)
+    set_engine(engine)
+    _scorer = BatchScorer(engine)
+
+
+def _score_chunk(farmers):
+    return _scorer.scan_many(farmers)
+
+
+class ParallelScanner:
+
+    def __init__(self, workers=None, snapshot_path=None, chunk_size=2000, mp_context="spawn"):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+
+        self._tmpdir = None
+        if snapshot_path is None:
+            self._tmpdir = tempfile.TemporaryDirectory(prefix="kb-snapshot-")
+            snapshot_path = build_snapshot(os.path.join(self._tmpdir.name, "kb.bin"))
+        self.snapshot_path = snapshot_path
+
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context(mp_context),
+            initializer=_init_worker,
+            initargs=(snapshot_path,),
+        )
+
+    def scan(self, farmers, chunk_size=None):
+        """Yield each farmer's alert list, in input order."""
+        chunk_size = chunk_size or self.chunk_size
+        farmers = iter(farmers)
+        window = 2 * self.workers
+        pending = deque()
+
+        while True:
+            while len(pending) < window:
+                chunk = list(islice(farmers, chunk_size))
+                if not chunk:
+                    break
+                pending.append(self._pool.submit(_score_chunk, chunk))
+            if not pending:
+                return
+            yield from pending.popleft().result()
+
+    def scan_many(self, farmers):
+        farmers = list(farmers)
+        per_worker = -(-len(farmers) // self.workers)
+        return list(self.scan(farmers, max(1, min(self.chunk_size, per_worker))))
+
+    def close(self):
+        self._pool.shutdown()
+        if self._tmpdir is not None:
+            self._tmpdir.cleanup()
+            self._tmpdir = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,138 @@
+import numpy as np
+from datetime import date
+
+from pest_engine import get_engine
+
+
+class BatchScorer:
+    """
+    Scores many farmers against every compiled rule of a PestEngine in one
+    vectorized pass. Each farmer is a dict shaped like the farmer context:
+
+        {"district", "soilType", "crops", "month"?, "stage"?,
+         "temp"?, "humidity"?, "rainfall"?}
+
+    Missing weather values are not held against a rule, exactly as in
+    PestEngine.scan, so scan_many() returns the same alerts as the
+    per-farmer path.
+    """
+
+    def __init__(self, engine=None):
+        self.engine = engine = engine or get_engine()
+        self.rules = [r for rules in engine.rules_by_crop.values() for r in rules]
+
+        self.crop_index = {crop: i for i, crop in enumerate(engine.rules_by_crop)}
+        self.crop_slices = {}
+        start = 0
+        for crop, rules in engine.rules_by_crop.items():
+            self.crop_slices[crop] = (start, start + len(rules))
+            start += len(rules)
+
+        rules = self.rules
+        self.rule_crop = np.array([self.crop_index[r.crop] for r in rules], dtype=np.intp)
+        self.temp = np.array([[r.temp_lo, r.temp_hi] for r in rules], dtype=np.float64).T
+        self.hum = np.array([[r.hum_lo, r.hum_hi] for r in rules], dtype=np.float64).T
+        self.rain = np.array([[r.rain_lo, r.rain_hi] for r in rules], dtype=np.float64).T
+        self.months = np.array([r.months for r in rules], dtype=np.int64)
+
+        self.soils = np.array([r.soils for r in rules], dtype=np.int64)
+        self.stages = np.array([r.stages for r in rules], dtype=np.int64)
+
+    def _codes(self, values, index):
+        # raw app strings repeat a lot, so resolve each distinct one once
+        missing = len(index)
+        resolve = self.engine.names.crop
+        memo = {v: index.get(resolve(v), missing) for v in set(values)}
+        return np.fromiter(map(memo.__getitem__, values), dtype=np.intp, count=len(values))
+
+    @staticmethod
+    def _bits(values, vocab):
+        memo = {v: vocab.bit(v) for v in set(values)}
+        return np.fromiter(map(memo.__getitem__, values), dtype=np.int64, count=len(values))
+
+    @staticmethod
+    def _column(farmers, key):
+        return np.array([f.get(key) for f in farmers], dtype=np.float64)   # None -> nan
+
+    @staticmethod
+    def _within(x, bounds):
+        lo, hi = bounds
+        x = x[:, None]
+        return np.isnan(x) | ((x >= lo) & (x <= hi))
+
+    def pack(self, farmers):
+        """Columnar encoding of a list of farmer dicts (the only Python loop)."""
+        today = date.today().month
+        rows, crops = [], []
+        for i, f in enumerate(farmers):
+            for c in f.get("crops") or ():
+                rows.append(i)
+                crops.append(c)
+        return {
+            "n": len(farmers),
+            "month": np.array([f.get("month") or today for f in farmers], dtype=np.int64),
+            "crop_rows": np.array(rows, dtype=np.intp),
+            "crop_codes": self._codes(crops, self.crop_index),
+            "soil": self._bits([f.get("soilType") for f in farmers], self.engine.soil_vocab),
+            "stage": self._bits([f.get("stage") for f in farmers], self.engine.stage_vocab),
+            "temp": self._column(farmers, "temp"),
+            "humidity": self._column(farmers, "humidity"),
+            "rainfall": self._column(farmers, "rainfall"),
+        }
+
+    def score(self, packed):
+        """Boolean farmers x rules hit matrix for a pack()-ed batch."""
+        hits = (self.months[None, :] & np.left_shift(1, packed["month"])[:, None]) != 0
+
+        crops = np.zeros((packed["n"], len(self.crop_index) + 1), dtype=bool)
+        crops[packed["crop_rows"], packed["crop_codes"]] = True
+        hits &= crops[:, self.rule_crop]
+
+        hits &= (self.soils[None, :] & packed["soil"][:, None]) != 0
+        hits &= (self.stages[None, :] & packed["stage"][:, None]) != 0
+
+        hits &= self._within(packed["temp"], self.temp)
+        hits &= self._within(packed["humidity"], self.hum)
+        hits &= self._within(packed["rainfall"], self.rain)
+        return hits
+
+    def scan_many(self, farmers):
+        """One alert list per farmer, in input order."""
+        hits = self.score(self.pack(farmers))
+        today = date.today().month
+        engine, rules, slices = self.engine, self.rules, self.crop_slices
+        names = engine.names
+
+        # only farmers with at least one hit need Python-level work
+        by_farmer = {}
+        for i, r in zip(*(a.tolist() for a in np.nonzero(hits))):
+            by_farmer.setdefault(i, []).append(r)
+
+        results = [[] for _ in farmers]
+        for i, cols in by_farmer.items():
+            f = farmers[i]
+            alerts = results[i]
+            district = names.district(f["district"]) if f.get("district") else None
+            month_bit = 1 << (f.get("month") or today)
+            for crop in f["crops"]:
+                start, end = slices.get(names.crop(crop), (0, 0))
+                for r in cols:
+                    if start <= r < end:
+                        alerts.append(engine.make_alert(district, rules[r], month_bit))
+        return results
+
+
+_batch = None
+
+
+def get_batch():
+    """BatchScorer for the current shared engine (rebuilt if it was swapped)."""
+    global _batch
+    engine = get_engine()
+    if _batch is None or _batch.engine is not engine:
+        _batch = BatchScorer(engine)
+    return _batch
+
+
+def batch_scan(farmers):
+    return get_batch().scan_many(farmers)
@@ -1,19 +1,186 @@
-def run_scan(district, soil, primary, secondary, lang):
-
-    crops = [primary]
-    if secondary:
-        crops.append(secondary)
-
-    alerts = []
-
-    for crop in crops:
-        alerts.append({
-            "crop": crop,
-            "pest": "Root Grub",
-            "risk": "High",
-            "symptoms": "Wilting, yellow leaves",
-            "preventive": "Proper drainage",
-            "treatment": "Chlorpyrifos soil application"
-        })
-
-    return alerts
+import math
+import os
+import sys
+from datetime import date
+
+from alert_table import get_alert_table
+from history_index import HistoryIndex, get_history_index
+from kb_utils import ALL_MONTHS, ANY, DEFAULT_RISK, BitVocab, month_mask, norm_key
+from name_index import KBNames
+from timing import timed
+from weather_store import get_weather_store
+
+INF = math.inf
+
+
+def _bounds(entry, range_key, gt_key, lt_key):
+    lo, hi = -INF, INF
+    if range_key in entry:
+        lo, hi = entry[range_key]
+    if gt_key in entry:
+        lo = math.nextafter(entry[gt_key], INF)      # strict ">"
+    if lt_key in entry:
+        hi = math.nextafter(entry[lt_key], -INF)     # strict "<"
+    return float(lo), float(hi)
+
+
+class Rule:
+    """One PEST_DB entry compiled into flat, pre-validated bounds and bitmasks."""
+
+    __slots__ = (
+        "crop", "pest",
+        "temp_lo", "temp_hi", "hum_lo", "hum_hi", "rain_lo", "rain_hi",
+        "months", "stages", "soils",
+        "symptoms", "preventive", "corrective",
+    )
+
+    def __init__(self, crop, pest, entry, soil_vocab, stage_vocab):
+        self.crop = sys.intern(crop)
+        self.pest = sys.intern(pest)
+        self.temp_lo, self.temp_hi = _bounds(entry, "temp_range", "temp_gt", "temp_lt")
+        self.hum_lo, self.hum_hi = _bounds(entry, "humidity_range", "humidity_gt", "humidity_lt")
+        self.rain_lo, self.rain_hi = _bounds(entry, "rainfall_range", "rainfall_gt", "rainfall_lt")
+
+        if self.temp_lo > self.temp_hi or self.hum_lo > self.hum_hi or self.rain_lo > self.rain_hi:
+            raise ValueError(f"Empty threshold range in PEST_DB[{crop!r}][{pest!r}]")
+
+        # empty list in the KB means "no restriction"
+        self.months = month_mask(entry.get("season")) or ALL_MONTHS
+        self.stages = stage_vocab.mask(entry.get("stage"))
+        self.soils = soil_vocab.mask(entry.get("soil"))
+
+        self.symptoms = entry.get("symptoms", "")
+        self.preventive = entry.get("preventive", "")
+        self.corrective = entry.get("corrective", "")
+
+
+class PestEngine:
+
+    def __init__(self, pest_db=None, history=None):
+        if pest_db is None:
+            from pest_db_extended import PEST_DB as pest_db
+        if history is None:
+            history = get_history_index()
+        elif not isinstance(history, HistoryIndex):
+            history = HistoryIndex(history)
+        self.history = history
+
+        entries = [e for pests in pest_db.values() for e in pests.values()]
+        self.soil_vocab = BitVocab(s for e in entries for s in e.get("soil", ()))
+        self.stage_vocab = BitVocab(s for e in entries for s in e.get("stage", ()))
+
+        self.rules_by_crop = {
+            norm_key(crop): tuple(
+                Rule(norm_key(crop), pest, entry, self.soil_vocab, self.stage_vocab)
+                for pest, entry in pests.items()
+            )
+            for crop, pests in pest_db.items()
+        }
+        self.names = KBNames(self.rules_by_crop, self.history)
+
+    @classmethod
+    def from_parts(cls, rules_by_crop, soil_vocab, stage_vocab, history):
+        """An engine over already-compiled rules (see kb_snapshot.load_snapshot)."""
+        engine = cls.__new__(cls)
+        engine.history = history
+        engine.soil_vocab = soil_vocab
+        engine.stage_vocab = stage_vocab
+        engine.rules_by_crop = rules_by_crop
+        engine.names = KBNames(rules_by_crop, history)
+        return engine
+
+    @staticmethod
+    def evaluate_rule(rule, month_bit, soil_bit=ANY, stage_bit=ANY,
+                      temp=None, humidity=None, rainfall=None):
+        """
+        Categorical conditions are bits from the engine's vocabularies
+        (ANY when not given); unknown weather (None) is not held against
+        the rule.
+        """
+        if not (rule.months & month_bit and rule.soils & soil_bit and rule.stages & stage_bit):
+            return False
+        if temp is not None and not rule.temp_lo <= temp <= rule.temp_hi:
+            return False
+        if humidity is not None and not rule.hum_lo <= humidity <= rule.hum_hi:
+            return False
+        if rainfall is not None and not rule.rain_lo <= rainfall <= rule.rain_hi:
+            return False
+        return True
+
+    def risk_for(self, district, rule, month_bit):
+        hist = self.history.entries.get((district, rule.crop, rule.pest))
+        if hist is None:
+            return DEFAULT_RISK
+        return "High" if hist.peak & month_bit else hist.risk
+
+    def make_alert(self, district, rule, month_bit):
+        return {
+            "crop": rule.crop,
+            "pest": rule.pest,
+            "risk": self.risk_for(district, rule, month_bit),
+            "symptoms": rule.symptoms,
+            "preventive": rule.preventive,
+            "treatment": rule.corrective,
+        }
+
+    def scan(self, district, soil, crops, month=None, stage=None,
+             temp=None, humidity=None, rainfall=None):
+        month_bit = 1 << (month or date.today().month)
+        district = self.names.district(district) if district else None
+        soil_bit = self.soil_vocab.bit(soil)
+        stage_bit = self.stage_vocab.bit(stage)
+
+        alerts = []
+        for crop in crops:
+            crop = self.names.crop(crop)
+            for rule in self.rules_by_crop.get(crop, ()):
+                if not self.evaluate_rule(rule, month_bit, soil_bit, stage_bit, temp, humidity, rainfall):
+                    continue
+                alerts.append(self.make_alert(district, rule, month_bit))
+        return alerts
+
+
+_engine = None
+
+
+def get_engine():
+    """
+    The shared engine, built on first use: mapped from the snapshot at
+    KB_SNAPSHOT_PATH when set, else compiled from PEST_DB/PEST_HISTORY.
+    """
+    global _engine
+    if _engine is None:
+        path = os.getenv("KB_SNAPSHOT_PATH")
+        if path:
+            from kb_snapshot import load_snapshot
+            _engine = load_snapshot(path)
+        else:
+            _engine = PestEngine()
+    return _engine
+
+
+def set_engine(engine):
+    """Install a different compiled engine (e.g. one loaded from a snapshot)."""
+    global _engine
+    _engine = engine
+
+
+@timed("rules")
+def run_scan(district, soil, primary, secondary, lang, month=None, **conditions):
+
+    # app spellings ("Bangalore rural", "Ragi/finger millet") -> KB keys
+    engine = get_engine()
+    district = engine.names.district(district) if district else district
+    crops = [engine.names.crop(primary)]
+    if secondary:
+        crops.append(engine.names.crop(secondary))
+
+    # weather not supplied by the caller comes from the district's latest day
+    conditions = {**get_weather_store().conditions(district), **conditions}
+
+    # the precomputed table answers everything but growth-stage filters
+    table = get_alert_table()
+    if table is not None and conditions.get("stage") is None:
+        conditions.pop("stage", None)
+        return table.scan(district, soil, crops, month=month, **conditions)
+    return engine.scan(district, soil, crops, month=month, **conditions)
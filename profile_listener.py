@@ -0,0 +1,206 @@
+import argparse
+import asyncio
+import time
+
+import aiohttp
+
+from alerts_cache import invalidate_written
+from crop_summary import merge_updates, summary_updates
+from firebase_async import RTDBError, get_rtdb
+from firebase_reader import get_farmer_context_async
+from pest_engine import get_engine
+from weather_store import get_weather_store
+
+# Long-running worker that rescans farmers when their profile changes.
+#
+# It follows the Users/ change stream. Events that touch a farmer's
+# district, soilType or farmActivityLogs mark that uid dirty; anything
+# else (name, phone, derived nodes) is ignored. A dirty uid is rescanned
+# once it has been quiet for `debounce` seconds, or at the latest
+# `max_delay` seconds after its first edit, so a burst of edits costs one
+# scan. Due farmers are read concurrently and their alerts are written
+# back in one multi-path update per batch, then dropped from the API's
+# alerts cache if it is shared (see alerts_cache.py).
+#
+# The same events keep each farmer's derived cropSummary in step with
+# farmActivityLogs (see crop_summary.py). Summary writes go out on every
+# tick, ahead of any rescan, so a rescan always reads a current summary.
+#
+# The initial snapshot the stream sends on (re)connect is skipped: edits
+# made while disconnected are picked up by the nightly bulk_scan.
+
+RELEVANT = frozenset(("district", "soilType", "farmActivityLogs"))
+
+
+def touched_uids(event, path, data):
+    """uids whose scan inputs a put/patch on Users/ may have changed."""
+    parts = [p for p in path.split("/") if p]
+
+    if not parts:
+        if not isinstance(data, dict):
+            return
+        for key in data:
+            key_parts = key.strip("/").split("/")
+            # a put here replaces every user; a patch lists "uid" or "uid/field/..." keys
+            if event == "put" or len(key_parts) == 1 or key_parts[1] in RELEVANT:
+                yield key_parts[0]
+        return
+
+    uid = parts[0]
+    if len(parts) > 1:
+        if parts[1] in RELEVANT:
+            yield uid
+    elif event == "put" or not isinstance(data, dict):
+        yield uid
+    elif any(k.strip("/").split("/")[0] in RELEVANT for k in data):
+        yield uid
+
+
+class ProfileListener:
+
+    def __init__(self, rtdb=None, path="Users", debounce=2.0, max_delay=10.0,
+                 batch_size=500, concurrency=50):
+        self.rtdb = rtdb or get_rtdb()
+        self.path = path
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+
+        self.pending = {}        # uid -> [first edit, last edit] (monotonic)
+        self.summaries = {}      # pending cropSummary writes, relative to `path`
+        self.stats = dict.fromkeys(
+            ("events", "ignored", "queued", "coalesced", "rescanned", "written", "skipped",
+             "summaries", "errors"), 0)
+
+    # ------------------------- events -------------------------
+
+    def on_event(self, event, path, data):
+        self.stats["events"] += 1
+        now = time.monotonic()
+        touched = False
+        for uid in touched_uids(event, path, data):
+            touched = True
+            seen = self.pending.get(uid)
+            if seen is None:
+                self.pending[uid] = [now, now]
+                self.stats["queued"] += 1
+            else:
+                seen[1] = now
+                self.stats["coalesced"] += 1
+        if not touched:
+            self.stats["ignored"] += 1
+            return
+        merge_updates(self.summaries, summary_updates(event, path, data))
+
+    def due(self, now=None):
+        now = time.monotonic() if now is None else now
+        return [
+            uid for uid, (first, last) in self.pending.items()
+            if now - last >= self.debounce or now - first >= self.max_delay
+        ]
+
+    # ------------------------- rescans -------------------------
+
+    async def rescan(self, uids):
+        engine, weather = get_engine(), get_weather_store()
+        sem = asyncio.Semaphore(self.concurrency)
+
+        async def read(uid):
+            async with sem:
+                try:
+                    return uid, await get_farmer_context_async(uid, self.rtdb)
+                except (ValueError, AttributeError):
+                    return uid, None
+
+        updates = {}
+        for uid, ctx in await asyncio.gather(*map(read, uids)):
+            if ctx is None:
+                self.stats["skipped"] += 1
+                continue
+            alerts = engine.scan(ctx["district"], ctx["soilType"], ctx["crops"],
+                                 **weather.conditions(engine.names.district(ctx["district"])))
+            updates[f"alerts/{uid}"] = {"alerts": alerts}
+
+        self.stats["rescanned"] += len(uids)
+        if updates:
+            await self.rtdb.update("", updates)
+            self.stats["written"] += len(updates)
+            await invalidate_written([uid for uid in uids if f"alerts/{uid}" in updates])
+
+    async def flush(self, uids):
+        for i in range(0, len(uids), self.batch_size):
+            batch = uids[i:i + self.batch_size]
+            for uid in batch:
+                self.pending.pop(uid, None)
+            try:
+                await self.rescan(batch)
+            except Exception as e:
+                self.stats["errors"] += 1
+                print(f"⚠️ rescan of {len(batch)} farmers failed: {e}")
+                # retry them after another debounce period
+                now = time.monotonic()
+                for uid in batch:
+                    self.pending.setdefault(uid, [now, now])
+
+    async def write_summaries(self):
+        if not self.summaries:
+            return
+        updates, self.summaries = self.summaries, {}
+        try:
+            await self.rtdb.update(self.path, updates)
+            self.stats["summaries"] += len(updates)
+        except Exception as e:
+            self.stats["errors"] += 1
+            print(f"⚠️ cropSummary update failed: {e}")
+            # anything written for these paths since takes precedence
+            self.summaries = merge_updates(updates, self.summaries)
+
+    async def drain(self):
+        """Rescan everything still pending, due or not."""
+        await self.write_summaries()
+        await self.flush(list(self.pending))
+
+    # ------------------------- loops -------------------------
+
+    async def listen(self):
+        backoff = 1
+        while True:
+            try:
+                async for event, path, data in self.rtdb.stream(self.path, skip_initial=True):
+                    self.on_event(event, path, data)
+                    backoff = 1
+            except (RTDBError, aiohttp.ClientError, OSError, asyncio.TimeoutError) as e:
+                print(f"⚠️ stream dropped ({e}); reconnecting in {backoff}s")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 60)
+
+    async def pump(self):
+        tick = min(self.debounce, self.max_delay) / 4 or 0.05
+        while True:
+            await asyncio.sleep(tick)
+            await self.write_summaries()
+            uids = self.due()
+            if uids:
+                await self.flush(uids)
+
+    async def run(self):
+        await asyncio.gather(self.listen(), self.pump())
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Rescan farmers when their profile changes")
+    ap.add_argument("--debounce", type=float, default=2.0)
+    ap.add_argument("--max-delay", type=float, default=10.0)
+    ap.add_argument("--batch-size", type=int, default=500)
+    args = ap.parse_args()
+
+    async def main():
+        listener = ProfileListener(debounce=args.debounce, max_delay=args.max_delay,
+                                   batch_size=args.batch_size)
+        try:
+            await listener.run()
+        finally:
+            await get_rtdb().aclose()
+
+    asyncio.run(main())
@@ -0,0 +1,153 @@
+import time
+from datetime import date
+
+from alerts_cache import invalidate_written
+from firebase_async import get_rtdb
+from firebase_reader import extract_farmer_context
+from kb_utils import ANY
+from pest_engine import PestEngine, get_engine
+from weather_store import get_weather_store
+
+# Incremental rescoring on weather updates.
+#
+# A new day of weather for one district can only change alerts of farmers
+# in that district, and only for rules with weather thresholds. The
+# DependencyIndex maps (district, crop) -> farmer uids. On an update we
+# compare, per crop, which in-season rules pass the weather thresholds
+# before and after; crops with no change are skipped with all their
+# farmers. Affected farmers are rescored and only alerts that actually
+# differ are written, in one multi-path update.
+#
+# By then the new day is already in the store, so the next update's
+# before/after comparison would no longer see the change. Farmers whose
+# write failed are kept in `dirty` and rescored on every later update,
+# whatever its district, until their alerts are written.
+
+
+class DependencyIndex:
+
+    def __init__(self, names=None):
+        self.names = names or get_engine().names
+        self.farmers = {}      # uid -> farmer context
+        self.alerts = {}       # uid -> last alerts written
+        self.by_district = {}  # district -> crop -> {uid}
+
+    def __len__(self):
+        return len(self.farmers)
+
+    def add(self, uid, ctx, alerts=None):
+        self.remove(uid)
+        self.farmers[uid] = ctx
+        if alerts is not None:
+            self.alerts[uid] = alerts
+        crops = self.by_district.setdefault(self.names.district(ctx["district"]), {})
+        for crop in ctx["crops"]:
+            crops.setdefault(self.names.crop(crop), set()).add(uid)
+
+    def remove(self, uid):
+        ctx = self.farmers.pop(uid, None)
+        self.alerts.pop(uid, None)
+        if ctx is None:
+            return
+        crops = self.by_district.get(self.names.district(ctx["district"]), {})
+        for crop in ctx["crops"]:
+            uids = crops.get(self.names.crop(crop))
+            if uids is not None:
+                uids.discard(uid)
+                if not uids:
+                    del crops[self.names.crop(crop)]
+
+    def crops_in(self, district):
+        return self.by_district.get(district, {})
+
+    @classmethod
+    def from_users(cls, users, engine=None, weather=None):
+        """Index a Users/ dict, seeding each farmer with their current alerts."""
+        engine = engine or get_engine()
+        weather = weather or get_weather_store()
+        index = cls(engine.names)
+        for uid, user in users.items():
+            try:
+                ctx = extract_farmer_context(user)
+            except (ValueError, AttributeError):
+                continue
+            alerts = engine.scan(ctx["district"], ctx["soilType"], ctx["crops"],
+                                 **weather.conditions(engine.names.district(ctx["district"])))
+            index.add(uid, ctx, alerts)
+        return index
+
+
+def weather_pass(rules, month, conditions):
+    """Which rules pass this month's season and their weather thresholds (soil/stage ignored)."""
+    evaluate = PestEngine.evaluate_rule
+    month_bit = 1 << month
+    return tuple(evaluate(r, month_bit, ANY, ANY, **conditions) for r in rules)
+
+
+class IncrementalRescorer:
+
+    def __init__(self, index, engine=None, weather=None, rtdb=None):
+        self.index = index
+        self.engine = engine or get_engine()
+        self.weather = weather or get_weather_store()
+        self.rtdb = rtdb
+        self.scan_cost = None    # seconds per farmer, measured as we go
+        self.dirty = set()       # uids whose last alerts write failed
+
+    async def on_weather_update(self, district, day, temp, humidity, rainfall, month=None):
+        start = time.perf_counter()
+        district = self.engine.names.district(district)
+        month = month or date.today().month
+
+        before = self.weather.conditions(district)
+        self.weather.append(district, day, temp, humidity, rainfall)
+        after = self.weather.conditions(district)
+
+        affected = set()
+        for crop, uids in self.index.crops_in(district).items():
+            rules = self.engine.rules_by_crop.get(crop, ())
+            if weather_pass(rules, month, before) != weather_pass(rules, month, after):
+                affected.update(uids)
+
+        retry = {uid for uid in self.dirty - affected if uid in self.index.farmers}
+
+        scanned = affected | retry
+        scan_start = time.perf_counter()
+        changed = {}
+        for uid in scanned:
+            ctx = self.index.farmers[uid]
+            conditions = after if uid in affected else \
+                self.weather.conditions(self.engine.names.district(ctx["district"]))
+            alerts = self.engine.scan(ctx["district"], ctx["soilType"], ctx["crops"],
+                                      month=month, **conditions)
+            if alerts != self.index.alerts.get(uid):
+                changed[uid] = alerts
+        if scanned:
+            self.scan_cost = (time.perf_counter() - scan_start) / len(scanned)
+
+        if changed:
+            try:
+                await (self.rtdb or get_rtdb()).update(
+                    "", {f"alerts/{uid}": {"alerts": alerts} for uid, alerts in changed.items()})
+            except Exception:
+                self.dirty.update(changed)
+                raise
+            # only remembered once written, so unwritten alerts still differ next time
+            self.index.alerts.update(changed)
+            await invalidate_written(changed)
+        self.dirty = set()
+
+        elapsed = time.perf_counter() - start
+        total = len(self.index)
+        full = self.scan_cost * total if self.scan_cost else None
+        return {
+            "district": district,
+            "farmers": total,
+            "rescored": len(affected),
+            "retried": len(retry),
+            "written": len(changed),
+            "skipped": total - len(affected),
+            "elapsed": elapsed,
+            "full_rescan_estimate": full,
+            "saved": full - elapsed if full is not None else None,
+        }
@@ -0,0 +1,55 @@
+import os
+from datetime import date
+
+from kb_utils import norm_key
+from pest_engine import get_engine
+from ttl_cache import TTLCache
+from weather_store import get_weather_store
+
+# Memo of finished scans (engine output, translated if needed) keyed by
+# everything the result depends on: the resolved district and crops
+# (see name_index.py), the normalized soil, the month, the language, and
+# the district's current weather. Farmers who share those get the same
+# alert list, so scan_farmer only has to write it under their uid.
+#
+# The weather in the key means a new day of weather simply starts new
+# entries; old ones age out through the TTL and LRU bound.
+
+
+def scan_key(district, soil, primary, secondary, lang, month=None):
+    names = get_engine().names
+    district = names.district(district)
+    weather = get_weather_store().conditions(district)
+    crops = (primary, secondary) if secondary else (primary,)
+    return (
+        district,
+        norm_key(soil),
+        tuple(names.crop(c) for c in crops),
+        month or date.today().month,
+        lang,
+        weather.get("temp"),
+        weather.get("humidity"),
+        weather.get("rainfall"),
+    )
+
+
+_cache = None
+
+
+def new_scan_cache():
+    return TTLCache(
+        max_size=int(os.getenv("SCAN_CACHE_SIZE", "20000")),
+        ttl=float(os.getenv("SCAN_CACHE_TTL", "3600")),
+    )
+
+
+def get_scan_cache():
+    global _cache
+    if _cache is None:
+        _cache = new_scan_cache()
+    return _cache
+
+
+def set_scan_cache(cache):
+    global _cache
+    _cache = cache
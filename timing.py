@@ -0,0 +1,171 @@
+import asyncio
+import functools
+import os
+from bisect import bisect_left
+from contextvars import ContextVar
+from time import perf_counter
+
+# Latency per stage of the scan pipeline (memo lookup, Firebase reads,
+# rule evaluation, translation, alerts/{uid} write, ...).
+#
+#   with span("rtdb_write"): ...        time a block
+#   @timed("rules")                     time every call of a function
+#
+# Every span feeds a histogram per stage, served in Prometheus text
+# format by GET /metrics (render()). With SERVER_TIMING=1 the spans of
+# the current request are also collected and ServerTimingMiddleware
+# returns them in a Server-Timing header.
+#
+# SCAN_METRICS=0 turns it all off: span() hands back one shared no-op
+# object and timed() returns the function undecorated, so disabled
+# stages cost a function call at most. Histograms are per process; with
+# several uvicorn workers, scrape each one.
+
+ENABLED = os.getenv("SCAN_METRICS", "1") != "0"
+SERVER_TIMING = ENABLED and os.getenv("SERVER_TIMING", "0") == "1"
+
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+           0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+METRIC = "scan_stage_seconds"
+
+
+class Histogram:
+    __slots__ = ("counts", "sum")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)     # last slot is +Inf
+        self.sum = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.sum += seconds
+
+    @property
+    def count(self):
+        return sum(self.counts)
+
+
+_stages = {}                                   # stage -> Histogram
+_request = ContextVar("request_spans", default=None)
+
+
+def record(stage, seconds):
+    hist = _stages.get(stage)
+    if hist is None:
+        hist = _stages[stage] = Histogram()
+    hist.observe(seconds)
+    spans = _request.get()
+    if spans is not None:
+        spans.append((stage, seconds))
+
+
+class _Span:
+    __slots__ = ("stage", "start")
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.stage, perf_counter() - self.start)
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+NO_SPAN = _NoSpan()
+
+
+def span(stage):
+    return _Span(stage) if ENABLED else NO_SPAN
+
+
+def timed(stage):
+    def wrap(fn):
+        if not ENABLED:
+            return fn
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def timed_async(*args, **kwargs):
+                start = perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    record(stage, perf_counter() - start)
+            return timed_async
+
+        @functools.wraps(fn)
+        def timed_sync(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(stage, perf_counter() - start)
+        return timed_sync
+    return wrap
+
+
+def collect():
+    """Start collecting this request's spans; returns the list they go to."""
+    spans = []
+    _request.set(spans)
+    return spans
+
+
+def server_timing(spans):
+    """Server-Timing header value, one entry per stage, durations in ms."""
+    totals = {}
+    for stage, seconds in spans:
+        totals[stage] = totals.get(stage, 0.0) + seconds
+    return ", ".join(f"{stage};dur={seconds * 1e3:.3f}" for stage, seconds in totals.items())
+
+
+class ServerTimingMiddleware:
+    """ASGI middleware adding the request's spans as a Server-Timing header."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        spans = collect()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start" and spans:
+                headers = list(message.get("headers", ()))
+                headers.append((b"server-timing", server_timing(spans).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_timing)
+
+
+def render():
+    """All stage histograms in Prometheus text exposition format."""
+    lines = [
+        f"# HELP {METRIC} Time spent in each stage of the scan pipeline.",
+        f"# TYPE {METRIC} histogram",
+    ]
+    for stage, hist in sorted(_stages.items()):
+        cumulative = 0
+        for bound, n in zip(BUCKETS + ("+Inf",), hist.counts):
+            cumulative += n
+            lines.append(f'{METRIC}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+        lines.append(f'{METRIC}_sum{{stage="{stage}"}} {hist.sum}')
+        lines.append(f'{METRIC}_count{{stage="{stage}"}} {cumulative}')
+    return "\n".join(lines) + "\n"
+
+
+def reset():
+    _stages.clear()
@@ -0,0 +1,123 @@
+import hashlib
+import os
+import sqlite3
+import threading
+
+# Content-hash keyed translation cache persisted in SQLite.
+# The advisory texts in PEST_DB are a small fixed corpus, so once
+# translated (or prewarmed offline) scans serve them with no LLM call.
+
+DEFAULT_PATH = "translations.sqlite3"
+
+
+def content_key(text, lang):
+    return hashlib.sha256(f"{lang}\0{text}".encode("utf-8")).hexdigest()
+
+
+class TranslationCache:
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            " key TEXT PRIMARY KEY, lang TEXT NOT NULL,"
+            " source TEXT NOT NULL, translated TEXT NOT NULL)"
+        )
+        # the whole corpus is tiny: keep it in memory, SQLite is the durable copy
+        self._memory = dict(self._db.execute("SELECT key, translated FROM translations"))
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._memory)
+
+    def get(self, text, lang):
+        value = self._memory.get(content_key(text, lang))
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def put(self, text, lang, translated):
+        self.put_many([(text, translated)], lang)
+
+    def put_many(self, pairs, lang):
+        rows = [(content_key(src, lang), lang, src, dst) for src, dst in pairs]
+        with self._lock:
+            self._db.executemany("INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?)", rows)
+            for key, _, _, dst in rows:
+                self._memory[key] = dst
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._memory),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def close(self):
+        self._db.close()
+
+
+def pest_db_corpus():
+    from pest_db_extended import PEST_DB
+
+    texts = set()
+    for pests in PEST_DB.values():
+        for entry in pests.values():
+            for field in ("symptoms", "preventive", "corrective"):
+                if entry.get(field):
+                    texts.add(entry[field])
+    return sorted(texts)
+
+
+def prewarm(translate, lang="kn", cache=None):
+    """Translate every PEST_DB advisory text not yet cached. Returns (done, failed)."""
+    cache = cache or get_translation_cache()
+    done = failed = 0
+    for text in pest_db_corpus():
+        if cache.get(text, lang) is not None:
+            continue
+        try:
+            cache.put(text, lang, translate(text))
+            done += 1
+        except Exception as e:
+            print(f"⚠️ failed: {text[:60]!r}: {e}")
+            failed += 1
+    return done, failed
+
+
+_cache = None
+
+
+def get_translation_cache():
+    global _cache
+    if _cache is None:
+        _cache = TranslationCache(os.getenv("TRANSLATION_CACHE_PATH", DEFAULT_PATH))
+    return _cache
+
+
+def set_translation_cache(cache):
+    global _cache
+    _cache = cache
+
+
+if __name__ == "__main__":
+    import argparse
+
+    ap = argparse.ArgumentParser(description="Prewarm the translation cache for the PEST_DB corpus")
+    ap.add_argument("command", choices=["prewarm", "stats"])
+    args = ap.parse_args()
+
+    if args.command == "prewarm":
+        from translator import translate_uncached
+        done, failed = prewarm(translate_uncached)
+        print(f"✅ translated {done}, failed {failed}, cached {len(get_translation_cache())}")
+    else:
+        print(get_translation_cache().stats())
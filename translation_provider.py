@@ -0,0 +1,84 @@
+import asyncio
+import os
+import threading
+from abc import ABC, abstractmethod
+
+# One interface over the Gemini SDKs used for translation.
+# Nothing here imports an SDK or builds a client until the first
+# translation is actually requested, so importing main (or any
+# batch/test worker) stays cheap.
+
+MODEL = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
+
+
+class TranslationProvider(ABC):
+    """generate(prompt) -> str and its async twin agenerate(prompt) -> str."""
+
+    @abstractmethod
+    def generate(self, prompt: str) -> str:
+        ...
+
+    async def agenerate(self, prompt: str) -> str:
+        return await asyncio.to_thread(self.generate, prompt)
+
+
+class GenAIProvider(TranslationProvider):
+    """google-genai (`from google import genai`), with native async calls."""
+
+    def __init__(self, client=None, model=MODEL):
+        if client is None:
+            from google import genai
+            client = genai.Client()
+        self.client = client
+        self.model = model
+
+    def generate(self, prompt):
+        return self.client.models.generate_content(model=self.model, contents=prompt).text
+
+    async def agenerate(self, prompt):
+        res = await self.client.aio.models.generate_content(model=self.model, contents=prompt)
+        return res.text
+
+
+class LegacyGeminiProvider(TranslationProvider):
+    """google-generativeai, configured with GEMINI_API_KEY."""
+
+    def __init__(self, api_key=None, model=MODEL):
+        api_key = api_key or os.getenv("GEMINI_API_KEY")
+        if not api_key:
+            raise RuntimeError("GEMINI_API_KEY not set")
+
+        import google.generativeai as genai
+        genai.configure(api_key=api_key)
+        self.model = genai.GenerativeModel(model)
+
+    def generate(self, prompt):
+        return self.model.generate_content(prompt).text
+
+    async def agenerate(self, prompt):
+        res = await self.model.generate_content_async(prompt)
+        return res.text
+
+
+PROVIDERS = {
+    "genai": GenAIProvider,
+    "legacy": LegacyGeminiProvider,
+}
+
+_provider = None
+_lock = threading.Lock()
+
+
+def get_provider():
+    global _provider
+    if _provider is None:
+        with _lock:
+            if _provider is None:
+                _provider = PROVIDERS[os.getenv("TRANSLATION_PROVIDER", "genai")]()
+    return _provider
+
+
+def set_provider(provider):
+    """Swap the shared provider (tests, benchmarks, local fakes)."""
+    global _provider
+    _provider = provider
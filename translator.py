@@ -1,12 +1,36 @@
-from google import genai
+import asyncio
+import json
+import os
+
+from translation_cache import get_translation_cache
+from translation_provider import get_provider
+from timing import span, timed
+
+ALERT_TEXT_FIELDS = ("symptoms", "preventive", "treatment")
+
+TRANSLATE_TIMEOUT = float(os.getenv("TRANSLATE_TIMEOUT", "8"))
+TRANSLATE_BATCH_SIZE = int(os.getenv("TRANSLATE_BATCH_SIZE", "20"))
+TRANSLATE_CONCURRENCY = int(os.getenv("TRANSLATE_CONCURRENCY", "4"))
+# overall budget for one translate_texts call; 0 means twice the per-call timeout
+TRANSLATE_DEADLINE = float(os.getenv("TRANSLATE_DEADLINE", "0"))
 
-client = genai.Client()
 
 def translate_to_kannada(text: str):
     if not text:
         return text
 
-    prompt = f"""
+    cache = get_translation_cache()
+    cached = cache.get(text, "kn")
+    if cached is not None:
+        return cached
+
+    translated = translate_uncached(text)
+    cache.put(text, "kn", translated)
+    return translated
+
+
+def _prompt(text):
+    return f"""
     Translate the following agricultural advisory into simple farmer-friendly Kannada.
     Keep technical accuracy.
     
@@ -14,9 +38,145 @@ def translate_to_kannada(text: str):
     {text}
     """
 
-    response = client.models.generate_content(
-        model="gemini-1.5-flash",
-        contents=prompt
-    )
 
-    return response.text.strip()
+def _batch_prompt(texts):
+    return f"""
+    Translate each string in the following JSON array into simple farmer-friendly Kannada.
+    Keep technical accuracy.
+    Reply with only a JSON array of strings, same length and same order.
+
+    {json.dumps(texts, ensure_ascii=False)}
+    """
+
+
+def _parse_batch(reply, expected):
+    reply = reply.strip()
+    if reply.startswith("```"):
+        reply = reply.strip("`").split("\n", 1)[-1]
+    out = json.loads(reply)
+    if not isinstance(out, list) or len(out) != expected or not all(isinstance(s, str) for s in out):
+        raise ValueError("batch reply does not match request")
+    return [s.strip() for s in out]
+
+
+def translate_uncached(text: str):
+    return get_provider().generate(_prompt(text)).strip()
+
+
+async def _generate(prompt, timeout):
+    return await asyncio.wait_for(get_provider().agenerate(prompt), timeout)
+
+
+async def _translate_chunk(texts, sem, timeout):
+    """
+    One batched call. A timeout or model error leaves the chunk English;
+    only a malformed batch reply falls back to one call per string.
+    """
+    async with sem:
+        try:
+            reply = await _generate(_batch_prompt(texts), timeout)
+        except Exception:
+            return [None] * len(texts)
+    try:
+        return _parse_batch(reply, len(texts))
+    except Exception:
+        pass
+
+    async def one(text):
+        async with sem:
+            try:
+                return (await _generate(_prompt(text), timeout)).strip()
+            except Exception:
+                return None
+
+    return await asyncio.gather(*(one(t) for t in texts))
+
+
+async def _translate_chunks(chunks, timeout, concurrency, deadline):
+    """Every chunk's translations; a chunk that fails or misses the deadline stays English."""
+    sem = asyncio.Semaphore(concurrency)
+    tasks = [asyncio.ensure_future(_translate_chunk(c, sem, timeout)) for c in chunks]
+    try:
+        await asyncio.wait(tasks, timeout=deadline)
+    finally:
+        for t in tasks:
+            t.cancel()
+
+    out = []
+    for chunk, t in zip(chunks, tasks):
+        ok = t.done() and not t.cancelled() and t.exception() is None
+        out.append(t.result() if ok else [None] * len(chunk))
+    return out
+
+
+async def translate_texts(texts, lang="kn", timeout=None,
+                          batch_size=None, concurrency=None, deadline=None):
+    """
+    Deduplicated, cached, batched translation of many strings.
+    Returns {text: translated}; texts that could not be translated in time
+    map to themselves (English fallback) and are not cached. Never raises
+    for a model or cache failure.
+    """
+    timeout = timeout or TRANSLATE_TIMEOUT
+    deadline = deadline or TRANSLATE_DEADLINE or 2 * timeout
+    batch_size = batch_size or TRANSLATE_BATCH_SIZE
+    cache = get_translation_cache()
+
+    result = {}
+    misses = []
+    for text in dict.fromkeys(t for t in texts if t):
+        try:
+            cached = cache.get(text, lang)
+        except Exception:
+            cached = None
+        if cached is None:
+            misses.append(text)
+        else:
+            result[text] = cached
+
+    if misses:
+        chunks = [misses[i:i + batch_size] for i in range(0, len(misses), batch_size)]
+        with span("translate_model"):
+            translated = await _translate_chunks(
+                chunks, timeout, concurrency or TRANSLATE_CONCURRENCY, deadline)
+
+        done = []
+        for chunk, outs in zip(chunks, translated):
+            for src, dst in zip(chunk, outs):
+                result[src] = dst or src
+                if dst:
+                    done.append((src, dst))
+        if done:
+            try:
+                cache.put_many(done, lang)
+            except Exception as e:
+                print(f"⚠️ translation cache write failed: {e}")
+
+    return result
+
+
+def _alert_texts(alerts):
+    return [a[f] for a in alerts for f in ALERT_TEXT_FIELDS if a.get(f)]
+
+
+@timed("translate")
+async def translate_alert_lists_checked(alert_lists, lang):
+    """
+    Translated copies of many alert lists at once: their texts go through
+    one translate_texts call, so a text shared by several lists is looked
+    up and sent to the model once. Returns [(alerts, complete)], where
+    complete means no text fell back to English.
+    """
+    if lang != "kn":
+        return [(alerts, True) for alerts in alert_lists]
+
+    table = await translate_texts([t for alerts in alert_lists for t in _alert_texts(alerts)], lang)
+
+    out = []
+    for alerts in alert_lists:
+        translated = [
+            {**a, **{f: table.get(a[f], a[f]) for f in ALERT_TEXT_FIELDS if a.get(f)}}
+            for a in alerts
+        ]
+        out.append((translated, all(table.get(t) != t for t in _alert_texts(alerts))))
+    return out
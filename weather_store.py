@@ -0,0 +1,180 @@
+import csv
+import os
+from datetime import date
+
+from kb_utils import norm_key
+
+# Per-district daily weather, held in memory as columnar numpy arrays.
+#
+# Rows are (district, date, temp °C, humidity %, rainfall mm for that day).
+# PEST_DB rainfall thresholds are seasonal/annual totals, so the engine is
+# given the rainfall summed over the trailing RAIN_WINDOW days, read off a
+# running cumulative sum. Until a district's rows reach back a whole
+# window its rainfall is None (unknown, not held against any rule).
+# District names are normalized with norm_key so they join directly
+# with PEST_HISTORY's keys.
+#
+# Files are read once (load_csv / load_parquet); scans only touch memory.
+# New days are appended in place with append() / extend().
+#
+# numpy is imported when the first series is created, so processes that
+# never hold weather (KB-only scan workers) don't pay for it at startup.
+
+RAIN_WINDOW = int(os.getenv("WEATHER_RAIN_WINDOW_DAYS", "365"))
+
+
+def _ordinal(day):
+    if isinstance(day, str):
+        day = date.fromisoformat(day)
+    return day.toordinal()
+
+
+class _Series:
+    """One district's days, kept sorted, in arrays that grow by doubling."""
+
+    __slots__ = ("n", "day", "temp", "humidity", "rain_cum", "latest")
+
+    def __init__(self, capacity=64):
+        import numpy as np
+
+        self.n = 0
+        self.day = np.empty(capacity, dtype=np.int64)
+        self.temp = np.empty(capacity, dtype=np.float64)
+        self.humidity = np.empty(capacity, dtype=np.float64)
+        self.rain_cum = np.empty(capacity, dtype=np.float64)
+        self.latest = None
+
+    def _grow(self, need):
+        cap = len(self.day)
+        if need <= cap:
+            return
+        import numpy as np
+
+        while cap < need:
+            cap *= 2
+        for name in ("day", "temp", "humidity", "rain_cum"):
+            old = getattr(self, name)
+            new = np.empty(cap, dtype=old.dtype)
+            new[:self.n] = old[:self.n]
+            setattr(self, name, new)
+
+    def append(self, day, temp, humidity, rainfall):
+        n = self.n
+        if n and day < self.day[n - 1]:
+            raise ValueError("weather rows must be appended in date order")
+        if n and day == self.day[n - 1]:
+            # a corrected reading for the last day replaces it
+            n -= 1
+        self._grow(n + 1)
+        prev = self.rain_cum[n - 1] if n else 0.0
+        self.day[n] = day
+        self.temp[n] = temp
+        self.humidity[n] = humidity
+        self.rain_cum[n] = prev + rainfall
+        self.n = n + 1
+        self.latest = None
+
+    def features(self, day=None, window=RAIN_WINDOW):
+        """(temp, humidity, rainfall over the window or None) as of `day` (ordinal), or None."""
+        if day is None:
+            if self.latest is None:
+                self.latest = self._at(self.n - 1, window)
+            return self.latest
+        i = int(self.day[:self.n].searchsorted(day, side="right")) - 1
+        return self._at(i, window) if i >= 0 else None
+
+    def _at(self, i, window):
+        days = self.day[:self.n]
+        j = int(days.searchsorted(days[i] - window, side="right")) - 1
+        # a partial window would read as a dry year: unknown until it is full
+        rain = float(self.rain_cum[i] - self.rain_cum[j]) if j >= 0 else None
+        return float(self.temp[i]), float(self.humidity[i]), rain
+
+
+class WeatherStore:
+
+    def __init__(self, window=RAIN_WINDOW):
+        self.window = window
+        self.series = {}
+
+    @property
+    def districts(self):
+        return frozenset(self.series)
+
+    def append(self, district, day, temp, humidity, rainfall):
+        district = norm_key(district)
+        series = self.series.get(district)
+        if series is None:
+            series = self.series[district] = _Series()
+        series.append(_ordinal(day), float(temp), float(humidity), float(rainfall or 0.0))
+
+    def extend(self, rows):
+        """Append (district, date, temp, humidity, rainfall) rows; sorted first, so any order works."""
+        rows = sorted(((norm_key(r[0]), _ordinal(r[1])) + tuple(r[2:]) for r in rows),
+                      key=lambda r: (r[0], r[1]))
+        for district, day, temp, humidity, rainfall in rows:
+            series = self.series.get(district)
+            if series is None:
+                series = self.series[district] = _Series()
+            series.append(day, float(temp), float(humidity), float(rainfall or 0.0))
+        return len(rows)
+
+    def load_csv(self, path):
+        with open(path, newline="") as f:
+            return self.extend(
+                (r["district"], r["date"], r["temp"], r["humidity"], r["rainfall"])
+                for r in csv.DictReader(f)
+            )
+
+    def load_parquet(self, path):
+        import pyarrow.parquet as pq    # only needed for parquet files
+
+        cols = pq.read_table(path, columns=["district", "date", "temp", "humidity", "rainfall"]).to_pydict()
+        return self.extend(zip(cols["district"], cols["date"], cols["temp"],
+                               cols["humidity"], cols["rainfall"]))
+
+    def load(self, path):
+        return self.load_parquet(path) if path.endswith(".parquet") else self.load_csv(path)
+
+    def features(self, district, day=None):
+        series = self.series.get(district)
+        if series is None:
+            return None
+        return series.features(None if day is None else _ordinal(day), self.window)
+
+    def conditions(self, district, day=None):
+        """Keyword conditions for PestEngine.scan; empty if the district has no data."""
+        f = self.features(norm_key(district), day) if district else None
+        if f is None:
+            return {}
+        return {"temp": f[0], "humidity": f[1], "rainfall": f[2]}
+
+    def unknown_districts(self, history):
+        """Districts with weather but no PEST_HISTORY entry (usually a spelling mismatch)."""
+        return sorted(self.districts - history.districts)
+
+
+_store = None
+
+
+def get_weather_store():
+    """Shared store, loaded once from WEATHER_DATA_PATH (csv or parquet) if set."""
+    global _store
+    if _store is None:
+        store = WeatherStore()
+        path = os.getenv("WEATHER_DATA_PATH")
+        if path:
+            from history_index import get_history_index
+
+            rows = store.load(path)
+            print(f"🌦️ loaded {rows} weather rows for {len(store.series)} districts")
+            unknown = store.unknown_districts(get_history_index())
+            if unknown:
+                print(f"⚠️ weather districts not in PEST_HISTORY: {', '.join(unknown)}")
+        _store = store
+    return _store
+
+
+def set_weather_store(store):
+    global _store
+    _store = store